@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""Peak and steady-state RSS of wiki2txt.py (main process and every worker) as the dump grows.
+
+Parsing is supposed to run in constant memory, the benchmark fails (exit code 1)
+if RSS of the largest dump exceeds RSS of the smallest one by more than the limit.
+
+usage: python -m benchmarks.bench_memory --size 10MB,40MB,160MB -j 4
+"""
+
+# standard libraries
+import json
+import optparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# 3rd party libraries
+try:
+    import psutil  # pip install psutil
+except ImportError:
+    psutil = None
+
+# local imports
+from benchmarks.bench_throughput import ROOT_DIR, get_machine
+from benchmarks.generate_dump import DUMP_SEED, generate_dump, parse_size
+
+MEMORY_GROWTH_LIMIT = 16  # MB, allowed RSS growth between the smallest and largest dump
+
+SAMPLE_INTERVAL = 0.05  # seconds between RSS samples
+
+
+def sample_rss(command, interval=SAMPLE_INTERVAL):
+    """Runs a command, returns RSS samples (MB) of its process and of every child process."""
+    process = subprocess.Popen(command, cwd=ROOT_DIR)
+    main = psutil.Process(process.pid)
+    samples = {"main": [], "workers": {}}
+    while process.poll() is None:
+        try:
+            samples["main"].append(main.memory_info().rss / 1000000)
+            for child in main.children(recursive=True):
+                samples["workers"].setdefault(child.pid, []).append(
+                    child.memory_info().rss / 1000000
+                )
+        except psutil.Error:  # exited in the meantime
+            pass
+        time.sleep(interval)
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, command)
+    return samples
+
+
+def get_steady(samples):
+    """RSS once warmed up, i.e. median of the second half of the samples."""
+    if not samples:
+        return 0.0
+    return statistics.median(samples[len(samples) // 2 :])
+
+
+def bench_memory(sizes, jobs=1, seed=DUMP_SEED, extra_args=()):
+    """Yields peak and steady-state RSS (MB) of the main process and workers per dump size."""
+    with tempfile.TemporaryDirectory(prefix="wiki2txt-bench-") as work_dir:
+        output_file = os.path.join(work_dir, "output.xml")
+        for size in sizes:
+            dump_file = os.path.join(work_dir, f"dump-{size}-{seed}.xml")
+            counts = generate_dump(dump_file, size, seed)
+            command = [
+                sys.executable,
+                os.path.join(ROOT_DIR, "wiki2txt.py"),
+                "-q",
+                "-i",
+                dump_file,
+                "-o",
+                output_file,
+                "-j",
+                str(jobs),
+                *extra_args,
+            ]
+            samples = sample_rss(command)
+            os.remove(dump_file)
+            workers = samples["workers"].values()
+            yield {
+                "size_bytes": counts["bytes"],
+                "jobs": jobs,
+                "args": list(extra_args),
+                "samples": len(samples["main"]),
+                "main_peak_mb": round(max(samples["main"], default=0.0), 1),
+                "main_steady_mb": round(get_steady(samples["main"]), 1),
+                "worker_peak_mb": round(max(map(max, workers), default=0.0), 1),
+                "worker_steady_mb": round(
+                    max(map(get_steady, workers), default=0.0), 1
+                ),
+            }
+
+
+def get_growth(results):
+    """RSS growth (MB) between the smallest and the largest dump, the worst of all measures."""
+    smallest = min(results, key=lambda result: result["size_bytes"])
+    largest = max(results, key=lambda result: result["size_bytes"])
+    return max(
+        largest[key] - smallest[key]
+        for key in (
+            "main_peak_mb",
+            "main_steady_mb",
+            "worker_peak_mb",
+            "worker_steady_mb",
+        )
+    )
+
+
+def format_result(result):
+    return (
+        "%10.2f MB  -j %-3d main %8.1f MB peak %8.1f MB steady  workers %8.1f MB peak %8.1f MB steady"
+        % (
+            result["size_bytes"] / 1000000,
+            result["jobs"],
+            result["main_peak_mb"],
+            result["main_steady_mb"],
+            result["worker_peak_mb"],
+            result["worker_steady_mb"],
+        )
+    )
+
+
+if __name__ == "__main__":
+    opt_parser = optparse.OptionParser(
+        usage="usage: %prog [options] [-- WIKI2TXT ARGS]"
+    )
+    opt_parser.add_option(
+        "-s",
+        "--size",
+        dest="sizes",
+        default="10MB,40MB",
+        metavar="SIZE,...",
+        help="comma separated growing dump sizes (DEFAULT 10MB,40MB)",
+    )
+    opt_parser.add_option(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type="int",
+        default=1,
+        metavar="NUMBER",
+        help="number of parallel jobs of wiki2txt.py (DEFAULT 1)",
+    )
+    opt_parser.add_option(
+        "--seed",
+        dest="seed",
+        type="int",
+        default=DUMP_SEED,
+        metavar="NUMBER",
+        help=f"random seed of the synthetic dumps (DEFAULT {DUMP_SEED})",
+    )
+    opt_parser.add_option(
+        "--limit",
+        dest="limit",
+        type="float",
+        default=MEMORY_GROWTH_LIMIT,
+        metavar="MB",
+        help=f"allowed RSS growth between the smallest and the largest dump (DEFAULT {MEMORY_GROWTH_LIMIT})",
+    )
+    opt_parser.add_option(
+        "--results",
+        dest="results_file",
+        metavar="FILE",
+        help="append results to FILE (JSON lines)",
+    )
+    options, args = opt_parser.parse_args()
+
+    if psutil is None:
+        sys.stderr.write(
+            "\nERROR: Memory benchmarks require psutil (pip install psutil).\n"
+        )
+        sys.exit(1)
+
+    machine = get_machine()
+    results = []
+    sizes = [parse_size(size) for size in options.sizes.split(",")]
+    for result in bench_memory(sizes, options.jobs, options.seed, args):
+        print(format_result(result))
+        results.append(result)
+        if options.results_file:
+            with open(options.results_file, "a") as results_file:
+                results_file.write(json.dumps(dict(result, machine=machine)) + "\n")
+
+    growth = get_growth(results)
+    if growth > options.limit:
+        sys.stderr.write(
+            f"\nERROR: Memory grows with dump size, RSS increased by {growth:.1f} MB (limit {options.limit} MB).\n"
+        )
+        sys.exit(1)
+    sys.stderr.write(f"\nINFO: Memory is flat, RSS increased by {growth:.1f} MB.\n")
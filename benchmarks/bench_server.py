@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""Requests/s and request latency of the conversion server (wiki2txt.py --serve).
+
+Starts a server on a Unix socket (or measures a running one, --address) and converts
+synthetic articles by concurrent clients, single snippets or batches of them.
+
+usage: python -m benchmarks.bench_server -j 4 --requests 2000 --concurrency 8
+       python -m benchmarks.bench_server --address localhost:8080 --batch 32
+"""
+
+# standard libraries
+import json
+import optparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# local imports
+from benchmarks.bench_throughput import ROOT_DIR, get_machine
+from benchmarks.generate_dump import DUMP_SEED, DumpGenerator
+from wiki2txt.server import LATENCY_PERCENTILES, connect, get_percentile
+
+SNIPPETS = 200  # distinct synthetic articles sent round robin
+SERVER_START_TIMEOUT = 30  # seconds for a started server to listen and warm up
+
+
+def get_snippets(count=SNIPPETS, seed=DUMP_SEED):
+    """Returns synthetic articles (wiki markup) as produced by the dump generator."""
+    generator = DumpGenerator(seed)
+    return [generator.article() for _ in range(count)]
+
+
+def request(connection, method, path, data=None):
+    """Sends a request (data as JSON), returns the decoded JSON answer."""
+    body = None if data is None else json.dumps(data).encode("utf-8")
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    connection.request(method, path, body, headers)
+    response = connection.getresponse()
+    answer = json.loads(response.read())
+    if response.status != 200:
+        raise RuntimeError(f"server answered {response.status}, {answer}")
+    return answer
+
+
+def start_server(address, jobs=1, extra_args=()):
+    """Starts wiki2txt.py --serve, returns its process once it answers."""
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            os.path.join(ROOT_DIR, "wiki2txt.py"),
+            "-q",
+            "--serve",
+            address,
+            "-j",
+            str(jobs),
+            *extra_args,
+        ],
+        cwd=ROOT_DIR,
+    )
+    deadline = time.perf_counter() + SERVER_START_TIMEOUT
+    while True:
+        try:
+            connection = connect(address, timeout=SERVER_START_TIMEOUT)
+            request(connection, "GET", "/stats")
+            connection.close()
+            return process
+        except OSError:
+            if process.poll() is not None or time.perf_counter() > deadline:
+                process.kill()
+                raise RuntimeError("server didn't start")
+            time.sleep(0.05)
+
+
+def run_clients(address, snippets, requests, concurrency=1, batch=1):
+    """Sends requests by concurrent clients (a connection each), returns latencies (s)
+    and wall clock seconds.
+    """
+    latencies = []
+    counter = iter(range(requests))
+    lock = threading.Lock()
+
+    def client():
+        connection = connect(address)
+        try:
+            while True:
+                with lock:
+                    number = next(counter, None)
+                if number is None:
+                    return
+                records = [
+                    {"id": record_id, "text": snippets[record_id % len(snippets)]}
+                    for record_id in range(number * batch, (number + 1) * batch)
+                ]
+                started = time.perf_counter()
+                request(
+                    connection, "POST", "/convert", records if batch > 1 else records[0]
+                )
+                latencies.append(time.perf_counter() - started)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - started
+    if len(latencies) != requests:
+        raise RuntimeError(f"{requests - len(latencies)} requests failed")
+    return sorted(latencies), seconds
+
+
+def bench_server(
+    address=None,
+    jobs=1,
+    requests=1000,
+    concurrency=1,
+    batch=1,
+    seed=DUMP_SEED,
+    extra_args=(),
+):
+    """Measures a server (started with jobs workers unless address is given)."""
+    snippets = get_snippets(seed=seed)
+    with tempfile.TemporaryDirectory(prefix="wiki2txt-bench-") as work_dir:
+        process = None
+        if address is None:
+            address = "unix:" + os.path.join(work_dir, "server.sock")
+            process = start_server(address, jobs, extra_args)
+        try:
+            latencies, seconds = run_clients(
+                address, snippets, requests, concurrency, batch
+            )
+            connection = connect(address)
+            server_stats = request(connection, "GET", "/stats")
+            connection.close()
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+    result = {
+        "jobs": jobs if process is not None else None,
+        "args": list(extra_args),
+        "requests": requests,
+        "concurrency": concurrency,
+        "batch": batch,
+        "seconds": round(seconds, 3),
+        "requests_per_s": round(requests / seconds, 1),
+        "articles_per_s": round(requests * batch / seconds, 1),
+        "server": server_stats,
+    }
+    for percentile in LATENCY_PERCENTILES:
+        result[f"p{percentile:g}_ms"] = round(
+            get_percentile(latencies, percentile) * 1000, 3
+        )
+    return result
+
+
+def format_result(result):
+    return "%8.1f requests/s %10.1f articles/s  batch %-4d clients %-3d latency %s" % (
+        result["requests_per_s"],
+        result["articles_per_s"],
+        result["batch"],
+        result["concurrency"],
+        ", ".join(
+            f"p{percentile:g} {result[f'p{percentile:g}_ms']:.2f} ms"
+            for percentile in LATENCY_PERCENTILES
+        ),
+    )
+
+
+if __name__ == "__main__":
+    opt_parser = optparse.OptionParser(
+        usage="usage: %prog [options] [-- WIKI2TXT ARGS]"
+    )
+    opt_parser.add_option(
+        "-a",
+        "--address",
+        dest="address",
+        metavar="ADDRESS",
+        help="measure a running server (PORT, HOST:PORT or unix:PATH) instead of starting one",
+    )
+    opt_parser.add_option(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type="int",
+        default=1,
+        metavar="NUMBER",
+        help="number of workers of the started server (DEFAULT 1)",
+    )
+    opt_parser.add_option(
+        "-n",
+        "--requests",
+        dest="requests",
+        type="int",
+        default=1000,
+        metavar="NUMBER",
+        help="number of requests (DEFAULT 1000)",
+    )
+    opt_parser.add_option(
+        "-c",
+        "--concurrency",
+        dest="concurrency",
+        type="int",
+        default=1,
+        metavar="NUMBER",
+        help="concurrent clients, a connection each (DEFAULT 1)",
+    )
+    opt_parser.add_option(
+        "-b",
+        "--batch",
+        dest="batch",
+        type="int",
+        default=1,
+        metavar="NUMBER",
+        help="articles per request, more than 1 sends JSON batches (DEFAULT 1)",
+    )
+    opt_parser.add_option(
+        "--seed",
+        dest="seed",
+        type="int",
+        default=DUMP_SEED,
+        metavar="NUMBER",
+        help=f"random seed of the synthetic articles (DEFAULT {DUMP_SEED})",
+    )
+    opt_parser.add_option(
+        "--results",
+        dest="results_file",
+        metavar="FILE",
+        help="append results to FILE (JSON lines)",
+    )
+    options, args = opt_parser.parse_args()
+
+    result = bench_server(
+        options.address,
+        options.jobs,
+        options.requests,
+        options.concurrency,
+        options.batch,
+        options.seed,
+        args,
+    )
+    print(format_result(result))
+    if options.results_file:
+        with open(options.results_file, "a") as results_file:
+            results_file.write(json.dumps(dict(result, machine=get_machine())) + "\n")
@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""Microbenchmarks of the patterns and callbacks of Processor on representative and adversarial texts.
+
+usage: python -m benchmarks.bench_stages --stage curly,opened_tags --input representative,nested_tags --scaling
+"""
+
+# standard libraries
+import json
+import math
+import optparse
+import sys
+import time
+
+# local imports
+from benchmarks.bench_throughput import get_machine
+from benchmarks.corpus import (
+    ADVERSARIAL_INPUTS,
+    get_adversarial_text,
+    get_representative_text,
+)
+from wiki2txt.processor import Processor
+
+BENCH_REPEAT = 5  # runs per stage and input, the fastest one is reported
+
+STAGES = {  # stage (as in --profile-stages): (pattern, callback or replacement, repeated while nested)
+    "redirect": ("wikiRedRE", r"\g<1>", False),
+    "comments": ("wikiComRE", "", False),
+    "br": ("wikiBrtRE", "", False),
+    "curly": ("wikiCurRE", "parse_curly", True),
+    "tables": ("wikiTabRE", "parse_table", True),
+    "images": ("wikiImgRE", "parse_image_text", True),
+    "blockquotes": ("wikiBlqRE", "parse_block_quote", False),
+    "special_chars": ("wikiSChRE", "parse_special_char", False),
+    "tt_tags": ("wikiTttRE", "parse_tag_TT", False),
+    "opened_tags": ("wikiOtaRE", "parse_opened_tag", True),
+    "closed_tags": ("wikiCtaRE", "parse_closed_tag", False),
+    "tag_soup": ("wikiStaRE", "parse_soup", False),
+    "categories": ("wikiCatRE", "parse_category", False),
+    "http": ("wikiHttRE", "parse_http", False),
+    "references": ("wikiRefRE", "parse_reference", False),
+    "special_marks": ("wikiSMaRE", "parse_special_mark", False),
+    "bold": ("wikiBolRE", "parse_bold", False),
+    "italic": ("wikiItaRE", "parse_itallic", False),
+    "item_lists": ("wikiIteRE", "parse_item_list", False),
+    "whitespace": ("wikiWhiRE", " ", False),
+    "brackets": ("wikiBraRE", "", False),
+    "headings": ("wikiHeaRE", "parse_heading", False),
+}
+
+
+def get_processor():
+    """Returns a processor set up to extract text, links and categories (no option parsing)."""
+    processor = Processor()
+    processor.arg_text = True
+    processor.arg_references = False
+    processor.arg_links_file = "links"
+    processor.arg_categories_file = "categories"
+    processor.arg_redirects_file = None
+    processor.arg_parquet_file = None
+    return processor
+
+
+def run_stage(processor, stage, text):
+    """Applies a single stage to a text (nested stages repeat as in get_wiki_data), returns its calls."""
+    pattern_name, replacement, nested = STAGES[stage]
+    pattern = getattr(processor, pattern_name)
+    replacement = getattr(processor, replacement, replacement)
+    calls = 0
+    processor.repeat = 1
+    while processor.repeat:
+        processor.repeat = 0
+        calls += 1
+        text = pattern.sub(replacement, text, timeout=processor.get_timeout())
+        if not nested:
+            break
+    processor.repeat = 1
+    processor.wiki_data.links = []
+    processor.wiki_data.categories = []
+    return calls
+
+
+def time_stage(processor, stage, text, repeat=BENCH_REPEAT):
+    """Returns the fastest of repeated runs of a stage (seconds) and its calls."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        calls = run_stage(processor, stage, text)
+        seconds = time.perf_counter() - started
+        best = seconds if best is None else min(best, seconds)
+    return best, calls
+
+
+def bench_stages(stages, inputs, repeat=BENCH_REPEAT, scaling=False):
+    """Yields one result per stage and input. With scaling, each adversarial input is also
+    run at double size and the growth exponent (1 = linear, 2 = quadratic) is reported.
+    """
+    processor = get_processor()
+    for input_name in inputs:
+        if input_name == "representative":
+            texts = [get_representative_text()]
+        else:
+            repetitions = ADVERSARIAL_INPUTS[input_name][1]
+            texts = [get_adversarial_text(input_name, repetitions)]
+            if scaling:
+                texts.append(get_adversarial_text(input_name, repetitions * 2))
+        for stage in stages:
+            seconds, calls = time_stage(processor, stage, texts[0], repeat)
+            result = {
+                "stage": stage,
+                "input": input_name,
+                "chars": len(texts[0]),
+                "calls": calls,
+                "seconds": round(seconds, 6),
+                "mchar_per_s": round(len(texts[0]) / 1000000 / max(seconds, 1e-9), 3),
+                "growth": None,
+            }
+            if len(texts) > 1:
+                double_seconds, _ = time_stage(processor, stage, texts[1], repeat)
+                if seconds > 1e-4:  # too fast to tell otherwise
+                    result["growth"] = round(math.log2(double_seconds / seconds), 2)
+            yield result
+
+
+def format_result(result):
+    output = "%-14s %-22s %10d %6d %10.2f ms %9.2f Mchar/s" % (
+        result["stage"],
+        result["input"],
+        result["chars"],
+        result["calls"],
+        result["seconds"] * 1000,
+        result["mchar_per_s"],
+    )
+    if result["growth"] is not None:
+        output += "  growth n^%.2f" % result["growth"]
+    return output
+
+
+if __name__ == "__main__":
+    opt_parser = optparse.OptionParser(usage="usage: %prog [options]")
+    opt_parser.add_option(
+        "--stage",
+        dest="stages",
+        metavar="STAGE,...",
+        help="comma separated stages (DEFAULT all): " + ", ".join(STAGES),
+    )
+    opt_parser.add_option(
+        "--input",
+        dest="inputs",
+        metavar="INPUT,...",
+        help="comma separated inputs (DEFAULT all): representative, "
+        + ", ".join(ADVERSARIAL_INPUTS),
+    )
+    opt_parser.add_option(
+        "--repeat",
+        dest="repeat",
+        type="int",
+        default=BENCH_REPEAT,
+        metavar="NUMBER",
+        help=f"runs per stage and input, the fastest is reported (DEFAULT {BENCH_REPEAT})",
+    )
+    opt_parser.add_option(
+        "--scaling",
+        action="store_true",
+        dest="scaling",
+        default=False,
+        help="also run adversarial inputs at double size and report the growth exponent",
+    )
+    opt_parser.add_option(
+        "--results",
+        dest="results_file",
+        metavar="FILE",
+        help="append results to FILE (JSON lines)",
+    )
+    options, args = opt_parser.parse_args()
+
+    stages = options.stages.split(",") if options.stages else list(STAGES)
+    inputs = (
+        options.inputs.split(",")
+        if options.inputs
+        else ["representative", *ADVERSARIAL_INPUTS]
+    )
+    for name in stages:
+        if name not in STAGES:
+            sys.stderr.write(f"\nERROR: Unknown stage {name}.\n")
+            sys.exit(1)
+    for name in inputs:
+        if name != "representative" and name not in ADVERSARIAL_INPUTS:
+            sys.stderr.write(f"\nERROR: Unknown input {name}.\n")
+            sys.exit(1)
+
+    machine = get_machine()
+    results_file = open(options.results_file, "a") if options.results_file else None
+    for result in bench_stages(stages, inputs, options.repeat, options.scaling):
+        print(format_result(result))
+        if results_file is not None:
+            result["machine"] = machine
+            results_file.write(json.dumps(result) + "\n")
+    if results_file is not None:
+        results_file.close()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""End-to-end throughput (MB/s, articles/s) of wiki2txt.py on synthetic dumps.
+
+usage: python -m benchmarks.bench_throughput --size 50MB -j 1,2,4 --results benchmarks/results.jsonl
+       python -m benchmarks.bench_throughput -j 4 --executor process,thread  # which one wins here
+"""
+
+# standard libraries
+import json
+import optparse
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+# 3rd party libraries
+import lxml.etree
+
+# local imports
+from benchmarks.generate_dump import DUMP_SEED, generate_dump, parse_size
+from wiki2txt.conductor import MAX_JOBS
+from wiki2txt.executors import EXECUTORS, is_gil_enabled
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RESULTS_FILE = os.path.join(ROOT_DIR, "benchmarks", "results.jsonl")
+
+BENCH_REPEAT = 3  # runs per configuration, the fastest one is recorded
+
+
+def get_machine():
+    """Describes the machine and software versions the results are comparable on."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        "host": platform.node(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "lxml": ".".join(map(str, lxml.etree.LXML_VERSION)),
+        "gil": is_gil_enabled(),
+        "commit": commit or None,
+    }
+
+
+def run_wiki2txt(input_file, output_file, jobs, extra_args=()):
+    """Runs wiki2txt.py end-to-end, returns wall clock seconds."""
+    command = [
+        sys.executable,
+        os.path.join(ROOT_DIR, "wiki2txt.py"),
+        "-q",
+        "-i",
+        input_file,
+        "-o",
+        output_file,
+        "-j",
+        str(jobs),
+        *extra_args,
+    ]
+    started = time.perf_counter()
+    subprocess.run(command, check=True, cwd=ROOT_DIR)
+    return time.perf_counter() - started
+
+
+def bench_throughput(
+    sizes,
+    jobs_levels,
+    repeat=BENCH_REPEAT,
+    seed=DUMP_SEED,
+    extra_args=(),
+    executors=(None,),
+):
+    """Yields one result per dump size, jobs level and executor (None is the default one)."""
+    with tempfile.TemporaryDirectory(prefix="wiki2txt-bench-") as work_dir:
+        output_file = os.path.join(work_dir, "output.xml")
+        for size in sizes:
+            dump_file = os.path.join(work_dir, f"dump-{size}-{seed}.xml")
+            counts = generate_dump(dump_file, size, seed)
+            for jobs in jobs_levels:
+                for executor in executors:
+                    args = list(extra_args)
+                    if executor is not None:
+                        args += ["--executor", executor]
+                    seconds = min(
+                        run_wiki2txt(dump_file, output_file, jobs, args)
+                        for _ in range(repeat)
+                    )
+                    yield {
+                        "size_bytes": counts["bytes"],
+                        "pages": counts["pages"],
+                        "seed": seed,
+                        "jobs": jobs,
+                        "executor": executor,
+                        "args": list(extra_args),
+                        "seconds": round(seconds, 3),
+                        "mb_per_s": round(counts["bytes"] / 1000000 / seconds, 3),
+                        "articles_per_s": round(counts["pages"] / seconds, 1),
+                    }
+
+
+def load_results(file_name):
+    if not os.path.exists(file_name):
+        return []
+    with open(file_name, encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def find_baseline(results, machine, result):
+    """Latest earlier result of the same configuration on the same machine."""
+    for previous in reversed(results):
+        if previous["machine"]["host"] == machine["host"] and all(
+            previous.get(key) == result[key]
+            for key in ("size_bytes", "seed", "jobs", "executor", "args")
+        ):
+            return previous
+    return None
+
+
+def format_result(result, baseline=None):
+    output = "%10.2f MB  -j %-3d %-8s %8.2f MB/s %10.1f articles/s %8.2f s" % (
+        result["size_bytes"] / 1000000,
+        result["jobs"],
+        result.get("executor") or "default",
+        result["mb_per_s"],
+        result["articles_per_s"],
+        result["seconds"],
+    )
+    if baseline is not None:
+        change = (result["mb_per_s"] / baseline["mb_per_s"] - 1) * 100
+        output += "  (%+.1f %% vs %s)" % (change, baseline["machine"]["commit"])
+    return output
+
+
+if __name__ == "__main__":
+    opt_parser = optparse.OptionParser(
+        usage="usage: %prog [options] [-- WIKI2TXT ARGS]"
+    )
+    opt_parser.add_option(
+        "-s",
+        "--size",
+        dest="sizes",
+        default="20MB",
+        metavar="SIZE,...",
+        help="comma separated dump sizes, e.g. 10MB,100MB (DEFAULT 20MB)",
+    )
+    opt_parser.add_option(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        metavar="JOBS,...",
+        help=f"comma separated jobs levels (DEFAULT 1 and every power of 2 up to {MAX_JOBS})",
+    )
+    opt_parser.add_option(
+        "-e",
+        "--executor",
+        dest="executors",
+        metavar="EXECUTOR,...",
+        help=f"comma separated executors to compare ({', '.join(EXECUTORS)}) (DEFAULT the default one of wiki2txt)",
+    )
+    opt_parser.add_option(
+        "--repeat",
+        dest="repeat",
+        type="int",
+        default=BENCH_REPEAT,
+        metavar="NUMBER",
+        help=f"runs per configuration, the fastest is recorded (DEFAULT {BENCH_REPEAT})",
+    )
+    opt_parser.add_option(
+        "--seed",
+        dest="seed",
+        type="int",
+        default=DUMP_SEED,
+        metavar="NUMBER",
+        help=f"random seed of the synthetic dump (DEFAULT {DUMP_SEED})",
+    )
+    opt_parser.add_option(
+        "--results",
+        dest="results_file",
+        default=RESULTS_FILE,
+        metavar="FILE",
+        help="append results to FILE (JSON lines) and compare with earlier runs on this machine (DEFAULT benchmarks/results.jsonl)",
+    )
+    options, args = opt_parser.parse_args()
+
+    if options.jobs:
+        jobs_levels = [int(jobs) for jobs in options.jobs.split(",")]
+    else:
+        jobs_levels = [1]
+        while jobs_levels[-1] * 2 <= MAX_JOBS:
+            jobs_levels.append(jobs_levels[-1] * 2)
+        if jobs_levels[-1] != MAX_JOBS:
+            jobs_levels.append(MAX_JOBS)
+    sizes = [parse_size(size) for size in options.sizes.split(",")]
+    executors = options.executors.split(",") if options.executors else [None]
+
+    machine = get_machine()
+    results = load_results(options.results_file)
+    with open(options.results_file, "a", encoding="utf-8") as results_file:
+        for result in bench_throughput(
+            sizes, jobs_levels, options.repeat, options.seed, args, executors
+        ):
+            print(format_result(result, find_baseline(results, machine, result)))
+            result["machine"] = machine
+            result["time"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+            results_file.write(json.dumps(result) + "\n")
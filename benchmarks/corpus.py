@@ -0,0 +1,46 @@
+# -*- coding: UTF-8 -*-
+"""Representative and adversarial (pathological) wiki texts for stage microbenchmarks.
+
+The adversarial corpus doubles as a regression gate (tests/functional/test_adversarial.py),
+every text has to be converted well within ADVERSARIAL_BUDGET.
+"""
+
+# local imports
+from benchmarks.generate_dump import DumpGenerator
+
+ADVERSARIAL_BUDGET = 5.0  # seconds, far below the article time budget (ARTICLE_TIMEOUT)
+
+REPRESENTATIVE_ARTICLES = 50  # synthetic articles joined into one representative text
+
+ADVERSARIAL_INPUTS = {  # name: (text builder, default repetitions)
+    "nested_templates": (lambda n: "{{a|" * n + "x" + "}}" * n, 4000),
+    "unclosed_templates": (lambda n: "{{a|b " * n, 4000),
+    "nested_tables": (lambda n: "{|\n" * n + "|}\n" * n, 4000),
+    "huge_table": (lambda n: "{|\n" + "|-\n| a || b || [[c]]\n" * n + "|}", 10000),
+    "nested_links": (lambda n: "[[a|" * n + "b" + "]]" * n, 4000),
+    "unclosed_links": (lambda n: "[[a " * n, 8000),
+    "unclosed_http": (lambda n: "[http://a " * n, 2000),
+    "nested_tags": (lambda n: "<span>" * n + "x" + "</span>" * n, 300),
+    "unclosed_tags": (lambda n: "<div>x " * n, 8000),
+    "unclosed_escaped_tags": (lambda n: "&lt;span&gt;x " * n, 8000),
+    "unterminated_tags": (lambda n: "<ref name=x " * n, 8000),
+    "unclosed_comments": (lambda n: "&lt;!-- x " * n, 2000),
+    "br_runs": (lambda n: "<br" * n, 1000),
+    "quote_runs": (lambda n: "''" * n, 8000),
+    "bold_italic_runs": (lambda n: "'' a ''' b " * n, 8000),
+    "whitespace_runs": (lambda n: " \n\t" * n + "x", 8000),
+    "heading_runs": (lambda n: "== a " * n, 8000),
+    "special_chars": (lambda n: "&amp;#1" * n, 8000),
+}
+
+
+def get_adversarial_text(name, repetitions=None):
+    """Returns an adversarial text, scaled by the number of repetitions of its pattern."""
+    build, default_repetitions = ADVERSARIAL_INPUTS[name]
+    return build(default_repetitions if repetitions is None else repetitions)
+
+
+def get_representative_text(seed=1, articles=REPRESENTATIVE_ARTICLES):
+    """Returns synthetic articles (as produced by the dump generator) joined into one text."""
+    generator = DumpGenerator(seed)
+    return "\n\n".join(generator.article() for _ in range(articles))
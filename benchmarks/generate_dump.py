@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+"""Deterministic generator of synthetic MediaWiki XML dumps (benchmark input).
+
+usage: python -m benchmarks.generate_dump -o dump.xml --size 100MB --seed 1 --mix infobox=1.5,table=0
+"""
+
+# standard libraries
+import optparse
+import random
+import sys
+from xml.sax.saxutils import escape, quoteattr
+
+DUMP_SEED = 1
+
+MARKUP_MIX = {  # average number of occurrences per article (redirect: share of pages)
+    "infobox": 0.6,
+    "table": 0.4,
+    "ref": 4.0,
+    "link": 25.0,
+    "category": 3.0,
+    "redirect": 0.15,
+}
+
+INFOBOX_NESTING = 3  # depth of templates nested in infobox values
+
+SIZE_UNITS = {"KB": 1000, "MB": 1000000, "GB": 1000000000, "B": 1}
+
+WORDS = (
+    "the of and in to a is was for as on by with from that at his an are which it "
+    "political philosophy movement history language system state city river music "
+    "science theory century government population university war empire art "
+    "economy species island church culture film album game energy mountain "
+    "computer network society law religion nation family region series team"
+).split()
+
+DUMP_HEADER = """<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.10/" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:schemaLocation="http://www.mediawiki.org/xml/export-0.10/ http://www.mediawiki.org/xml/export-0.10.xsd" version="0.10" xml:lang="en">
+  <siteinfo>
+    <sitename>Wikipedia</sitename>
+    <dbname>enwiki</dbname>
+    <base>https://en.wikipedia.org/wiki/Main_Page</base>
+    <generator>wiki2txt benchmarks</generator>
+    <case>first-letter</case>
+  </siteinfo>
+"""
+
+DUMP_FOOTER = "</mediawiki>\n"
+
+PAGE_TEMPLATE = """  <page>
+    <title>%s</title>
+    <ns>0</ns>
+    <id>%d</id>%s
+    <revision>
+      <id>%d</id>
+      <timestamp>2024-01-01T00:00:00Z</timestamp>
+      <model>wikitext</model>
+      <format>text/x-wiki</format>
+      <text bytes="%d" xml:space="preserve">%s</text>
+    </revision>
+  </page>
+"""
+
+
+def parse_size(size):
+    """Converts a size like 100MB, 2.5GB or 4096 to bytes."""
+    size = str(size).strip().upper()
+    for unit, multiplier in SIZE_UNITS.items():
+        if size.endswith(unit):
+            return int(float(size[: -len(unit)]) * multiplier)
+    return int(size)
+
+
+def parse_mix(mix):
+    """Converts 'infobox=1.5,table=0' to a markup mix (defaults for the rest)."""
+    markup_mix = dict(MARKUP_MIX)
+    for item in filter(None, (mix or "").split(",")):
+        name, value = item.split("=")
+        if name not in MARKUP_MIX:
+            raise ValueError(f"Unknown markup {name} (one of {', '.join(MARKUP_MIX)}).")
+        markup_mix[name] = float(value)
+    return markup_mix
+
+
+class DumpGenerator:
+    """Produces the same dump for the same seed, size and markup mix."""
+
+    def __init__(self, seed=DUMP_SEED, mix=None, nesting=INFOBOX_NESTING):
+        self.random = random.Random(seed)
+        self.mix = dict(MARKUP_MIX) if mix is None else mix
+        self.nesting = nesting
+        self.titles = []
+
+    def count(self, name):
+        """Number of occurrences of a markup in one article (random around the mix average)."""
+        average = self.mix[name]
+        count = int(average)
+        if self.random.random() < average - count:
+            count += 1
+        return count
+
+    def words(self, low, high):
+        return " ".join(self.random.choices(WORDS, k=self.random.randint(low, high)))
+
+    def title(self):
+        return " ".join(self.random.choices(WORDS, k=2)).capitalize()
+
+    def target(self):
+        if self.titles and self.random.random() < 0.7:  # mostly existing pages
+            return self.random.choice(self.titles)
+        return self.title()
+
+    def link(self):
+        target = self.target()
+        if self.random.random() < 0.3:
+            return f"[[{target}|{self.words(1, 3)}]]"
+        return f"[[{target}]]"
+
+    def template(self, depth):
+        if depth <= 0:
+            return f"{{{{convert|{self.random.randint(1, 9999)}|km|mi}}}}"
+        return f"{{{{nowrap|{self.words(1, 3)} {self.template(depth - 1)}}}}}"
+
+    def infobox(self):
+        lines = ["{{Infobox " + self.words(1, 2)]
+        for i in range(self.random.randint(4, 12)):
+            value = self.words(1, 4)
+            if self.random.random() < 0.5:
+                value += " " + self.template(self.random.randint(1, self.nesting))
+            if self.random.random() < 0.3:
+                value += " " + self.link()
+            lines.append(f"| {self.random.choice(WORDS)}_{i} = {value}")
+        lines.append("}}")
+        return "\n".join(lines)
+
+    def table(self):
+        columns = self.random.randint(2, 6)
+        lines = ['{| class="wikitable sortable"', "|+ " + self.words(2, 5)]
+        lines.append("! " + " !! ".join(self.words(1, 2) for _ in range(columns)))
+        for _ in range(self.random.randint(2, 20)):
+            lines.append("|-")
+            lines.append(
+                "| "
+                + " || ".join(
+                    self.link() if self.random.random() < 0.2 else self.words(1, 3)
+                    for _ in range(columns)
+                )
+            )
+        lines.append("|}")
+        return "\n".join(lines)
+
+    def reference(self):
+        if self.random.random() < 0.2:
+            return f'<ref name="{self.random.choice(WORDS)}" />'
+        return (
+            f"<ref>{{{{cite web |url=https://example.org/{self.random.choice(WORDS)}"
+            f" |title={self.words(2, 6)} |access-date=2024-01-01}}}}</ref>"
+        )
+
+    def paragraph(self, links, references):
+        parts = [self.words(5, 20)]
+        for _ in range(links):
+            parts.append(self.link())
+            parts.append(self.words(2, 12))
+        for _ in range(references):
+            parts.insert(self.random.randint(1, len(parts)), self.reference())
+        if self.random.random() < 0.3:
+            parts.insert(1, f"'''{self.words(1, 3)}'''")
+        if self.random.random() < 0.3:
+            parts.insert(1, f"''{self.words(1, 3)}''")
+        return " ".join(parts) + "."
+
+    def article(self):
+        """Returns the wiki text of a regular article."""
+        sections = []
+        sections.extend(self.infobox() for _ in range(self.count("infobox")))
+        paragraphs = self.random.randint(2, 8)
+        links = [0] * paragraphs
+        for _ in range(self.count("link")):
+            links[self.random.randrange(paragraphs)] += 1
+        references = [0] * paragraphs
+        for _ in range(self.count("ref")):
+            references[self.random.randrange(paragraphs)] += 1
+        tables = [0] * paragraphs
+        for _ in range(self.count("table")):
+            tables[self.random.randrange(paragraphs)] += 1
+        for i in range(paragraphs):
+            if i and self.random.random() < 0.5:
+                sections.append(f"== {self.words(1, 4).capitalize()} ==")
+            sections.append(self.paragraph(links[i], references[i]))
+            sections.extend(self.table() for _ in range(tables[i]))
+        if any(references):
+            sections.append("== References ==\n{{reflist}}")
+        sections.extend(
+            f"[[Category:{self.title()}]]" for _ in range(self.count("category"))
+        )
+        return "\n\n".join(sections)
+
+    def page(self, id):
+        """Returns a <page> element (regular article or redirect)."""
+        title = self.title()
+        redirect = ""
+        if self.titles and self.random.random() < self.mix["redirect"]:
+            target = self.random.choice(self.titles)
+            redirect = "\n    <redirect title=%s />" % quoteattr(target)
+            text = f"#REDIRECT [[{target}]]\n\n{{{{R from alternative name}}}}"
+        else:
+            text = self.article()
+            self.titles.append(title)
+        text = escape(text)
+        return (
+            PAGE_TEMPLATE
+            % (escape(title), id, redirect, id * 10, len(text.encode()), text),
+            bool(redirect),
+        )
+
+    def write(self, file, size):
+        """Writes a dump of about size bytes (whole pages) to a binary file, returns its counts."""
+        counts = {"bytes": 0, "pages": 0, "articles": 0, "redirects": 0}
+        header = DUMP_HEADER.encode()
+        footer = DUMP_FOOTER.encode()
+        file.write(header)
+        counts["bytes"] += len(header) + len(footer)
+        id = 10
+        while counts["bytes"] < size:
+            page, is_redirect = self.page(id)
+            page = page.encode()
+            file.write(page)
+            counts["bytes"] += len(page)
+            counts["pages"] += 1
+            counts["redirects" if is_redirect else "articles"] += 1
+            id += 1
+        file.write(footer)
+        return counts
+
+
+def generate_dump(file_name, size, seed=DUMP_SEED, mix=None, nesting=INFOBOX_NESTING):
+    """Writes a synthetic dump of about size bytes to file_name, returns its counts."""
+    with open(file_name, "wb") as file:
+        return DumpGenerator(seed, mix, nesting).write(file, size)
+
+
+if __name__ == "__main__":
+    opt_parser = optparse.OptionParser(usage="usage: %prog [options]")
+    opt_parser.add_option(
+        "-o",
+        "--output-file",
+        dest="output",
+        metavar="FILE",
+        help="write the dump to FILE otherwise to STDOUT",
+    )
+    opt_parser.add_option(
+        "-s",
+        "--size",
+        dest="size",
+        default="10MB",
+        metavar="SIZE",
+        help="approximate size of the dump, e.g. 500KB, 100MB, 2GB (DEFAULT 10MB)",
+    )
+    opt_parser.add_option(
+        "--seed",
+        dest="seed",
+        type="int",
+        default=DUMP_SEED,
+        metavar="NUMBER",
+        help=f"random seed, the same seed produces the same dump (DEFAULT {DUMP_SEED})",
+    )
+    opt_parser.add_option(
+        "--mix",
+        dest="mix",
+        metavar="MARKUP=COUNT,...",
+        help="average occurrences per article of "
+        + ", ".join(f"{name} ({count})" for name, count in MARKUP_MIX.items())
+        + ", redirect is a share of pages",
+    )
+    opt_parser.add_option(
+        "--nesting",
+        dest="nesting",
+        type="int",
+        default=INFOBOX_NESTING,
+        metavar="DEPTH",
+        help=f"maximum depth of templates nested in infobox values (DEFAULT {INFOBOX_NESTING})",
+    )
+    options, args = opt_parser.parse_args()
+
+    try:
+        size = parse_size(options.size)
+        mix = parse_mix(options.mix)
+    except ValueError as error:
+        sys.stderr.write(f"\nERROR: {error}\n")
+        sys.exit(1)
+    generator = DumpGenerator(options.seed, mix, options.nesting)
+    if options.output:
+        with open(options.output, "wb") as file:
+            counts = generator.write(file, size)
+    else:
+        counts = generator.write(sys.stdout.buffer, size)
+    sys.stderr.write(
+        f"\nINFO: Generated {counts['pages']} pages ({counts['redirects']} redirects, {counts['bytes']} bytes).\n"
+    )
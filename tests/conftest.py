@@ -0,0 +1,31 @@
+from io import BytesIO
+
+import pytest
+
+from wiki2txt.processor import Processor
+
+WIKIDUMP = "tests/data/52-pages-wikimedia.xml"
+
+
+@pytest.fixture
+def make_processor():
+    """Returns a factory of processors with default options (pytest's own arguments are
+    not parsed) reading a wikidump, text output into memory and no links, categories or
+    redirects files. Input files are closed after the test.
+    """
+    input_files = []
+
+    def make_processor(input_file=WIKIDUMP):
+        processor = Processor()
+        processor.get_options([])
+        processor.arg_input = open(input_file, "rb")
+        input_files.append(processor.arg_input)
+        processor.arg_output = BytesIO()
+        processor.arg_redirects_file = None
+        processor.arg_links_file = None
+        processor.arg_categories_file = None
+        return processor
+
+    yield make_processor
+    for input_file in input_files:
+        input_file.close()
@@ -0,0 +1,28 @@
+import time
+
+import pytest
+
+from benchmarks.bench_stages import get_processor
+from benchmarks.corpus import (
+    ADVERSARIAL_BUDGET,
+    ADVERSARIAL_INPUTS,
+    get_adversarial_text,
+)
+
+
+@pytest.mark.parametrize("name", list(ADVERSARIAL_INPUTS))
+def test_adversarial_input_within_budget(name):
+    processor = get_processor()
+    text = get_adversarial_text(name)
+
+    started = time.perf_counter()
+    processor.deadline = started + ADVERSARIAL_BUDGET
+    try:
+        processor.get_wiki_data(text)
+    except TimeoutError:
+        pytest.fail(f"{name} ({len(text)} chars) took over {ADVERSARIAL_BUDGET} s")
+    finally:
+        processor.deadline = None
+
+    assert processor.wiki_data.plain_text is not None
+    del processor
@@ -0,0 +1,37 @@
+import pytest
+
+from wiki2txt.affinity import (
+    AFFINITY_AVAILABLE,
+    get_affinity,
+    parse_cpus,
+    parse_layout,
+)
+
+
+def test_layouts():
+    assert parse_cpus("0-3,6") == [0, 1, 2, 3, 6]
+    assert parse_layout("auto", [3, 2, 1, 0]) == ([0], [1, 2, 3])
+    assert parse_layout("auto", [5]) == ([5], [5])
+    assert parse_layout("main=0,workers=1-2,5", range(8)) == ([0], [1, 2, 5])
+    assert parse_layout("workers=4-7", range(8)) == (list(range(8)), [4, 5, 6, 7])
+    for layout in ("main=9", "reader=0", "0,1", "main=x"):
+        with pytest.raises(ValueError):
+            parse_layout(layout, range(8))
+
+
+@pytest.mark.skipif(not AFFINITY_AVAILABLE, reason="CPU affinity is Linux only")
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_pinned_workers_keep_output(executor, make_processor):
+    affinity = get_affinity()
+    processor = make_processor()
+    processor.arg_cpu_affinity = parse_layout("auto", affinity)
+    processor.arg_executor = executor
+    processor.jobs = 2
+
+    processor.ParseWiki()
+
+    with open("tests/data/52p-txt.xml", "rb") as expected:
+        assert processor.arg_output.getvalue() == expected.read()
+    assert processor.worker_counter.value == 2  # every worker pinned itself
+    assert get_affinity() == affinity  # the main process is released again
+    del processor
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from wiki2txt import aconvert, aiter_articles, iter_articles
+from wiki2txt.aio import shutdown
+
+
+def test_aconvert_shares_pools():
+    async def main(executor):
+        return await asyncio.gather(
+            *(
+                aconvert(
+                    f"'''Article {number}''' links [[page {number}]]", executor=executor
+                )
+                for number in range(8)
+            )
+        )
+
+    try:
+        for executor in ("process", "thread"):
+            results = asyncio.run(main(executor))
+            assert [wiki_data.plain_text for wiki_data in results] == [
+                f"Article {number} links page {number}" for number in range(8)
+            ]
+            assert results[3].links == ["Page_3"]
+    finally:
+        shutdown()
+
+
+def test_aiter_articles_matches_iter_articles():
+    path = "tests/data/52-pages-wikimedia.xml"
+
+    async def main():
+        return [
+            (article.id, article.plain_text, article.links)
+            async for article in aiter_articles(path, jobs=2, buffer=4)
+        ]
+
+    assert asyncio.run(main()) == [
+        (article.id, article.plain_text, article.links)
+        for article in iter_articles(path)
+    ]
+
+
+def test_aiter_articles_can_stop_early():
+    async def main():
+        articles = aiter_articles("tests/data/52-pages-wikimedia.xml", jobs=2, buffer=1)
+        async for article in articles:
+            break
+        await articles.aclose()  # stops the pipeline and its pool
+        return article
+
+    assert asyncio.run(main()).redirect == "Computer_accessibility"
+
+
+def test_aiter_articles_raises_errors():
+    async def main():
+        return [article async for article in aiter_articles("tests/data/missing.xml")]
+
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(main())
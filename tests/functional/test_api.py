@@ -0,0 +1,55 @@
+import lxml.etree
+
+from wiki2txt import convert, iter_articles
+
+
+def test_convert():
+    wiki_data = convert("'''Anarchism''' is a [[political philosophy|philosophy]]")
+    assert wiki_data.plain_text == "Anarchism is a philosophy"
+    assert wiki_data.links == ["Political_philosophy"]
+
+    wiki_data = convert("text [[Category:Political ideologies]]")
+    assert wiki_data.categories == ["Category:Political_ideologies"]
+    assert convert("#REDIRECT [[Computer accessibility]]").redirect == (
+        "Computer_accessibility"
+    )
+
+
+def test_iter_articles_matches_command_line_output():
+    with open("tests/data/52p-txt.xml", "rb") as expected:
+        root = lxml.etree.fromstring(b"<root>" + expected.read() + b"</root>")
+    with open("tests/data/52p-lnk.edg", encoding="utf-8") as expected:
+        links = [line.rstrip("\n").split("\t")[1] for line in expected]
+
+    for jobs in (1, 2):
+        articles = list(
+            iter_articles(
+                "tests/data/52-pages-wikimedia.xml", jobs=jobs, redirects=False
+            )
+        )
+        assert [article.plain_text for article in articles if article.plain_text] == [
+            element.findtext("text") for element in root
+        ]
+        assert [link for article in articles for link in article.links] == links
+        assert articles[1].id == "12" and articles[1].title == "Anarchism"
+
+
+def test_iter_articles_can_stop_early():
+    with open("tests/data/52-pages-wikimedia.xml", "rb") as source:
+        articles = iter_articles(source, jobs=2)
+        assert next(articles).redirect == "Computer_accessibility"
+        articles.close()  # stops the pool
+        assert not source.closed  # file objects are left to the caller
+
+
+def test_iter_articles_in_turns_keep_their_options():
+    for jobs in (1, "auto"):
+        with_links = iter_articles("tests/data/52-pages-wikimedia.xml", jobs=jobs)
+        without_links = iter_articles(
+            "tests/data/52-pages-wikimedia.xml", jobs=jobs, links=False
+        )
+        next(with_links)
+        next(without_links)  # a pipeline of its own in the same thread
+        albedo = next(article for article in with_links if article.title == "Albedo")
+        assert len(albedo.links) == 152
+        assert not any(article.links for article in without_links)
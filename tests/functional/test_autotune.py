@@ -0,0 +1,75 @@
+import time
+
+from wiki2txt import autotune
+from wiki2txt.autotune import AutoTuner, get_cgroup_paths, get_cpu_quota
+
+
+def test_cpu_quota_of_cgroups(tmp_path):
+    (tmp_path / "cpu.max").write_text("150000 100000\n")
+    assert get_cpu_quota(str(tmp_path)) == 1.5
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    assert get_cpu_quota(str(tmp_path)) is None
+
+    (tmp_path / "cpu.max").unlink()
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("200000\n")
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+    assert get_cpu_quota(str(tmp_path)) == 2.0
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("-1\n")
+    assert get_cpu_quota(str(tmp_path)) is None
+
+
+def test_cpu_quota_of_the_process_cgroup(tmp_path):
+    proc_cgroup = tmp_path / "cgroup"
+    proc_cgroup.write_text("0::/system.slice/wiki2txt.service\n")
+    root = tmp_path / "sys"
+    service = root / "system.slice" / "wiki2txt.service"
+    service.mkdir(parents=True)
+    (root / "cpu.max").write_text("max 100000\n")
+    (service / "cpu.max").write_text("250000 100000\n")
+    assert get_cgroup_paths(str(proc_cgroup)) == {"": "/system.slice/wiki2txt.service"}
+    assert get_cpu_quota(str(root), str(proc_cgroup)) == 2.5
+    (root / "system.slice" / "cpu.max").write_text("100000 100000\n")
+    assert get_cpu_quota(str(root), str(proc_cgroup)) == 1.0  # the parent's is lower
+
+    proc_cgroup.write_text(
+        "5:memory:/docker/abc\n4:cpu,cpuacct:/docker/abc\n0::/\n"
+    )  # cgroup v1 (and an empty v2 hierarchy)
+    root = tmp_path / "sys-v1"
+    container = root / "cpu,cpuacct" / "docker" / "abc"
+    container.mkdir(parents=True)
+    (root / "cpu,cpuacct" / "cpu.cfs_quota_us").write_text("-1\n")
+    (root / "cpu,cpuacct" / "cpu.cfs_period_us").write_text("100000\n")
+    (container / "cpu.cfs_quota_us").write_text("50000\n")
+    (container / "cpu.cfs_period_us").write_text("100000\n")
+    assert get_cpu_quota(str(root), str(proc_cgroup)) == 0.5
+
+
+def test_jobs_follow_reader_and_worker_throughput():
+    tuner = AutoTuner(cpus=4, max_jobs=8)
+    tuner.started = time.perf_counter() - 1.0
+    tuner.add(1000000, 0.8, 0.8)  # processing 4x slower than reading
+    assert tuner.get_jobs() == 4  # up to the CPUs
+
+    tuner = AutoTuner(cpus=4, max_jobs=8)
+    tuner.started = time.perf_counter() - 1.0
+    tuner.add(1000000, 0.9, 0.1)  # processing waits on I/O, oversubscribed
+    assert tuner.get_jobs() == 8
+
+    tuner = AutoTuner(cpus=4, max_jobs=8)
+    tuner.started = time.perf_counter() - 1.0
+    tuner.add(1000000, 0.1, 0.1)  # the reader is the bottleneck
+    assert tuner.get_jobs() == 1
+
+
+def test_auto_jobs_keep_output(monkeypatch, make_processor):
+    monkeypatch.setattr(autotune, "WARMUP_BYTES", 20000)  # warm-up on a few articles
+    processor = make_processor()
+    processor.arg_auto_jobs = True
+
+    processor.ParseWiki()
+
+    with open("tests/data/52p-txt.xml", "rb") as expected:
+        assert processor.arg_output.getvalue() == expected.read()
+    assert processor.jobs >= 1 and processor.auto_tuner is None
+    del processor
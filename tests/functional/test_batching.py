@@ -0,0 +1,92 @@
+from wiki2txt.batching import MAX_CHUNK_BYTES, MIN_CHUNK_BYTES, ChunkSizer
+from wiki2txt.processor import get_batch_result
+from wiki2txt.wiki_data import ArticleResult
+
+
+def test_chunks_are_split_by_payload():
+    sizer = ChunkSizer(jobs=2, chunk_bytes=100)
+    articles = ["stub1", "huge", "stub2", "stub3", "stub4"]
+    sizes = [10, 500, 40, 40, 40]
+
+    chunks = sizer.split(articles, sizes)
+
+    assert chunks == [["stub1", "huge"], ["stub2", "stub3", "stub4"]]
+    assert sizer.get_window_bytes() == 800
+
+
+def test_chunk_size_follows_processing_time():
+    sizer = ChunkSizer(jobs=1)
+    sizer.observe(1000000, 0.5)  # 2 MB/s
+    fast = sizer.chunk_bytes
+    for _ in range(50):
+        sizer.observe(1000000, 5.0)  # 0.2 MB/s
+    assert MIN_CHUNK_BYTES <= sizer.chunk_bytes < fast <= MAX_CHUNK_BYTES
+
+    fixed = ChunkSizer(jobs=1, chunk_bytes=5000)
+    fixed.observe(1000000, 5.0)
+    assert fixed.chunk_bytes == 5000
+
+
+def test_batch_concatenates_outputs():
+    results = [ArticleResult(id=str(id)) for id in range(3)]
+    for result in results:
+        result.output = b"<article>" + result.id.encode() + b"</article>"
+        result.link_text = result.id + "\tlink\n"
+    results[1].output = None  # e.g. a redirect
+    batch = get_batch_result(results)
+
+    assert batch.output == b"<article>0</article><article>2</article>"
+    assert batch.link_text == b"0\tlink\n1\tlink\n2\tlink\n"
+    assert batch.category_text == b""
+    assert [result.id for result in batch.articles] == ["0", "1", "2"]
+    assert all(result.output is None for result in batch.articles)
+
+
+def test_small_chunks_keep_order(make_processor):
+    processor = make_processor()
+    processor.arg_chunk_size = 2000
+    processor.jobs = 2
+
+    processor.ParseWiki()
+
+    with open("tests/data/52p-txt.xml", "rb") as e_o:
+        assert processor.arg_output.getvalue() == e_o.read()
+    del processor
+
+
+def test_huge_articles_get_a_chunk_of_their_own():
+    sizer = ChunkSizer(jobs=2, chunk_bytes=100, huge_bytes=300)
+    chunks = sizer.split(["a", "b", "huge", "c"], [10, 20, 500, 10])
+
+    assert chunks == [["a", "b"], ["huge"], ["c"]]
+    assert sizer.is_huge(chunks[1], 500)
+    assert not sizer.is_huge(chunks[0], 30)
+
+
+def test_huge_article_lane_keeps_order(make_processor):
+    processor = make_processor()
+    processor.arg_chunk_size = 20000
+    processor.arg_huge_article_size = 50000  # the longest articles jump the queue
+    processor.jobs = 2
+
+    processor.ParseWiki()
+
+    with open("tests/data/52p-txt.xml", "rb") as e_o:
+        assert processor.arg_output.getvalue() == e_o.read()
+    del processor
+
+
+def test_unordered_output_has_all_articles(make_processor):
+    processor = make_processor()
+    processor.arg_chunk_size = 2000
+    processor.arg_unordered = True
+    processor.jobs = 2
+
+    processor.ParseWiki()
+
+    with open("tests/data/52p-txt.xml", "rb") as e_o:
+        expected = e_o.read().splitlines(keepends=True)
+    assert sorted(processor.arg_output.getvalue().splitlines(keepends=True)) == sorted(
+        expected
+    )
+    del processor
@@ -0,0 +1,36 @@
+from io import BytesIO
+
+from benchmarks.generate_dump import DumpGenerator, generate_dump, parse_mix
+
+
+def test_generator_is_deterministic():
+    dumps = []
+    for _ in range(2):
+        dump = BytesIO()
+        DumpGenerator(seed=7).write(dump, 200000)
+        dumps.append(dump.getvalue())
+    assert dumps[0] == dumps[1]
+
+    dump = BytesIO()
+    DumpGenerator(seed=8).write(dump, 200000)
+    assert dump.getvalue() != dumps[0]
+
+
+def test_generated_dump_is_parsed(tmp_path, make_processor):
+    dump_file = str(tmp_path / "dump.xml")
+    counts = generate_dump(dump_file, 300000, mix=parse_mix("table=2,redirect=0.3"))
+    assert counts["bytes"] >= 300000
+    assert counts["redirects"] and counts["articles"]
+
+    processor = make_processor(dump_file)
+    processor.arg_redirects_file = BytesIO()
+    processor.arg_links_file = None
+    processor.arg_categories_file = None
+    processor.jobs = 1
+
+    processor.ParseWiki()
+
+    assert processor.arg_output.getvalue().count(b"<article>") == counts["articles"]
+    redirects = processor.arg_redirects_file.getvalue().count(b"\n")
+    assert redirects == counts["redirects"]
+    del processor
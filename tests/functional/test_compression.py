@@ -0,0 +1,79 @@
+import gzip
+import lzma
+from io import BytesIO
+
+import pytest
+
+from wiki2txt import conductor
+from wiki2txt.compression import CompressedWriter, get_compression, zstandard
+from wiki2txt.processor import Processor
+
+
+def zstd_decompress(data):
+    reader = zstandard.ZstdDecompressor().stream_reader(
+        BytesIO(data), read_across_frames=True
+    )
+    return reader.read()
+
+
+DECOMPRESS = {"gzip": gzip.decompress, "xz": lzma.decompress, "zstd": zstd_decompress}
+
+
+@pytest.mark.parametrize("compression", ["gzip", "xz", "zstd"])
+def test_compressed_writer_appends_frames(tmp_path, compression):
+    if compression == "zstd" and zstandard is None:
+        pytest.skip("zstandard not installed")
+    file_name = str(tmp_path / "output")
+
+    # first run, several frames
+    writer = CompressedWriter(file_name, "wb", compression, frame_size=10)
+    for i in range(10):
+        writer.write(b"line %d\n" % i)
+    writer.close()
+
+    # resumed run appends more frames
+    writer = CompressedWriter(file_name, "ab", compression, frame_size=10)
+    writer.write(b"resumed\n")
+    writer.close()
+
+    with open(file_name, "rb") as f:
+        data = DECOMPRESS[compression](f.read())
+    assert data == b"".join(b"line %d\n" % i for i in range(10)) + b"resumed\n"
+
+
+def test_compression_detected_from_extension():
+    assert get_compression("links.edg.gz") == "gzip"
+    assert get_compression("links.edg.zst") == "zstd"
+    assert get_compression("links.edg.xz") == "xz"
+    assert get_compression("links.edg") is None
+    assert get_compression("links.edg", "xz") == "xz"
+
+
+def test_compressed_links_output(tmp_path, make_processor):
+    links_file = str(tmp_path / "links.edg.gz")
+
+    processor = make_processor()
+    processor.arg_output = None
+    processor.arg_redirects_file = None
+    processor.arg_links_file = links_file
+    processor.arg_categories_file = None
+    processor.jobs = 1
+
+    processor.ParseWiki()
+    processor.cleanup()  # flushes the compression thread
+
+    with gzip.open(links_file, "rb") as l_o, open(
+        "tests/data/52p-lnk.edg", "rb"
+    ) as e_l_o:
+        assert l_o.read() == e_l_o.read()
+    del processor
+
+
+def test_zstd_extension_without_zstandard(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(conductor, "zstandard", None)
+    processor = Processor()
+    processor.get_options([])
+    with pytest.raises(SystemExit):  # compression implied by the extension
+        processor.open_output(str(tmp_path / "links.edg.zst"))
+    assert "requires zstandard" in capsys.readouterr().err
+    assert not (tmp_path / "links.edg.zst").exists()
@@ -0,0 +1,22 @@
+from io import BytesIO
+
+import pytest
+
+from wiki2txt.executors import EXECUTORS
+
+
+@pytest.mark.parametrize("executor", EXECUTORS)
+def test_executors_produce_the_same_output(executor, make_processor):
+    processor = make_processor()
+    processor.arg_links_file = BytesIO()
+    processor.arg_categories_file = None
+    processor.arg_executor = executor
+    processor.jobs = 2
+
+    processor.ParseWiki()
+
+    with open("tests/data/52p-txt-no-lnk.xml", "rb") as expected:
+        assert processor.arg_output.getvalue() == expected.read()
+    with open("tests/data/52p-lnk.edg", "rb") as expected:
+        assert processor.arg_links_file.getvalue() == expected.read()
+    del processor
@@ -0,0 +1,44 @@
+import pytest
+
+from wiki2txt.graph_sink import get_edge_array
+
+
+@pytest.mark.parametrize("edge_format", ["int32", "int64"])
+def test_binary_links_match_text_links(tmp_path, edge_format, make_processor):
+    links_file = str(tmp_path / "links.bin")
+
+    processor = make_processor()
+    processor.arg_output = None
+    processor.arg_redirects_file = None
+    processor.arg_links_file = links_file
+    processor.arg_categories_file = None
+    processor.arg_edge_format = edge_format
+    processor.arg_edge_titles_file = links_file + ".titles"
+    processor.arg_csr = True
+    processor.jobs = 1
+
+    processor.ParseWiki()
+    processor.cleanup()
+
+    with open(links_file + ".titles", "rb") as t:
+        titles = t.read().decode("utf-8").splitlines()
+    with open(links_file, "rb") as l_o:
+        ids = get_edge_array(edge_format, l_o.read())
+    edges = [(titles[ids[i]], titles[ids[i + 1]]) for i in range(0, len(ids), 2)]
+    with open("tests/data/52p-lnk.edg", "rb") as e_l_o:
+        expected = [
+            tuple(line.split("\t")) for line in e_l_o.read().decode().splitlines()
+        ]
+    assert edges == expected
+
+    # CSR adjacency lists targets of each node in the original order
+    with open(links_file + ".csr.offsets", "rb") as o:
+        offsets = get_edge_array("int64", o.read())
+    with open(links_file + ".csr.targets", "rb") as t:
+        targets = get_edge_array(edge_format, t.read())
+    assert len(offsets) == len(titles) + 1
+    source = titles.index(expected[0][0])
+    assert [titles[i] for i in targets[offsets[source] : offsets[source + 1]]] == [
+        target for s, target in expected if s == expected[0][0]
+    ]
+    del processor
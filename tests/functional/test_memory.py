@@ -0,0 +1,15 @@
+import pytest
+
+from benchmarks.bench_memory import MEMORY_GROWTH_LIMIT, bench_memory, get_growth
+
+psutil = pytest.importorskip("psutil")
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_memory_is_flat_as_dump_grows(jobs):
+    results = list(bench_memory([2000000, 8000000], jobs))
+
+    assert all(result["samples"] for result in results)
+    if jobs > 1:  # pool workers are sampled too
+        assert all(result["worker_peak_mb"] for result in results)
+    assert get_growth(results) <= MEMORY_GROWTH_LIMIT
@@ -0,0 +1,38 @@
+import pytest
+
+pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_parquet_output(tmp_path, jobs, make_processor):
+    parquet_file = str(tmp_path / "articles.parquet")
+
+    processor = make_processor()
+
+    # write only the columnar output
+    processor.arg_output = None
+    processor.arg_parquet_file = parquet_file
+    processor.arg_parquet_batch_size = 10  # force several row groups
+    processor.jobs = jobs
+
+    processor.ParseWiki()  # finalizes the Parquet file
+
+    parquet = pyarrow_parquet.ParquetFile(parquet_file)
+    assert parquet.metadata.num_row_groups > 1
+    table = parquet.read()
+    assert table.column_names == [
+        "id",
+        "title",
+        "text",
+        "text_length",
+        "links",
+        "categories",
+    ]
+    rows = table.to_pylist()
+    assert len(rows) == 52  # no -r given, redirects are regular articles
+    anarchism = next(row for row in rows if row["title"] == "Anarchism")
+    assert anarchism["id"] == 12
+    assert anarchism["text_length"] == len(anarchism["text"])
+    assert anarchism["links"]
+    assert anarchism["categories"]
+    del processor
@@ -0,0 +1,118 @@
+import json
+import unicodedata
+from io import BytesIO
+
+from wiki2txt.processor import Processor
+from wiki2txt.profiling import StageProfiler
+
+
+def test_name_cache_interns_repaired_names():
+    processor = Processor()
+    processor.init_name_cache(2)
+
+    first = processor.repair_article_name("category: foo bar")
+    second = processor.repair_article_name("category: foo bar")
+    assert first == "Category:Foo_bar"
+    assert first is second  # repeated names share a single string object
+    assert processor.get_name_cache_stats() == {
+        "name_cache_hits": 1,
+        "name_cache_misses": 1,
+    }
+    assert processor.get_name_cache_stats() == {
+        "name_cache_hits": 0,
+        "name_cache_misses": 0,
+    }
+
+    processor.init_name_cache(0)  # disabled
+    assert processor.repair_article_name("foo bar") == "Foo_bar"
+    assert processor.get_name_cache_stats() is None
+
+
+def test_deleted_processor_closes_outputs_right_away(tmp_path):
+    processor = Processor()
+    processor.get_options(["-q"])  # name cache enabled
+    processor.arg_input = None
+    processor.arg_output = output = open(tmp_path / "output.xml", "wb")
+    processor.repair_article_name("foo bar")
+
+    del processor  # no reference cycle, closed without the garbage collector
+    assert output.closed
+
+
+def test_stage_profiler_records_stages():
+    processor = Processor()
+    processor.arg_text = True
+    processor.arg_references = False
+    processor.arg_redirects_file = None
+    processor.arg_links_file = None
+    processor.arg_categories_file = None
+    processor.arg_parquet_file = None
+    processor.stage_profiler = StageProfiler()
+
+    processor.get_wiki_data("{{a|{{b}}}} '''bold''' [[link|text]] <!-- comment -->")
+    stages = processor.get_stats()["stages"]
+    assert processor.wiki_data.plain_text == " bold text "
+    assert stages["curly"][3] == 3  # nested template needs 3 substitutions
+    assert stages["comments"][1] > stages["comments"][2]  # comment removed
+    assert all(stage[0] >= 0 for stage in stages.values())
+    assert processor.stage_profiler.take_stages() == {}
+
+
+def test_jsonl_snippets_through_the_pipeline():
+    records = b"\n".join(
+        [
+            b"{\"id\": 1, \"text\": \"'''Anarchism''' is a [[philosophy]]\"}",
+            b"not json",
+            b'{"id": "b", "text": "#REDIRECT [[Computer accessibility]]"}',
+            b"",
+            b'{"text": "[[Category:Political ideologies]]"}',
+        ]
+    )
+    for jobs in (1, 2):
+        processor = Processor()
+        processor.get_options(["-T", "--jsonl", "-q"])
+        processor.arg_input = BytesIO(records)
+        processor.arg_output = BytesIO()
+        processor.jobs = jobs
+
+        processor.parse_jsonl()
+
+        results = [
+            json.loads(line)
+            for line in processor.arg_output.getvalue().decode().splitlines()
+        ]
+        assert [result["id"] for result in results] == [1, "b", 5]
+        assert results[0]["text"] == "Anarchism is a philosophy"
+        assert results[0]["links"] == ["Philosophy"]
+        assert results[1]["redirect"] == "Computer_accessibility"
+        assert results[2]["categories"] == ["Category:Political_ideologies"]
+        del processor
+
+
+def test_jsonl_snippets_slow_log(tmp_path):
+    slow_log_file = str(tmp_path / "slow.jsonl")
+    processor = Processor()
+    processor.get_options(["-T", "--jsonl", "-q", "--slow-log", slow_log_file])
+    processor.arg_input = BytesIO(
+        b'{"id": 1, "text": "{{a|{{b}}}} text"}\n{"id": 2, "text": "[[link]]"}\n'
+    )
+    processor.arg_output = BytesIO()
+
+    processor.parse_jsonl()
+
+    with open(slow_log_file, encoding="utf-8") as slow_log:
+        articles = [json.loads(line) for line in slow_log]
+    assert sorted(article["id"] for article in articles) == [1, 2]
+    assert all(article["slowest_stage"] for article in articles)
+    del processor
+
+
+def test_parse_test_reads_binary_input(capsys):
+    processor = Processor()
+    processor.get_options(["-T", "-q"])
+    processor.arg_input = BytesIO("'''Kočka''' [[pes]]".encode("utf-8"))
+
+    processor.parse_test()
+
+    assert unicodedata.normalize("NFC", capsys.readouterr().out) == "Kočka pes"
+    del processor
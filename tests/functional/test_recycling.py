@@ -0,0 +1,36 @@
+from wiki2txt.batching import ChunkSizer
+from wiki2txt.recycling import get_recycling_reason, get_rss
+from wiki2txt.wiki_data import BatchResult
+
+
+def test_recycling_reasons():
+    batch = BatchResult()
+    batch.worker_articles = 100
+    batch.worker_rss = get_rss()
+    assert batch.worker_rss > 0
+    assert get_recycling_reason(batch) is None
+    assert get_recycling_reason(batch, max_articles=101) is None
+    assert "100 articles" in get_recycling_reason(batch, max_articles=100)
+    assert "RSS" in get_recycling_reason(batch, max_rss_mb=1)
+
+
+def test_budget_limits_window():
+    sizer = ChunkSizer(jobs=8, chunk_bytes=100000, budget_bytes=1000000)
+    assert sizer.get_window_bytes() == 500000  # half in flight, half collected
+    assert ChunkSizer(jobs=8, chunk_bytes=100000).get_window_bytes() == 3200000
+
+
+def test_recycled_workers_keep_output(make_processor):
+    processor = make_processor()
+    processor.arg_chunk_size = 2000
+    processor.arg_worker_max_articles = 5
+    processor.arg_max_inflight_mb = 0.05
+    processor.jobs = 2
+
+    processor.ParseWiki()
+
+    with open("tests/data/52p-txt.xml", "rb") as expected:
+        assert processor.arg_output.getvalue() == expected.read()
+    assert processor.stats["worker_recycles"] >= 2
+    assert processor.retired_pools == []
+    del processor
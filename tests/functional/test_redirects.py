@@ -0,0 +1,78 @@
+from io import BytesIO
+
+from wiki2txt.redirects import RedirectMap
+
+
+def test_redirect_chains_and_cycles():
+    redirect_map = RedirectMap()
+    redirect_map.add("A", "B")
+    redirect_map.add("B", "C")  # chain A -> B -> C
+    redirect_map.add("X", "Y")
+    redirect_map.add("Y", "Z")
+    redirect_map.add("Z", "Y")  # cycle Y <-> Z entered from X
+    redirect_map.add("S", "S")  # self redirect
+    redirect_map.resolve()
+
+    assert redirect_map.get("A") == "C"
+    assert redirect_map.get("B") == "C"
+    assert redirect_map.get("C") == "C"
+    assert redirect_map.get("X") == "Y"
+    assert redirect_map.get("Y") == "Y"
+    assert redirect_map.get("Z") == "Z"
+    assert redirect_map.get("S") == "S"
+    assert len(redirect_map) == 3
+
+
+def test_redirect_map_grows():
+    redirect_map = RedirectMap()
+    for number in range(5000):  # the hash table grows a few times
+        redirect_map.add(f"Réd {number}", f"Cíl {number % 7}")
+    redirect_map.add("Réd 0", "Cíl 1")  # replaced target
+    redirect_map.resolve()
+
+    assert len(redirect_map) == 5000
+    assert redirect_map.get("Réd 0") == "Cíl 1"
+    assert redirect_map.get("Réd 4999") == "Cíl 1"
+    assert redirect_map.get("Cíl 3") == "Cíl 3"
+    assert redirect_map.get("Unknown") == "Unknown"
+
+
+def test_resolved_links(tmp_path, make_processor):
+    redirects = dict(
+        line.split("\t")
+        for line in open("tests/data/52p-red.edg", encoding="utf-8").read().splitlines()
+    )
+    # a prior redirects file adding one redirect of a linked article
+    redirects_file = tmp_path / "redirects.edg"
+    redirects_file.write_text(
+        open("tests/data/52p-red.edg", encoding="utf-8").read()
+        + "Political_philosophy\tPolitics\n",
+        encoding="utf-8",
+    )
+
+    for redirect_map_file in (None, str(redirects_file)):
+        processor = make_processor()
+        processor.arg_output = None
+        processor.arg_redirects_file = None
+        processor.arg_links_file = BytesIO()
+        processor.arg_categories_file = None
+        processor.arg_resolve_redirects = True
+        processor.arg_redirect_map_file = redirect_map_file
+        processor.jobs = 1
+
+        processor.ParseWiki()
+
+        links = [
+            line.split("\t")
+            for line in processor.arg_links_file.getvalue().decode().splitlines()
+        ]
+        with open("tests/data/52p-lnk.edg", "rb") as e_l_o:
+            expected = [line.split("\t") for line in e_l_o.read().decode().splitlines()]
+        assert [source for source, target in links] == [
+            source for source, target in expected
+        ]
+        assert not any(target in redirects for source, target in links)
+        assert ("Political_philosophy" in [target for source, target in links]) == (
+            redirect_map_file is None
+        )
+        del processor
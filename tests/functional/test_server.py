@@ -0,0 +1,88 @@
+import json
+import threading
+
+from benchmarks.bench_server import bench_server, request
+from wiki2txt.server import ConversionServer, connect, get_percentile
+
+
+def start(address, executor="thread", **options):
+    server = ConversionServer(address, jobs=2, executor=executor, **options)
+    server.warm_up()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def stop(server):
+    server.shutdown()
+    server.server_close()
+
+
+def test_server_converts_snippets_and_batches():
+    server = start("127.0.0.1:0")
+    address = "%s:%d" % server.server_address
+    try:
+        connection = connect(address)
+        connection.request("POST", "/convert", "'''Anarchism''' is a [[philosophy]]")
+        answer = json.loads(connection.getresponse().read())
+        assert answer["text"] == "Anarchism is a philosophy"
+        assert answer["links"] == ["Philosophy"]
+
+        answers = request(
+            connection,
+            "POST",
+            "/convert",
+            [{"id": 1, "text": "[[Category:Ideologies]]"}, {"id": 2, "text": "b"}],
+        )
+        assert [answer["id"] for answer in answers] == [1, 2]
+        assert answers[0]["categories"] == ["Category:Ideologies"]
+
+        connection.request(
+            "POST", "/convert", '{"id": 3}', {"Content-Type": "application/json"}
+        )
+        response = connection.getresponse()
+        assert response.status == 400 and b"text" in response.read()
+
+        stats = request(connection, "GET", "/stats")
+        assert stats["requests"] == 3 and stats["articles"] == 3
+        assert stats["errors"] == 1 and stats["p99_ms"] >= stats["p50_ms"] > 0
+        connection.close()
+    finally:
+        stop(server)
+
+
+def test_server_applies_the_article_timeout():
+    server = start("127.0.0.1:0", article_timeout=1e-9)  # spent before the first stage
+    address = "%s:%d" % server.server_address
+    try:
+        connection = connect(address)
+        answer = request(connection, "POST", "/convert", {"id": 1, "text": "text"})
+        assert answer == {"id": 1, "error": "Took longer than 1e-09 seconds to parse."}
+        connection.close()
+    finally:
+        stop(server)
+
+
+def test_server_on_unix_socket(tmp_path):
+    address = f"unix:{tmp_path}/server.sock"
+    server = start(address, executor="process")
+    try:
+        connection = connect(address)
+        answer = request(connection, "POST", "/convert", {"text": "#REDIRECT [[Foo]]"})
+        assert answer["redirect"] == "Foo"
+        connection.close()
+    finally:
+        stop(server)
+
+
+def test_percentiles():
+    values = list(range(1, 101))
+    assert get_percentile(values, 50) == 50
+    assert get_percentile(values, 99) == 99
+    assert get_percentile(values, 99.9) == 100
+    assert get_percentile([7], 90) == 7
+
+
+def test_bench_server():
+    result = bench_server(requests=20, concurrency=2, batch=3)
+    assert result["server"]["articles"] == 60
+    assert result["requests_per_s"] > 0 and result["p50_ms"] > 0
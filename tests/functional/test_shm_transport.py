@@ -0,0 +1,39 @@
+from io import BytesIO
+
+from wiki2txt.shm_transport import RingAllocator
+
+
+def test_ring_reuses_released_regions():
+    ring = RingAllocator(100)
+    first = ring.allocate(40)
+    second = ring.allocate(40)
+    assert (first, second) == (0, 40)
+    assert ring.allocate(40) is None  # full
+
+    ring.release(second)  # released out of order, reclaimed with the first one
+    assert ring.allocate(30) is None
+    ring.release(first)
+    assert ring.allocate(30) == 0
+
+    assert ring.allocate(50) == 30
+    ring.release(0)
+    assert ring.allocate(25) == 0  # wraps around to the start
+    assert ring.allocate(10) is None  # would overwrite the oldest region
+    assert ring.allocate(5) == 25
+
+
+def test_shared_memory_transport_output(make_processor):
+    processor = make_processor()
+    processor.arg_links_file = BytesIO()
+    processor.arg_categories_file = None
+    processor.arg_chunk_size = 5000
+    processor.arg_transport = "shm"
+    processor.jobs = 2
+
+    processor.ParseWiki()
+
+    with open("tests/data/52p-txt-no-lnk.xml", "rb") as e_o:
+        assert processor.arg_output.getvalue() == e_o.read()
+    with open("tests/data/52p-lnk.edg", "rb") as e_l:
+        assert processor.arg_links_file.getvalue() == e_l.read()
+    del processor
@@ -0,0 +1,50 @@
+from wiki2txt.slow_articles import SlowArticleTracker, load_article_ids
+
+
+def test_tracker_keeps_slowest_and_largest(tmp_path):
+    tracker = SlowArticleTracker(top=2)
+    tracker.add("1", "Fast small", 10, 0.1)
+    tracker.add("2", "Slow", 20, 5.0, "curly")
+    tracker.add("3", "Big", 9000, 0.2)
+    tracker.add("4", "Slower", 30, 7.0, "opened_tags", "Took too long.")
+    tracker.add("5", "Fast small again", 5, 0.05)
+
+    articles = tracker.get_articles()
+    assert [article["id"] for article in articles] == ["4", "2", "3"]
+    assert articles[0]["error"] == "Took too long."
+
+    quarantine_file = str(tmp_path / "slow.jsonl")
+    tracker.write(quarantine_file)
+    assert load_article_ids(quarantine_file) == {"2", "3", "4"}
+
+
+def test_replay_processes_quarantined_articles_only(tmp_path, make_processor):
+    quarantine_file = tmp_path / "slow.jsonl"
+    quarantine_file.write_text('{"id": "12"}\n{"id": "39"}\n', encoding="utf-8")
+
+    processor = make_processor()
+    processor.arg_replay_file = str(quarantine_file)
+    processor.jobs = 1
+
+    processor.ParseWiki()
+
+    assert processor.arg_output.getvalue().count(b"<article>") == 2
+    articles = processor.slow_articles.get_articles()
+    assert sorted(article["title"] for article in articles) == ["Albedo", "Anarchism"]
+    assert all(article["slowest_stage"] for article in articles)
+    del processor
+
+
+def test_slow_log_names_slowest_stages(tmp_path, make_processor):
+    for jobs in (1, 2):
+        processor = make_processor()
+        processor.arg_slow_log_file = str(tmp_path / "slow.jsonl")
+        processor.arg_slow_articles = True  # without --profile-stages
+        processor.jobs = jobs
+
+        processor.ParseWiki()
+
+        articles = processor.slow_articles.get_articles()
+        assert articles and all(article["slowest_stage"] for article in articles)
+        assert not processor.arg_profile_stages
+        del processor
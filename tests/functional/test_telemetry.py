@@ -0,0 +1,46 @@
+import json
+from io import BytesIO
+
+from wiki2txt.telemetry import CountingReader, Telemetry
+
+
+def test_counting_reader_and_prometheus_textfile(tmp_path):
+    reader = CountingReader(BytesIO(b"x" * 3000000))
+    telemetry = Telemetry(
+        reader,
+        total_bytes=3000000,
+        report_file=str(tmp_path / "wiki2txt.prom"),
+        report_format="prometheus",
+    )
+    reader.read(1000000)
+    telemetry.pages_read = 3
+    telemetry.articles = 2
+
+    sample = telemetry.sample()
+    assert sample["bytes"] == 1000000
+    assert sample["queue_depth"] == 1
+    assert sample["eta_s"] is not None
+
+    telemetry.report(sample)
+    textfile = (tmp_path / "wiki2txt.prom").read_text()
+    assert "wiki2txt_input_bytes_total 1000000" in textfile
+    assert "wiki2txt_articles_total 2" in textfile
+    assert not (tmp_path / "wiki2txt.prom.tmp").exists()
+
+
+def test_telemetry_json_lines(tmp_path, make_processor):
+    telemetry_file = tmp_path / "telemetry.jsonl"
+
+    processor = make_processor()
+    processor.arg_telemetry_file = str(telemetry_file)
+    processor.jobs = 1
+
+    processor.ParseWiki()
+
+    samples = [json.loads(line) for line in telemetry_file.read_text().splitlines()]
+    assert samples
+    final = samples[-1]
+    assert final["articles"] == processor.arg_output.getvalue().count(b"<article>")
+    assert final["bytes"] == final["total_bytes"]
+    assert final["queue_depth"] == 0
+    del processor
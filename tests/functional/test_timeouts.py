@@ -0,0 +1,151 @@
+import multiprocessing
+import time
+from io import BytesIO
+
+import pytest
+
+from wiki2txt import processor as processor_module
+from wiki2txt.processor import Processor
+
+convert_page = Processor.convert_page
+
+
+def stuck_convert_page(self, result, title, id, wiki):
+    if title == "Anarchism":
+        time.sleep(60)  # stuck in code the time budget can't interrupt
+    return convert_page(self, result, title, id, wiki)
+
+
+def slow_convert_page(self, result, title, id, wiki):
+    if int(id) < 30:
+        time.sleep(0.15)  # slow, but well within the time budget
+    return convert_page(self, result, title, id, wiki)
+
+
+def failing_convert_page(self, result, title, id, wiki):
+    if title == "Anarchism":
+        raise ValueError("broken page")
+    return convert_page(self, result, title, id, wiki)
+
+
+def get_articles(output):
+    return [b"<article>" + a for a in output.split(b"<article>")[1:]]
+
+
+def test_article_time_budget():
+    processor = Processor()
+    processor.arg_text = True
+    processor.arg_references = False
+    processor.arg_redirects_file = None
+    processor.arg_links_file = None
+    processor.arg_categories_file = None
+    processor.arg_parquet_file = None
+    processor.arg_edge_format = "text"
+    processor.arg_resolve_redirects = False
+    processor.arg_slow_articles = False
+    processor.arg_article_timeout = 1e-9  # spent before the first stage
+
+    result = processor.process_page("Title", "1", "{{a|{{b}}}} text")
+    assert result.output is None
+    assert result.error.startswith("Took longer than")
+
+    processor.arg_article_timeout = 30
+    result = processor.process_page("Title", "1", "{{a|{{b}}}} text")
+    assert result.error is None
+    assert b"<text> text</text>" in result.output
+
+
+def test_text_time_budget(capsys, make_processor):
+    processor = make_processor()
+    processor.arg_input = BytesIO(b"{{a|{{b}}}} text")
+    processor.arg_article_timeout = 1e-9  # -T has the time budget of an article
+    with pytest.raises(SystemExit):
+        processor.parse_test()
+    assert "Took longer than" in capsys.readouterr().err
+
+    processor.arg_article_timeout = 30
+    assert processor.convert_text("{{a|{{b}}}} text").plain_text == " text"
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="workers need to inherit the patched processor",
+)
+def test_watchdog_replaces_stuck_worker(monkeypatch, make_processor):
+    monkeypatch.setattr(Processor, "convert_page", stuck_convert_page)
+    monkeypatch.setattr(processor_module, "WATCHDOG_GRACE", 0.5)
+
+    processor = make_processor()
+    processor.arg_article_timeout = 0.5
+    processor.arg_chunk_size = 2000  # the watchdog waits for the budget of a chunk
+    processor.jobs = 2
+
+    processor.ParseWiki()
+
+    with open("tests/data/52p-txt.xml", "rb") as e_o:
+        expected = [
+            article
+            for article in get_articles(e_o.read())
+            if b"<title>Anarchism</title>" not in article
+        ]
+    # the stuck article is skipped, all others are kept in order
+    assert get_articles(processor.arg_output.getvalue()) == expected
+    del processor
+
+
+@pytest.mark.parametrize(
+    "jobs",
+    [
+        1,
+        pytest.param(
+            2,
+            marks=pytest.mark.skipif(
+                multiprocessing.get_start_method() != "fork",
+                reason="workers need to inherit the patched processor",
+            ),
+        ),
+    ],
+)
+def test_failing_article_is_skipped(monkeypatch, make_processor, jobs):
+    monkeypatch.setattr(Processor, "convert_page", failing_convert_page)
+
+    processor = make_processor()
+    processor.jobs = jobs
+
+    processor.ParseWiki()
+
+    with open("tests/data/52p-txt.xml", "rb") as e_o:
+        expected = [
+            article
+            for article in get_articles(e_o.read())
+            if b"<title>Anarchism</title>" not in article
+        ]
+    # only the failing article is skipped, not the rest of its chunk
+    assert get_articles(processor.arg_output.getvalue()) == expected
+    del processor
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="workers need to inherit the patched processor",
+)
+def test_watchdog_allows_chunks_of_slow_articles(monkeypatch, make_processor):
+    monkeypatch.setattr(Processor, "convert_page", slow_convert_page)
+    monkeypatch.setattr(processor_module, "WATCHDOG_GRACE", 0.1)
+    recoveries = []
+    monkeypatch.setattr(
+        Processor, "recover_stuck_pool", lambda self: recoveries.append(self)
+    )
+
+    processor = make_processor()
+    processor.arg_article_timeout = 0.5
+    processor.arg_chunk_size = 10000000  # a single chunk of all articles
+    processor.arg_huge_article_size = 0
+    processor.jobs = 2
+
+    processor.ParseWiki()
+
+    assert not recoveries  # slower than a single budget, not stuck
+    with open("tests/data/52p-txt.xml", "rb") as e_o:
+        assert processor.arg_output.getvalue() == e_o.read()
+    del processor
@@ -1,6 +1,5 @@
 import pytest
 
-from wiki2txt.processor import Processor
 from io import BytesIO
 
 
@@ -94,13 +93,10 @@ def test_wikimedia_parsing(
     categories_file,
     expected_categories_output,
     jobs,  # Added jobs parameter
+    make_processor,
 ):
-    processor = Processor()
-    processor.get_options()
-
-    # alter parameters of processor to read test input and capture the output
-    processor.arg_input = open(input_file, "rb")
-    processor.arg_output = BytesIO()  # output into memory
+    # processor reading test input and capturing the output in memory
+    processor = make_processor(input_file)
 
     # configure processor depending on what's being tested
     processor.arg_redirects_file = redirects_file
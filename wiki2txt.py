@@ -9,7 +9,9 @@
 import sys
 
 # local imports
+from wiki2txt.conductor import AVAILABLE_CPUS
 from wiki2txt.processor import Processor
+from wiki2txt.server import serve
 
 # XML OUTPUT FORMAT
 # <article>
@@ -31,7 +33,7 @@ from wiki2txt.processor import Processor
 
 # TODO list for v1.0.1:
 #   TODO: Explore an idea to replace standard lxml lib with an lxml lib that has C optimizations
-#   TODO: Implement a better way to handle runnaway regex than REGEX_TIMEOUT (then switch back to the standard re library)
+#   TODO: Implement a better way to handle runnaway regex than ARTICLE_TIMEOUT (then switch back to the standard re library)
 #   TODO: Cover 100% of code with unit tests
 #   TODO: Review the necessity for unicodedata normalization (it seems unnecessary to normalize unicode strings in Python v3)
 #   TODO: Think about allowing wikimedia syntax one-shot parsing (wrap STDIN input in a mediawiki like structure?)
@@ -45,10 +47,24 @@ if __name__ == "__main__":
     processor = Processor()  # construct a processor (will inherit Conductor)
     processor.get_options()  # evaluate startup options
 
+    if processor.arg_serve:  # conversion server (until interrupted)
+        serve(
+            processor.arg_serve,
+            AVAILABLE_CPUS if processor.arg_auto_jobs else processor.jobs,
+            "thread" if processor.arg_executor == "thread" else "process",
+            processor.arg_references,
+            processor.arg_article_timeout,
+            processor.arg_verbose,
+        )
+        sys.exit(0)
+
     # HACK: temporary way to extract plain_text from short wiki-like content (currently aimed to allow some direct testing)
     # TODO: Replace with proper lxml parsing from input
     if processor.arg_test:  # testing? (input from stdin)
-        processor.parse_test()
+        if processor.arg_jsonl:  # a snippet per line, by the parallel pipeline
+            processor.parse_jsonl()
+        else:
+            processor.parse_test()
         sys.exit(0)  # don't attempt to continue parsing with lxml during STDIN tests
 
     # do the actual parsing
@@ -57,6 +73,7 @@ if __name__ == "__main__":
         or processor.arg_links_file
         or processor.arg_categories_file
         or processor.arg_redirects_file
+        or processor.arg_parquet_file
     ):
         processor.ParseWiki()
     else:  # Options misued? / No output expected to be produced?
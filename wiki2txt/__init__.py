@@ -0,0 +1,4 @@
+from wiki2txt.aio import aconvert, aiter_articles
+from wiki2txt.api import convert, iter_articles
+
+__all__ = ["aconvert", "aiter_articles", "convert", "iter_articles"]
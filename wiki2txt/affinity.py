@@ -0,0 +1,67 @@
+# -*- coding: UTF-8 -*-
+"""Placement of the main process (reader and writer) and pool workers on CPUs (Linux)."""
+
+# standard libraries
+import os
+
+AFFINITY_AVAILABLE = hasattr(os, "sched_setaffinity")  # Linux only
+AFFINITY_ROLES = ("main", "workers")
+
+
+def parse_cpus(text):
+    """Parses a list of CPUs like "0-3,6" (ranges are inclusive)."""
+    cpus = []
+    for part in text.split(","):
+        first, _, last = part.strip().partition("-")
+        cpus.extend(range(int(first), int(last or first) + 1))
+    if not cpus:
+        raise ValueError("no CPUs")
+    return cpus
+
+
+def parse_layout(layout, available):
+    """Returns (main CPUs, worker CPUs) of a layout, either "auto" or like
+    "main=0,workers=1-7". Unlisted roles may run on all available CPUs.
+
+    The auto layout keeps the main process on a dedicated CPU (the first available one),
+    workers share the rest (all CPUs if there is a single one).
+    """
+    available = sorted(available)
+    if layout == "auto":
+        return available[:1], available[1:] or available
+    cpus = {role: available for role in AFFINITY_ROLES}
+    role = None
+    for part in layout.split(","):
+        if "=" in part:
+            role, _, part = part.partition("=")
+            role = role.strip()
+            if role not in AFFINITY_ROLES:
+                raise ValueError(f"unknown role {role}")
+            cpus[role] = []
+        elif role is None:
+            raise ValueError("CPUs without a role")
+        cpus[role] = cpus[role] + parse_cpus(part)
+    for role_cpus in cpus.values():
+        if not set(role_cpus) <= set(available):
+            raise ValueError("CPUs not available to this process")
+    return cpus["main"], cpus["workers"]
+
+
+def get_affinity():
+    """CPUs the calling thread may run on."""
+    return sorted(os.sched_getaffinity(0))
+
+
+def set_affinity(cpus):
+    """Pins the calling thread (a process or a single thread of it) to CPUs."""
+    os.sched_setaffinity(0, cpus)
+
+
+def pin_worker(cpus, counter):
+    """Pins a pool worker to a single CPU of the worker CPUs, in turns (counter is a
+    shared multiprocessing.Value, so workers of every pool take the next CPU).
+    """
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+    set_affinity([cpus[index % len(cpus)]])
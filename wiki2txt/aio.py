@@ -0,0 +1,124 @@
+# -*- coding: UTF-8 -*-
+"""asyncio interface of the library API, keeps the event loop responsive while articles
+are parsed by executors.
+
+    >>> from wiki2txt.aio import aconvert, aiter_articles
+    >>> (await aconvert("'''Anarchism''' is a [[political philosophy]]")).plain_text
+    'Anarchism is a political philosophy'
+    >>> async for article in aiter_articles("enwiki-latest-pages-articles.xml", jobs=4):
+    ...     print(article.id, article.title)
+"""
+
+# standard libraries
+import asyncio
+import concurrent.futures
+import functools
+import threading
+
+# local imports
+from wiki2txt.api import convert, iter_articles
+from wiki2txt.autotune import get_available_cpus
+from wiki2txt.conductor import ARTICLE_TIMEOUT
+
+AIO_EXECUTORS = ("process", "thread")
+AIO_BUFFER = 256  # articles parsed ahead of an aiter_articles() consumer
+
+executors = {}  # shared pools of aconvert() by kind, started on first use
+executors_lock = threading.Lock()
+
+
+def get_executor(executor="process", jobs=None):
+    """Returns the shared pool of aconvert() of a kind (one of AIO_EXECUTORS), workers
+    keep their converter (and its caches) warm between calls. jobs applies on creation
+    only and defaults to the available CPUs.
+    """
+    if executor not in AIO_EXECUTORS:
+        raise ValueError(f"unknown executor {executor}")
+    with executors_lock:
+        pool = executors.get(executor)
+        if pool is None:
+            jobs = jobs or get_available_cpus()
+            if executor == "thread":
+                pool = concurrent.futures.ThreadPoolExecutor(jobs)
+            else:
+                pool = concurrent.futures.ProcessPoolExecutor(jobs)
+            executors[executor] = pool
+        return pool
+
+
+def shutdown():
+    """Stops the shared pools of aconvert() (they are started again when needed)."""
+    with executors_lock:
+        pools = list(executors.values())
+        executors.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+async def aconvert(
+    wikitext,
+    links=True,
+    categories=True,
+    redirects=True,
+    references=False,
+    executor="process",
+    article_timeout=ARTICLE_TIMEOUT,
+):
+    """Converts wiki markup of a single article like convert(), in a shared pool
+    (executor is "process", "thread" or a concurrent.futures.Executor).
+    """
+    if not isinstance(executor, concurrent.futures.Executor):
+        executor = get_executor(executor)
+    return await asyncio.get_running_loop().run_in_executor(
+        executor,
+        functools.partial(
+            convert, wikitext, links, categories, redirects, references, article_timeout
+        ),
+    )
+
+
+async def aiter_articles(source, jobs=1, buffer=AIO_BUFFER, **options):
+    """Yields an Article per page of a wikidump like iter_articles() (same options).
+
+    The pipeline runs in a thread of its own (reading, dispatching to its pool), at most
+    buffer articles wait for the consumer, a slow consumer pauses the pipeline. Closing
+    the generator early stops the pool.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(buffer)
+    stopped = threading.Event()
+
+    def put(item):  # blocks the pipeline while the queue is full
+        asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+    def produce():
+        articles = iter_articles(source, jobs, **options)
+        try:
+            for article in articles:
+                put(article)
+                if stopped.is_set():
+                    return
+        except BaseException as error:
+            if not stopped.is_set():
+                put(error)
+            return
+        finally:
+            articles.close()
+        if not stopped.is_set():
+            put(None)
+
+    thread = threading.Thread(target=produce, name="wiki2txt-aio", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stopped.set()
+        while not queue.empty():  # unblocks the pipeline, it notices the stop
+            queue.get_nowait()
+        await loop.run_in_executor(None, thread.join)
@@ -0,0 +1,118 @@
+# -*- coding: UTF-8 -*-
+"""Library API, converts wiki markup and streams parsed articles of wikidumps
+without going through command line options.
+
+    >>> from wiki2txt import convert, iter_articles
+    >>> convert("'''Anarchism''' is a [[political philosophy]]").plain_text
+    'Anarchism is a political philosophy'
+    >>> for article in iter_articles("enwiki-latest-pages-articles.xml", jobs=4):
+    ...     print(article.id, article.title, article.links[:3])
+"""
+
+# standard libraries
+import os
+import threading
+import unicodedata
+
+# local imports
+from wiki2txt.conductor import ARTICLE_TIMEOUT
+from wiki2txt.processor import Processor
+from wiki2txt.wiki_data import Article
+
+local = threading.local()  # converter of convert(), one per thread (keeps its caches)
+
+
+def get_processor(
+    links=True, categories=True, redirects=True, references=False, **options
+):
+    """Returns a processor with default options (not parsing sys.argv), quiet and
+    producing parsed data instead of outputs. options are set as arg_* attributes.
+    """
+    processor = Processor()
+    processor.get_options([])
+    processor.arg_input = None  # not sys.stdin / sys.stdout, cleanup would close them
+    processor.arg_output = None  # once they are replaced (e.g. by output capturing)
+    processor.arg_verbose = False
+    processor.arg_records = True
+    processor.arg_links_file = links
+    processor.arg_categories_file = categories
+    processor.arg_redirects_file = redirects
+    processor.arg_references = references
+    for name, value in options.items():
+        setattr(processor, "arg_" + name, value)
+    return processor
+
+
+def convert(
+    wikitext,
+    links=True,
+    categories=True,
+    redirects=True,
+    references=False,
+    article_timeout=ARTICLE_TIMEOUT,
+):
+    """Converts wiki markup of a single article, returns its WikiData (plain_text, links,
+    categories and redirect target, if it's a redirect). Raises TimeoutError when it
+    takes longer than the article time budget (seconds, 0 disables it).
+    """
+    processor = getattr(local, "processor", None)
+    if processor is None:
+        processor = local.processor = get_processor()
+    processor.arg_links_file = links
+    processor.arg_categories_file = categories
+    processor.arg_redirects_file = redirects
+    processor.arg_references = references
+    processor.arg_article_timeout = article_timeout
+    return processor.convert_text(unicodedata.normalize("NFKD", wikitext))
+
+
+def iter_articles(
+    source,
+    jobs=1,
+    links=True,
+    categories=True,
+    redirects=True,
+    references=False,
+    executor=None,
+    unordered=False,
+    max_inflight_mb=0,
+):
+    """Yields an Article per page of a wikidump, a path or a binary file object.
+
+    Articles are parsed by the same pipeline as wiki2txt.py, jobs > 1 (or "auto") runs a
+    pool of the executor ("serial", "process" or "thread"). Memory stays bounded, only a
+    window of articles is in flight (max_inflight_mb caps it). Articles are yielded in
+    dump order unless unordered. Closing the generator early stops the pool.
+    """
+    processor = get_processor(
+        links,
+        categories,
+        redirects,
+        references,
+        executor=executor,
+        unordered=unordered,
+        max_inflight_mb=max_inflight_mb,
+        auto_jobs=jobs == "auto",
+    )
+    processor.jobs = 1 if jobs == "auto" else jobs
+    processor.stats = {}
+    processor.replay_ids = None
+    processor.telemetry = None
+    input_file = source
+    if isinstance(source, (str, os.PathLike)):
+        input_file = open(source, "rb")
+    try:
+        context, namespace = processor.get_etree_and_namespace(input_file)
+        next(context)  # the root element
+        batches = processor.iter_batches(processor.iter_pages(context, namespace))
+        try:
+            for batch in batches:
+                for result in batch.articles:
+                    yield Article(
+                        result.id, result.title, result.wiki_data, result.error
+                    )
+        finally:
+            batches.close()
+    finally:
+        if input_file is not source:
+            input_file.close()
@@ -0,0 +1,140 @@
+# -*- coding: UTF-8 -*-
+"""Picks the number of jobs (-j auto) by a short warm-up and the CPUs actually available."""
+
+# standard libraries
+import math
+import os
+import time
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+PROC_CGROUP = "/proc/self/cgroup"  # cgroups of this process
+WARMUP_SECONDS = 1.0  # warm-up of -j auto (articles are processed by the main process)
+WARMUP_BYTES = 4000000  # payload of the warm-up, whichever comes first
+IO_BOUND_SHARE = (
+    0.5  # processing with less CPU time than this share of wall time waits on I/O
+)
+
+
+def get_cgroup_paths(proc_cgroup=PROC_CGROUP):
+    """Cgroup paths of this process by controller, "" for the cgroup v2 hierarchy
+    ("0::/user.slice/..."), controller names for cgroup v1 ("4:cpu,cpuacct:/docker/...").
+    """
+    paths = {}
+    try:
+        with open(proc_cgroup) as file:
+            for line in file:
+                _, controllers, path = line.rstrip("\n").split(":", 2)
+                for controller in controllers.split(","):
+                    paths[controller] = path
+    except (OSError, ValueError):
+        pass
+    return paths
+
+
+def get_cgroup_dirs(mount, path):
+    """Directories of a cgroup under a hierarchy mount, from the cgroup up to the mount
+    (quotas of parents apply too; in a container the mount is the container's cgroup).
+    """
+    parts = [part for part in path.split("/") if part]
+    return [os.path.join(mount, *parts[:depth]) for depth in range(len(parts), -1, -1)]
+
+
+def get_cpu_quota(cgroup_root=CGROUP_ROOT, proc_cgroup=PROC_CGROUP):
+    """CPUs granted by the cgroup CPU quota (containers, systemd slices), the lowest
+    quota of the process's cgroup and its parents, None if there is no quota.
+    """
+    paths = get_cgroup_paths(proc_cgroup)
+    quotas = []
+    found = False
+    for directory in get_cgroup_dirs(cgroup_root, paths.get("", "/")):
+        try:  # cgroup v2, "max 100000" or "200000 100000"
+            with open(os.path.join(directory, "cpu.max")) as file:
+                quota, period = file.read().split()[:2]
+            found = True
+            if quota != "max":
+                quotas.append(int(quota) / int(period))
+        except (OSError, ValueError):
+            continue
+    if found:
+        return min(quotas, default=None)
+    for mount in ("cpu", "cpu,cpuacct"):  # cgroup v1, quota -1 means no limit
+        for directory in get_cgroup_dirs(
+            os.path.join(cgroup_root, mount), paths.get("cpu", "/")
+        ):
+            try:
+                with open(os.path.join(directory, "cpu.cfs_quota_us")) as file:
+                    quota = int(file.read())
+                with open(os.path.join(directory, "cpu.cfs_period_us")) as file:
+                    period = int(file.read())
+            except (OSError, ValueError):
+                continue
+            found = True
+            if quota > 0 and period > 0:
+                quotas.append(quota / period)
+        if found:
+            return min(quotas, default=None)
+    return None
+
+
+def get_available_cpus():
+    """CPUs this process may run on (affinity mask), limited by the cgroup CPU quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS and Windows
+        cpus = os.cpu_count() or 1
+    quota = get_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(cpus, 1)
+
+
+class AutoTuner:
+    """Warm-up of -j auto. The main process reads and processes the first articles itself,
+    the time it spends processing (worker throughput) versus the rest of the time (reading
+    and writing, reader throughput) tells how many workers keep up with the reader.
+    """
+
+    def __init__(self, cpus=None, max_jobs=None):
+        self.cpus = cpus or get_available_cpus()
+        self.max_jobs = max_jobs or 2 * self.cpus
+        self.started = time.perf_counter()
+        self.bytes = 0  # payload of processed articles (characters of wiki text)
+        self.process_seconds = 0.0
+        self.process_cpu_seconds = 0.0
+
+    def add(self, size, seconds, cpu_seconds):
+        """Adds an article processed during the warm-up."""
+        self.bytes += size
+        self.process_seconds += seconds
+        self.process_cpu_seconds += cpu_seconds
+
+    def is_done(self):
+        return (
+            self.bytes >= WARMUP_BYTES
+            or time.perf_counter() - self.started >= WARMUP_SECONDS
+        )
+
+    def get_read_seconds(self):
+        """Wall time of the warm-up spent outside of processing."""
+        return max(time.perf_counter() - self.started - self.process_seconds, 1e-6)
+
+    def get_jobs(self):
+        """Workers needed to keep up with the reader. Up to the available CPUs, or up to
+        max_jobs when processing waits on I/O (oversubscribed, it leaves CPUs idle).
+        Fewer when the reader is the bottleneck.
+        """
+        if self.process_seconds <= 0:
+            return 1
+        jobs = math.ceil(self.process_seconds / self.get_read_seconds())
+        limit = self.cpus
+        if self.process_cpu_seconds < IO_BOUND_SHARE * self.process_seconds:
+            limit = self.max_jobs
+        return min(max(jobs, 1), limit)
+
+    def format(self):
+        """Describes the warm-up measurements."""
+        return "reader %.2f MB/s, a job %.2f MB/s, %d CPUs available" % (
+            self.bytes / 1000000 / self.get_read_seconds(),
+            self.bytes / 1000000 / max(self.process_seconds, 1e-6),
+            self.cpus,
+        )
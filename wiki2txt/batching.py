@@ -0,0 +1,83 @@
+CHUNK_SECONDS = (
+    0.05  # targeted processing time of a single pool task (chunk of articles)
+)
+CHUNK_BYTES = 256000  # initial chunk size, before any processing time is observed
+MIN_CHUNK_BYTES = 16000
+MAX_CHUNK_BYTES = 8000000
+HUGE_ARTICLE_BYTES = (
+    200000  # articles processed in a chunk of their own, submitted first
+)
+CHUNKS_PER_JOB = 4  # chunks per worker dispatched at once (evens out uneven chunks)
+TUNING_WEIGHT = 0.2  # weight of the latest observation in the moving average
+
+
+class ChunkSizer:
+    """Splits articles into pool tasks of roughly equal work, measured in payload bytes.
+    The chunk size follows an exponential moving average of the processing time per byte,
+    so a chunk takes about CHUNK_SECONDS whatever the markup density of the dump is.
+    """
+
+    def __init__(
+        self, jobs, chunk_bytes=0, huge_bytes=HUGE_ARTICLE_BYTES, budget_bytes=0
+    ):
+        self.jobs = jobs
+        self.budget_bytes = budget_bytes  # payload read but not written yet, 0 no limit
+        self.huge_bytes = huge_bytes  # 0 disables the lane of huge articles
+        self.auto = not chunk_bytes  # fixed chunk size otherwise
+        self.chunk_bytes = chunk_bytes or CHUNK_BYTES
+        self.seconds_per_byte = None
+
+    def get_window_bytes(self):
+        """Payload bytes to collect before they are dispatched to the pool.
+        A window is in flight while the next one is collected, so a budget is split in two.
+        """
+        window = self.chunk_bytes * CHUNKS_PER_JOB * self.jobs
+        if self.budget_bytes:
+            window = min(window, max(self.budget_bytes // 2, 1))
+        return window
+
+    def observe(self, size, seconds):
+        """Tunes the chunk size by processing time of a finished chunk."""
+        if not self.auto or size <= 0:
+            return
+        seconds_per_byte = seconds / size
+        if self.seconds_per_byte is None:
+            self.seconds_per_byte = seconds_per_byte
+        else:
+            self.seconds_per_byte += TUNING_WEIGHT * (
+                seconds_per_byte - self.seconds_per_byte
+            )
+        if self.seconds_per_byte > 0:
+            chunk_bytes = int(CHUNK_SECONDS / self.seconds_per_byte)
+        else:
+            chunk_bytes = MAX_CHUNK_BYTES
+        self.chunk_bytes = min(max(chunk_bytes, MIN_CHUNK_BYTES), MAX_CHUNK_BYTES)
+
+    def is_huge(self, chunk, size):
+        """Tells whether a chunk is a huge article (to be submitted ahead of the others)."""
+        return bool(self.huge_bytes) and len(chunk) == 1 and size >= self.huge_bytes
+
+    def split(self, articles, sizes):
+        """Splits articles (kept in order) into chunks of about chunk_bytes each.
+        Huge articles always get a chunk of their own.
+        """
+        chunks = []
+        chunk = []
+        chunk_size = 0
+        for article, size in zip(articles, sizes):
+            if self.huge_bytes and size >= self.huge_bytes:
+                if chunk:
+                    chunks.append(chunk)
+                    chunk = []
+                    chunk_size = 0
+                chunks.append([article])
+                continue
+            chunk.append(article)
+            chunk_size += size
+            if chunk_size >= self.chunk_bytes:
+                chunks.append(chunk)
+                chunk = []
+                chunk_size = 0
+        if chunk:
+            chunks.append(chunk)
+        return chunks
@@ -0,0 +1,153 @@
+# standard libraries
+import gzip
+import lzma
+import os
+import queue
+import threading
+
+# optional libraries
+try:
+    import zstandard  # pip install zstandard
+except ImportError:  # zstd compression is optional
+    zstandard = None
+
+COMPRESSION_FORMATS = ("gzip", "zstd", "xz")
+
+COMPRESSION_EXTENSIONS = {
+    ".gz": "gzip",
+    ".gzip": "gzip",
+    ".zst": "zstd",
+    ".zstd": "zstd",
+    ".xz": "xz",
+}
+
+COMPRESSION_FRAME_SIZE = 4 * 1024 * 1024  # uncompressed bytes per independent frame
+
+COMPRESSION_QUEUE_SIZE = 8  # frames waiting for the compression thread (bounds memory)
+
+GZIP_LEVEL = 6  # zlib default (gzip.compress defaults to the much slower level 9)
+ZSTD_LEVEL = 3  # zstd default
+
+
+def get_compression(file_name, compression=None):
+    """Returns the compression format explicitly requested or implied by the file extension."""
+    if compression:
+        return compression
+    if not isinstance(file_name, str):
+        return None
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(file_name)[1].lower())
+
+
+def compress_frame(data, compression):
+    """Compresses data into a self-contained frame (gzip member, xz stream or zstd frame).
+    Frames of the same format can be concatenated and still decompress as a single stream.
+    """
+    if compression == "gzip":
+        return gzip.compress(data, compresslevel=GZIP_LEVEL)
+    if compression == "xz":
+        return lzma.compress(data, format=lzma.FORMAT_XZ)
+    if compression == "zstd":
+        if zstandard is None:
+            raise ImportError(
+                "zstd compression requires zstandard (pip install zstandard)"
+            )
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    raise ValueError(f"Unsupported compression format: {compression}")
+
+
+def open_input(file_name):
+    """Opens a (possibly compressed, detected from the extension) file for binary reading."""
+    compression = get_compression(file_name)
+    if compression == "gzip":
+        return gzip.open(file_name, "rb")
+    if compression == "xz":
+        return lzma.open(file_name, "rb")
+    if compression == "zstd":
+        if zstandard is None:
+            raise ImportError(
+                "zstd compression requires zstandard (pip install zstandard)"
+            )
+        return zstandard.ZstdDecompressor().stream_reader(
+            open(file_name, "rb"), read_across_frames=True, closefd=True
+        )
+    return open(file_name, "rb")
+
+
+class CompressedWriter:
+    """Binary file writer that compresses its output in a background thread.
+
+    Data is cut into frames of COMPRESSION_FRAME_SIZE bytes and every frame is compressed
+    independently, so appending to an existing file (e.g. when resuming with --skip) keeps
+    it readable and an interrupted run leaves all complete frames decodable.
+    zlib, lzma and zstandard release the GIL while compressing, so the compression thread
+    runs in parallel with the reader and the pool workers.
+    """
+
+    def __init__(self, file_name, mode, compression, frame_size=COMPRESSION_FRAME_SIZE):
+        if compression == "zstd" and zstandard is None:
+            raise ImportError(
+                "zstd compression requires zstandard (pip install zstandard)"
+            )
+        self.name = file_name
+        self.compression = compression
+        self.frame_size = frame_size
+        self.file = open(file_name, mode)
+        self.buffer = []
+        self.buffer_size = 0
+        self.error = None
+        self.closed = False
+        self.frames = queue.Queue(maxsize=COMPRESSION_QUEUE_SIZE)
+        self.thread = threading.Thread(
+            target=self._compress_frames, name="wiki2txt-compression", daemon=True
+        )
+        self.thread.start()
+
+    def _compress_frames(self):
+        """Compression thread. Compresses queued frames and writes them to the file."""
+        while True:
+            data = self.frames.get()
+            if data is None:  # sentinel, no more frames
+                return
+            if self.error is not None:
+                continue  # keep draining the queue so that writers never block
+            try:
+                self.file.write(compress_frame(data, self.compression))
+            except Exception as e:
+                self.error = e
+
+    def _check_error(self):
+        if self.error is not None:
+            raise IOError(f"Compressing {self.name} failed: {self.error}")
+
+    def _queue_buffer(self):
+        if self.buffer:
+            self.frames.put(b"".join(self.buffer))
+            self.buffer = []
+            self.buffer_size = 0
+
+    def write(self, data):
+        """Buffers data, hands a frame to the compression thread once the buffer is full."""
+        self._check_error()
+        if not isinstance(data, bytes):
+            data = bytes(data)  # buffered, so it can't be a view of reusable memory
+        self.buffer.append(data)
+        self.buffer_size += len(data)
+        if self.buffer_size >= self.frame_size:
+            self._queue_buffer()
+        return len(data)
+
+    def flush(self):
+        """Ends the current frame (does not wait for it to be compressed)."""
+        self._check_error()
+        self._queue_buffer()
+
+    def close(self):
+        """Compresses remaining data, waits for the compression thread and closes the file."""
+        if self.closed:
+            return
+        self.closed = True
+        self._queue_buffer()
+        self.frames.put(None)
+        self.thread.join()
+        self.file.close()
+        self._check_error()
@@ -1,20 +1,43 @@
 import optparse
 import sys
 import os
-import locale
 
-from multiprocessing import cpu_count
+from wiki2txt.affinity import AFFINITY_AVAILABLE, get_affinity, parse_layout
+from wiki2txt.autotune import get_available_cpus
+from wiki2txt.batching import HUGE_ARTICLE_BYTES
+from wiki2txt.compression import (
+    COMPRESSION_FORMATS,
+    CompressedWriter,
+    get_compression,
+    zstandard,
+)
+from wiki2txt.executors import EXECUTORS, is_gil_enabled
+from wiki2txt.graph_sink import EDGE_FORMATS
+from wiki2txt.profiling import format_stages, merge_stages
+from wiki2txt.slow_articles import SLOW_ARTICLES_TOP
+from wiki2txt.telemetry import TELEMETRY_FORMATS, TELEMETRY_INTERVAL
+from wiki2txt.parquet_sink import (
+    PARQUET_AVAILABLE,
+    PARQUET_BATCH_SIZE,
+    PARQUET_COMPRESSION,
+)
+
+ARTICLE_TIMEOUT = 30  # seconds, time budget of a single article
+
+NAME_CACHE_SIZE = 100000  # repaired article names memoized per process
+
+AVAILABLE_CPUS = get_available_cpus()  # affinity mask and cgroup CPU quota (containers)
 
 MAX_JOBS = (
-    cpu_count()
-)  # might increase above no. of CPUs to keep more tasks in flight to compensate for I/O delays and variable article length
+    2 * AVAILABLE_CPUS
+)  # above no. of CPUs to keep more tasks in flight to compensate for I/O delays and variable article length
 
 
 class Conductor:
     """Helper / handler / orchestrator of this script. Performs script related operations (option parsing, printing progress, etc.)."""
 
-    def get_options(self):
-        """This function is self-explained."""
+    def get_options(self, args=None):
+        """This function is self-explained. Parses args (sys.argv by default)."""
         opt_parser = optparse.OptionParser(
             usage="usage: %prog [options]", version="%prog 0.7.0"
         )
@@ -37,9 +60,8 @@ class Conductor:
             "-j",
             "--jobs",
             dest="jobs",
-            type="int",
-            default=1,
-            help=f"Number of parallel jobs (1 to {MAX_JOBS}, up to the CPU count). Defaults to 1.",
+            default="1",
+            help=f"Number of parallel jobs (1 to {MAX_JOBS}, up to 2x the CPU count) or auto (picked by a warm-up, up to {AVAILABLE_CPUS} CPUs available). Defaults to 1.",
         )
         opt_parser.add_option(
             "-n",
@@ -101,6 +123,212 @@ class Conductor:
             metavar="FILE",
             help="capture articles' categories in the FILE",
         )
+        opt_parser.add_option(
+            "--resolve-redirects",
+            action="store_true",
+            dest="resolve_redirects",
+            default=False,
+            help="rewrite link and category targets to canonical titles (an extra pass over -i FILE collects redirects)",
+        )
+        opt_parser.add_option(
+            "--redirect-map",
+            dest="redirect_map_file",
+            metavar="FILE",
+            help="resolve redirects using a previously produced redirects FILE (see -r) instead of an extra pass",
+        )
+        opt_parser.add_option(
+            "--edge-format",
+            dest="edge_format",
+            type="choice",
+            choices=EDGE_FORMATS,
+            default="text",
+            metavar="FORMAT",
+            help="write -l and -c edges as text (DEFAULT) or as binary int32 / int64 id pairs",
+        )
+        opt_parser.add_option(
+            "--edge-titles",
+            dest="edge_titles_file",
+            metavar="FILE",
+            help="title dictionary of binary edges, one title per line, id = line number (DEFAULT <links or categories FILE>.titles)",
+        )
+        opt_parser.add_option(
+            "--csr",
+            action="store_true",
+            dest="csr",
+            default=False,
+            help="build CSR adjacency (.csr.offsets, .csr.targets) of binary edge files after parsing",
+        )
+        opt_parser.add_option(
+            "--compress",
+            dest="compress",
+            type="choice",
+            choices=COMPRESSION_FORMATS,
+            metavar="FORMAT",
+            help="compress -o, -r, -l and -c output files with FORMAT (gzip, zstd or xz), otherwise detected from file extensions (.gz, .zst, .xz)",
+        )
+        opt_parser.add_option(
+            "--parquet",
+            dest="parquet_file",
+            metavar="FILE",
+            help="write articles (id, title, text, links, categories) to a Parquet FILE (requires pyarrow)",
+        )
+        opt_parser.add_option(
+            "--parquet-batch-size",
+            dest="parquet_batch_size",
+            type="int",
+            default=PARQUET_BATCH_SIZE,
+            metavar="NUMBER",
+            help=f"number of articles per Parquet row group (DEFAULT {PARQUET_BATCH_SIZE})",
+        )
+        opt_parser.add_option(
+            "--parquet-compression",
+            dest="parquet_compression",
+            default=PARQUET_COMPRESSION,
+            metavar="CODEC",
+            help=f"Parquet compression codec, e.g. snappy, gzip, zstd, none (DEFAULT {PARQUET_COMPRESSION})",
+        )
+        opt_parser.add_option(
+            "--name-cache-size",
+            dest="name_cache_size",
+            type="int",
+            default=NAME_CACHE_SIZE,
+            metavar="NUMBER",
+            help=f"repaired article names memoized per process, 0 disables the cache (DEFAULT {NAME_CACHE_SIZE})",
+        )
+        opt_parser.add_option(
+            "--profile-stages",
+            action="store_true",
+            dest="profile_stages",
+            default=False,
+            help="measure time spent in each processing stage and print a ranked report at the end",
+        )
+        opt_parser.add_option(
+            "--article-timeout",
+            dest="article_timeout",
+            type="float",
+            default=ARTICLE_TIMEOUT,
+            metavar="SECONDS",
+            help=f"time budget of a single article, slower articles are skipped, 0 disables it (DEFAULT {ARTICLE_TIMEOUT})",
+        )
+        opt_parser.add_option(
+            "--slow-log",
+            dest="slow_log_file",
+            metavar="FILE",
+            help="write the slowest and largest articles to a quarantine FILE (JSON lines), with the slowest stage of each (stages are timed, as with --profile-stages)",
+        )
+        opt_parser.add_option(
+            "--slow-top",
+            dest="slow_top",
+            type="int",
+            default=SLOW_ARTICLES_TOP,
+            metavar="NUMBER",
+            help=f"number of slowest (and largest) articles to keep track of (DEFAULT {SLOW_ARTICLES_TOP})",
+        )
+        opt_parser.add_option(
+            "--replay",
+            dest="replay_file",
+            metavar="FILE",
+            help="re-run only articles listed in a quarantine FILE (see --slow-log) with stage profiling",
+        )
+        opt_parser.add_option(
+            "--chunk-size",
+            dest="chunk_size",
+            type="int",
+            default=0,
+            metavar="BYTES",
+            help="payload of articles processed per pool task, 0 tunes it by observed processing time (DEFAULT 0)",
+        )
+        opt_parser.add_option(
+            "--huge-article-size",
+            dest="huge_article_size",
+            type="int",
+            default=HUGE_ARTICLE_BYTES,
+            metavar="BYTES",
+            help=f"articles from this size on are processed in a task of their own, started ahead of the others, 0 disables it (DEFAULT {HUGE_ARTICLE_BYTES})",
+        )
+        opt_parser.add_option(
+            "--max-inflight-mb",
+            dest="max_inflight_mb",
+            type="float",
+            default=0,
+            metavar="MB",
+            help="memory budget of payload read but not written yet (collected and in flight), 0 for no limit (DEFAULT 0)",
+        )
+        opt_parser.add_option(
+            "--worker-max-articles",
+            dest="worker_max_articles",
+            type="int",
+            default=0,
+            metavar="NUMBER",
+            help="replaces pool workers (processes) after NUMBER articles, 0 never (DEFAULT 0)",
+        )
+        opt_parser.add_option(
+            "--worker-max-rss",
+            dest="worker_max_rss",
+            type="int",
+            default=0,
+            metavar="MB",
+            help="replaces pool workers (processes) from MB of resident memory on, 0 never (DEFAULT 0)",
+        )
+        opt_parser.add_option(
+            "--unordered",
+            action="store_true",
+            dest="unordered",
+            default=False,
+            help="with -j, write articles as soon as they are parsed instead of in input order",
+        )
+        opt_parser.add_option(
+            "--transport",
+            dest="transport",
+            type="choice",
+            choices=["pickle", "shm"],
+            default="pickle",
+            metavar="TRANSPORT",
+            help="how -j passes articles to workers and outputs back, pickle (messages) or shm (shared memory ring buffers) (DEFAULT pickle)",
+        )
+        opt_parser.add_option(
+            "--executor",
+            dest="executor",
+            type="choice",
+            choices=list(EXECUTORS),
+            metavar="EXECUTOR",
+            help="runs articles in the main process (serial), a pool of -j processes or a pool of -j threads (scales on free-threaded Python only) (DEFAULT serial with 1 job, process otherwise)",
+        )
+        opt_parser.add_option(
+            "--cpu-affinity",
+            dest="cpu_affinity",
+            metavar="LAYOUT",
+            help='pins the main process (reader and writer) and each worker to CPUs (Linux), auto (main process on a dedicated CPU, workers on the rest) or like "main=0,workers=1-7"',
+        )
+        opt_parser.add_option(
+            "--telemetry",
+            dest="telemetry_file",
+            metavar="FILE",
+            help="periodically write throughput samples (MB/s, articles/s, ETA, queue depth, worker utilization) to FILE",
+        )
+        opt_parser.add_option(
+            "--telemetry-format",
+            dest="telemetry_format",
+            type="choice",
+            choices=list(TELEMETRY_FORMATS),
+            default="json",
+            metavar="FORMAT",
+            help="format of the telemetry FILE, json (lines) or prometheus (textfile) (DEFAULT json)",
+        )
+        opt_parser.add_option(
+            "--telemetry-interval",
+            dest="telemetry_interval",
+            type="float",
+            default=TELEMETRY_INTERVAL,
+            metavar="SECONDS",
+            help=f"seconds between telemetry samples and progress updates (DEFAULT {TELEMETRY_INTERVAL})",
+        )
+        opt_parser.add_option(
+            "--serve",
+            dest="serve",
+            metavar="ADDRESS",
+            help='run a conversion server of wiki markup snippets with -j warm workers on localhost ("PORT" or "HOST:PORT", HTTP) or a Unix socket ("unix:PATH")',
+        )
         opt_parser.add_option(
             "-T",
             "--test",
@@ -109,20 +337,30 @@ class Conductor:
             default=False,
             help="test by parsing directly from STDIN (bypasses lxml parser)",
         )
-        (options, args) = opt_parser.parse_args()
+        opt_parser.add_option(
+            "--jsonl",
+            action="store_true",
+            dest="jsonl",
+            default=False,
+            help='with -T, convert JSON lines of snippets ({"id": ..., "text": ...}) from STDIN by -j jobs, a JSON line (id, text, links, categories, redirect) per snippet',
+        )
+        options, args = opt_parser.parse_args(args)
 
         # Validate jobs parameter
-        if (
-            not isinstance(options.jobs, int)
-            or options.jobs < 1
-            or options.jobs > MAX_JOBS
+        self.arg_auto_jobs = options.jobs == "auto"
+        if self.arg_auto_jobs:
+            self.jobs = 1  # until the warm-up is over
+        elif (
+            not options.jobs.isdigit()
+            or int(options.jobs) < 1
+            or int(options.jobs) > MAX_JOBS
         ):
             sys.stderr.write(
-                f"\nWARNING: Invalid number of jobs ({options.jobs}). Must be between 1 and {MAX_JOBS} (up to 2x the CPU count). Defaulting to 1.\n"
+                f"\nWARNING: Invalid number of jobs ({options.jobs}). Must be between 1 and {MAX_JOBS} (up to 2x the CPU count) or auto. Defaulting to 1.\n"
             )
             self.jobs = 1
         else:
-            self.jobs = options.jobs
+            self.jobs = int(options.jobs)
 
         self.arg_text = options.text
 
@@ -135,8 +373,6 @@ class Conductor:
             self.arg_skip = False
 
         self.arg_verbose = options.verbose
-        if self.arg_verbose:
-            locale.setlocale(locale.LC_ALL, "C")
 
         self.arg_references = options.references
 
@@ -148,13 +384,12 @@ class Conductor:
             self.arg_input_name = "stdin"
             self.arg_input = sys.stdin
 
+        self.arg_compress = options.compress  # checked as output files are opened
+
         if options.output is not None:
             if self.arg_text:
                 self.arg_output_name = options.output
-                if self.arg_skip:
-                    self.arg_output = open(options.output, "a+b")
-                else:
-                    self.arg_output = open(options.output, "wb")
+                self.arg_output = self.open_output(options.output, self.arg_skip)
             else:
                 self.arg_output_name = None
                 self.arg_output = None
@@ -173,9 +408,137 @@ class Conductor:
 
         self.arg_categories_file = options.categories_file
 
+        self.arg_redirect_map_file = options.redirect_map_file
+        self.arg_resolve_redirects = bool(
+            options.resolve_redirects or options.redirect_map_file
+        )
+        if (
+            self.arg_resolve_redirects
+            and not self.arg_redirect_map_file
+            and self.arg_input is sys.stdin
+        ):
+            sys.stderr.write(
+                "\nERROR: Resolving redirects from STDIN is not possible (input is read twice), use -i FILE or --redirect-map FILE.\n"
+            )
+            sys.exit(1)
+
+        self.arg_edge_format = options.edge_format
+        self.arg_edge_titles_file = options.edge_titles_file
+        self.arg_csr = options.csr
+        if self.arg_edge_titles_file is None and self.arg_edge_format != "text":
+            edges_file = self.arg_links_file or self.arg_categories_file
+            if edges_file:
+                self.arg_edge_titles_file = edges_file + ".titles"
+        if self.arg_csr and self.arg_edge_format == "text":
+            sys.stderr.write(
+                "\nWARNING: CSR adjacency requires binary edges (--edge-format int32 or int64). Not building CSR.\n"
+            )
+            self.arg_csr = False
+
+        self.arg_parquet_file = options.parquet_file
+        if self.arg_parquet_file and not PARQUET_AVAILABLE:
+            sys.stderr.write(
+                "\nERROR: Parquet output requires pyarrow (pip install pyarrow).\n"
+            )
+            sys.exit(1)
+        self.arg_parquet_batch_size = options.parquet_batch_size
+        self.arg_parquet_compression = options.parquet_compression
+        if self.arg_parquet_batch_size < 1:
+            sys.stderr.write(
+                f"\nWARNING: Invalid Parquet batch size ({self.arg_parquet_batch_size}). Defaulting to {PARQUET_BATCH_SIZE}.\n"
+            )
+            self.arg_parquet_batch_size = PARQUET_BATCH_SIZE
+
+        self.arg_name_cache_size = max(0, options.name_cache_size)
+        self.arg_profile_stages = options.profile_stages
+        self.arg_article_timeout = max(0.0, options.article_timeout)
+        self.arg_slow_log_file = options.slow_log_file
+        self.arg_slow_top = options.slow_top
+        self.arg_slow_articles = self.arg_slow_log_file is not None
+        self.arg_replay_file = options.replay_file
+        self.arg_chunk_size = max(0, options.chunk_size)
+        self.arg_huge_article_size = max(0, options.huge_article_size)
+        self.arg_max_inflight_mb = max(0, options.max_inflight_mb)
+        self.arg_worker_max_articles = max(0, options.worker_max_articles)
+        self.arg_worker_max_rss = max(0, options.worker_max_rss)
+        self.arg_unordered = options.unordered
+        self.arg_transport = options.transport
+        self.arg_executor = options.executor
+        if self.arg_executor == "thread" and is_gil_enabled() and self.arg_verbose:
+            sys.stderr.write(
+                "\nINFO: This Python runs threads under the GIL, --executor thread won't scale (try a free-threaded build or --executor process).\n"
+            )
+        if self.arg_transport == "shm" and self.arg_executor in ("serial", "thread"):
+            sys.stderr.write(
+                f"\nWARNING: --transport shm needs worker processes, {self.arg_executor} executor passes articles directly.\n"
+            )
+        self.arg_cpu_affinity = None  # (main CPUs, worker CPUs)
+        if options.cpu_affinity and not AFFINITY_AVAILABLE:
+            sys.stderr.write(
+                "\nWARNING: CPU affinity is not supported on this platform (Linux only), ignored.\n"
+            )
+        elif options.cpu_affinity:
+            try:
+                self.arg_cpu_affinity = parse_layout(
+                    options.cpu_affinity, get_affinity()
+                )
+            except ValueError as error:
+                sys.stderr.write(
+                    f"\nWARNING: Invalid CPU affinity ({options.cpu_affinity}), {error}. Not pinning.\n"
+                )
+        self.arg_telemetry_file = options.telemetry_file
+        self.arg_telemetry_format = options.telemetry_format
+        self.arg_telemetry_interval = options.telemetry_interval
+        if self.arg_telemetry_interval <= 0:
+            sys.stderr.write(
+                f"\nWARNING: Invalid telemetry interval ({self.arg_telemetry_interval}). Defaulting to {TELEMETRY_INTERVAL}.\n"
+            )
+            self.arg_telemetry_interval = TELEMETRY_INTERVAL
+
+        self.arg_serve = options.serve
+
         self.arg_test = options.test
         if self.arg_test:
             self.arg_text = True
+        self.arg_jsonl = options.jsonl
+        if self.arg_jsonl and not self.arg_test:
+            sys.stderr.write("\nWARNING: --jsonl requires -T, ignored.\n")
+            self.arg_jsonl = False
+
+    def open_output(self, file_name, append=False):
+        """Opens an output file, compressed in a background thread if requested (--compress or extension)."""
+        compression = get_compression(file_name, self.arg_compress)
+        if compression == "zstd" and zstandard is None:
+            sys.stderr.write(
+                f"\nERROR: zstd compression of {file_name} requires zstandard (pip install zstandard).\n"
+            )
+            sys.exit(1)
+        if compression:
+            return CompressedWriter(file_name, "ab" if append else "wb", compression)
+        return open(file_name, "ab" if append else "wb")
+
+    def add_stats(self, stats):
+        """Merges counters reported by a processor (possibly running in a pool worker)."""
+        for key, value in stats.items():
+            if key == "stages":
+                merge_stages(self.stats.setdefault("stages", {}), value)
+            else:
+                self.stats[key] = self.stats.get(key, 0) + value
+
+    def print_stats(self):
+        """Prints statistics of the finished run to stderr."""
+        hits = self.stats.get("name_cache_hits", 0)
+        lookups = hits + self.stats.get("name_cache_misses", 0)
+        if lookups and self.arg_verbose:
+            sys.stderr.write(
+                f"\nINFO: Name cache hit rate {hits / lookups * 100:.2f} % ({hits} of {lookups} lookups).\n"
+            )
+        if self.arg_profile_stages and self.stats.get("stages"):
+            sys.stderr.write(
+                "\nINFO: Processing stages (all processes):\n"
+                + format_stages(self.stats["stages"])
+                + "\n"
+            )
 
     def get_file_size(self, file):
         """Self explained."""
@@ -185,27 +548,3 @@ class Conductor:
             file.seek(0, os.SEEK_SET)
             return size
         return 0  # Return 0 for non-seekable (e.g., stdin)
-
-    def print_progress(self, file_size, size, previous_progress):
-        """Prints progress to stdout."""
-        progress_percentage = "%.2f" % (float(size) / file_size * 100)
-
-        if previous_progress[0] != progress_percentage:
-            output = "%s MB  of  %s MB" % (
-                locale.format_string("%0.2f", (float(size) / 1000000), True),
-                locale.format_string("%d", (file_size / 1000000), True),
-            )
-            output += " (" + progress_percentage + " %)"
-
-            # Add newline only at 100% completion
-            if progress_percentage == "100.00":
-                output += "\n"
-
-            for i in range(previous_progress[1]):
-                sys.stdout.write("\b")
-            sys.stdout.write(output)
-            sys.stdout.flush()
-
-            return progress_percentage, len(output)
-
-        return progress_percentage, previous_progress[1]
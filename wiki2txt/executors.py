@@ -0,0 +1,89 @@
+# -*- coding: UTF-8 -*-
+"""Executors running the article pipeline: in the main thread (serial), in a pool of
+worker processes or in a pool of worker threads (scales on free-threaded Python).
+
+All of them offer the part of the multiprocessing.Pool interface the processor uses.
+"""
+
+# standard libraries
+import sys
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
+
+EXECUTORS = ("serial", "process", "thread")
+
+
+def is_gil_enabled():
+    """False on free-threaded builds of Python (3.13t and later) running without the GIL."""
+    return getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+class SerialResult:
+    """Result of a task run by SerialPool (always ready)."""
+
+    def __init__(self, value=None, error=None):
+        self.value = value
+        self.error = error
+
+    def ready(self):
+        return True
+
+    def get(self, timeout=None):
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class SerialIterator:
+    """Results of SerialPool.imap, computed when asked for."""
+
+    def __init__(self, func, iterable):
+        self.results = map(func, iterable)
+
+    def next(self, timeout=None):
+        return next(self.results)
+
+    __next__ = next
+
+    def __iter__(self):
+        return self
+
+
+class SerialPool:
+    """Runs tasks right away in the calling thread (no pickling, no workers)."""
+
+    def __init__(self, processes=1, initializer=None, initargs=()):
+        if initializer is not None:
+            initializer(*initargs)
+
+    def apply_async(self, func, args=(), callback=None, error_callback=None):
+        try:
+            value = func(*args)
+        except Exception as error:
+            if error_callback is not None:
+                error_callback(error)
+            return SerialResult(error=error)
+        if callback is not None:
+            callback(value)
+        return SerialResult(value)
+
+    def imap(self, func, iterable):
+        return SerialIterator(func, iterable)
+
+    def close(self):
+        pass
+
+    def terminate(self):
+        pass
+
+    def join(self):
+        pass
+
+
+def create_executor(executor, processes, initializer=None, initargs=()):
+    """Creates the pool of the given executor (one of EXECUTORS)."""
+    if executor == "serial":
+        return SerialPool(processes, initializer, initargs)
+    if executor == "thread":
+        return ThreadPool(processes, initializer, initargs)
+    return Pool(processes, initializer, initargs)
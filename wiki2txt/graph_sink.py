@@ -0,0 +1,150 @@
+# standard libraries
+import os
+import sys
+from array import array
+from itertools import groupby
+
+EDGE_FORMATS = ("text", "int32", "int64")
+
+EDGE_TYPECODES = {"int32": "i", "int64": "q"}  # array typecodes of binary edge formats
+
+CSR_CHUNK_EDGES = 1 << 20  # edges read at once when building CSR adjacency
+
+
+def get_edge_array(edge_format, data=b""):
+    """Returns a little-endian array of ids for the given binary edge format."""
+    ids = array(EDGE_TYPECODES[edge_format])
+    if data:
+        ids.frombytes(data)
+        if sys.byteorder == "big":
+            ids.byteswap()
+    return ids
+
+
+def get_edge_bytes(ids):
+    """Returns little-endian bytes of an array of ids."""
+    if sys.byteorder == "big":
+        ids = array(ids.typecode, ids)
+        ids.byteswap()
+    return ids.tobytes()
+
+
+class TitleDictionary:
+    """Interns (repaired) titles into integer ids.
+    Titles are appended to the dictionary file one per line, the line number (from 0) is the id.
+    """
+
+    def __init__(self, file_name, append=False):
+        self.file_name = file_name
+        self.ids = {}
+        if append and os.path.exists(file_name):  # resuming? reuse assigned ids
+            with open(file_name, "rb") as titles:
+                for line in titles:
+                    self.ids[line[:-1].decode("utf-8")] = len(self.ids)
+        self.file = open(file_name, "ab" if append else "wb")
+
+    def get_id(self, title):
+        """Returns id of the title, assigns a new one if the title wasn't seen yet."""
+        id = self.ids.get(title)
+        if id is None:
+            id = len(self.ids)
+            self.ids[title] = id
+            self.file.write(title.encode("utf-8") + b"\n")
+        return id
+
+    def __len__(self):
+        return len(self.ids)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class TextEdgeSink:
+    """Writes edges (source, target) as text lines (source<TAB>target)."""
+
+    def __init__(self, file, encoding="utf-8"):
+        self.file = file
+        self.encoding = encoding
+        self.edges = 0
+
+    def add(self, source, targets):
+        """Writes edges from the source title to all target titles."""
+        if not targets:
+            return
+        self.file.write(
+            "".join(source + "\t" + i + "\n" for i in targets).encode(self.encoding)
+        )
+        self.edges += len(targets)
+
+
+class EdgeSink:
+    """Writes edges (source, target) as pairs of binary ids (little-endian int32 or int64)."""
+
+    def __init__(self, file, titles, edge_format):
+        self.file = file
+        self.titles = titles
+        self.edge_format = edge_format
+        self.edges = 0
+
+    def add(self, source, targets):
+        """Writes edges from the source title to all target titles."""
+        if not targets:
+            return
+        source_id = self.titles.get_id(source)
+        ids = get_edge_array(self.edge_format)
+        for target in targets:
+            ids.append(source_id)
+            ids.append(self.titles.get_id(target))
+        self.file.write(get_edge_bytes(ids))
+        self.edges += len(targets)
+
+
+def iter_edge_chunks(edge_file_name, edge_format):
+    """Yields (sources, targets) arrays of a binary edge file, CSR_CHUNK_EDGES at a time."""
+    chunk_size = CSR_CHUNK_EDGES * 2 * array(EDGE_TYPECODES[edge_format]).itemsize
+    with open(edge_file_name, "rb") as edges:
+        while True:
+            data = edges.read(chunk_size)
+            if not data:
+                return
+            ids = get_edge_array(edge_format, data)
+            yield ids[0::2], ids[1::2]
+
+
+def build_csr(edge_file_name, edge_format, node_count):
+    """Builds CSR adjacency (offsets plus targets) from a binary edge file.
+
+    Writes <edge_file_name>.csr.offsets (node_count + 1 little-endian int64 values) and
+    <edge_file_name>.csr.targets (ids in the edge format). Targets of node i are
+    targets[offsets[i]:offsets[i + 1]]. Memory usage is bounded by the number of nodes.
+    """
+    degrees = array("q", bytes(8 * node_count))
+    for sources, targets in iter_edge_chunks(edge_file_name, edge_format):
+        for source, run in groupby(sources):
+            degrees[source] += sum(1 for _ in run)
+
+    offsets = array("q", [0])
+    for degree in degrees:
+        offsets.append(offsets[-1] + degree)
+    cursors = array("q", offsets[:-1])  # next free position of each node's targets
+
+    offsets_file_name = edge_file_name + ".csr.offsets"
+    targets_file_name = edge_file_name + ".csr.targets"
+    with open(offsets_file_name, "wb") as offsets_file:
+        offsets_file.write(get_edge_bytes(offsets))
+
+    itemsize = array(EDGE_TYPECODES[edge_format]).itemsize
+    with open(targets_file_name, "wb") as targets_file:
+        targets_file.truncate(offsets[-1] * itemsize)
+        for sources, targets in iter_edge_chunks(edge_file_name, edge_format):
+            index = 0
+            for source, run in groupby(sources):
+                length = sum(1 for _ in run)
+                targets_file.seek(cursors[source] * itemsize)
+                targets_file.write(get_edge_bytes(targets[index : index + length]))
+                cursors[source] += length
+                index += length
+
+    return offsets_file_name, targets_file_name
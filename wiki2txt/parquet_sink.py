@@ -0,0 +1,90 @@
+# optional libraries
+try:
+    import pyarrow  # pip install pyarrow
+    import pyarrow.parquet
+except ImportError:  # parquet output is optional
+    pyarrow = None
+
+PARQUET_AVAILABLE = pyarrow is not None
+
+PARQUET_BATCH_SIZE = 1000  # articles buffered in memory before a row group is written
+PARQUET_COMPRESSION = "zstd"
+
+
+def get_parquet_schema():
+    """Returns the schema of the columnar output."""
+    return pyarrow.schema(
+        [
+            ("id", pyarrow.int64()),
+            ("title", pyarrow.string()),
+            ("text", pyarrow.string()),
+            ("text_length", pyarrow.int64()),
+            ("links", pyarrow.list_(pyarrow.string())),
+            ("categories", pyarrow.list_(pyarrow.string())),
+        ]
+    )
+
+
+class ParquetSink:
+    """Buffers parsed articles into record batches and writes them as Parquet row groups.
+    Memory usage is bounded by the batch size (one row group is held in memory at most).
+    """
+
+    def __init__(
+        self, file, batch_size=PARQUET_BATCH_SIZE, compression=PARQUET_COMPRESSION
+    ):
+        if pyarrow is None:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)")
+        self.batch_size = max(1, batch_size)
+        self.schema = get_parquet_schema()
+        self.writer = pyarrow.parquet.ParquetWriter(
+            file, self.schema, compression=compression
+        )
+        self.rows = 0
+        self._reset_columns()
+
+    def _reset_columns(self):
+        self.ids = []
+        self.titles = []
+        self.texts = []
+        self.text_lengths = []
+        self.links = []
+        self.categories = []
+
+    def add(self, id, title, text, links, categories):
+        """Buffers a single article, writes a row group once the batch is full."""
+        self.ids.append(int(id))
+        self.titles.append(title)
+        self.texts.append(text)
+        self.text_lengths.append(len(text) if text is not None else 0)
+        self.links.append(links)
+        self.categories.append(categories)
+        if len(self.ids) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Writes buffered articles as one row group."""
+        if not self.ids:
+            return
+        batch = pyarrow.RecordBatch.from_arrays(
+            [
+                pyarrow.array(self.ids, type=pyarrow.int64()),
+                pyarrow.array(self.titles, type=pyarrow.string()),
+                pyarrow.array(self.texts, type=pyarrow.string()),
+                pyarrow.array(self.text_lengths, type=pyarrow.int64()),
+                pyarrow.array(self.links, type=pyarrow.list_(pyarrow.string())),
+                pyarrow.array(self.categories, type=pyarrow.list_(pyarrow.string())),
+            ],
+            schema=self.schema,
+        )
+        self.writer.write_batch(batch, row_group_size=len(self.ids))
+        self.rows += len(self.ids)
+        self._reset_columns()
+
+    def close(self):
+        """Writes remaining articles and finalizes the file (footer)."""
+        if self.writer is None:
+            return
+        self.flush()
+        self.writer.close()
+        self.writer = None
@@ -1,9 +1,15 @@
 # standard libraries
+import json
 import sys
 import signal
+import threading
+import time
 from io import BytesIO
 import unicodedata
-from multiprocessing import Pool
+import weakref
+from collections import deque
+from functools import lru_cache
+import multiprocessing
 
 # non-standard libraries
 import lxml.etree  # pip install lxml
@@ -14,13 +20,26 @@ import regex as re
 # this happens rarely, when parsing a badly formatted page, often a corrupted page that wouldn't even load in a browser
 
 # local imports
-from wiki2txt.conductor import Conductor
+from wiki2txt.affinity import get_affinity, pin_worker, set_affinity
+from wiki2txt.autotune import AutoTuner
+from wiki2txt.batching import ChunkSizer
+from wiki2txt.compression import get_compression
+from wiki2txt.conductor import MAX_JOBS, NAME_CACHE_SIZE, Conductor
+from wiki2txt.executors import create_executor
+from wiki2txt.graph_sink import EdgeSink, TextEdgeSink, TitleDictionary, build_csr
 from wiki2txt.languages import LANGUAGES_SET
-from wiki2txt.wiki_data import WikiData
-
-ARTICLES_PER_JOB = 50  # batch size of lxml parsed articles processed per job
-
-REGEX_TIMEOUT = 30  # seconds
+from wiki2txt.parquet_sink import ParquetSink
+from wiki2txt.profiling import StageProfiler
+from wiki2txt.recycling import get_recycling_reason, get_rss
+from wiki2txt.redirects import RedirectMap
+from wiki2txt.shm_transport import SharedMemoryTransport, get_shared_buffer
+from wiki2txt.slow_articles import SlowArticleTracker, load_article_ids
+from wiki2txt.telemetry import CountingReader, Telemetry, get_progress_stream
+from wiki2txt.wiki_data import ArticleResult, BatchResult, WikiData
+
+WATCHDOG_GRACE = (
+    5  # seconds a pool worker may exceed the article time budget before it's replaced
+)
 
 DEFAULT_ENCODING = "utf-8"
 
@@ -28,71 +47,86 @@ DEFAULT_ENCODING = "utf-8"
 class Processor(Conductor):
     """Core class. Performs parsing and processing related operations."""
 
+    # REGULAR EXPRESSIONS PATTERNS FOR PARSING (compiled once, shared by all processors)
+    wikiRedRE = re.compile(r"(?i)#redirect\s*\[\[(.*?)\]\].*", re.DOTALL)
+    wikiLanRE = re.compile(r"(.*\[\[Category:.*?\]\]).*", re.DOTALL)
+    # wikiQuoRE = re.compile(r"\{\{cquote\|.*?\}\}", re.DOTALL)
+    wikiCurRE = re.compile(r"\{\{.*?\}\}", re.DOTALL)
+    # wikiClaRE = re.compile(r"\{\{lang\|([^{]*?(?:!\{\{)*?)\}\}", re.DOTALL)
+    wikiTabRE = re.compile(r"\{\|.*?\|\}", re.DOTALL)
+    wikiBrtRE = re.compile(
+        r"(?:<|(?:&lt;))/?(?:(?:br)|(?:BR)).*?/?\s*(?:>|(?:&gt;))", re.DOTALL
+    )
+    wikiBlqRE = re.compile(
+        r"(?:<|(?:&lt;))blockquote(?:>|(?:&gt;))(.*?)(?:<|(?:&lt;))/blockquote(?:>|(?:&gt;))",
+        re.DOTALL,
+    )
+    wikiComRE = re.compile(r"(?:<|(?:&lt;))!--.*?--(?:>|(?:&gt;))", re.DOTALL)
+    wikiTttRE = re.compile(
+        r"(?:<|(?:&lt;))(?:[tT]{2})(?:>|(?:&gt;))(.*?)(?:<|(?:&lt;))/(?:[tT]{2})(?:>|(?:&gt;))",
+        re.DOTALL,
+    )
+    # r"(?:<|(?:&lt;))[^/]*?(?!&gt;)/(?:>|(?:&gt;))"
+    # <abc asdaaa="aa" />
+    wikiCtaRE = re.compile(r"(?:<|(?:&lt;))(.*?)/(?:>|(?:&gt;))", re.DOTALL)
+    wikiOtaRE = re.compile(
+        r"(?i)((?:<|(?:&lt;))\s*(?P<tagname>\w+)(?:[^/]*?)(?:>|(?:&gt;)))(.*?)(?:<|(?:&lt;))\s*/\s*(?P=tagname)\s*(?:>|(?:&gt;))",
+        re.DOTALL,
+    )
+    wikiStaRE = re.compile(
+        r"(?i)(?:<|(?:&lt;))\s*/?\s*(?:div|center|p|small|b|sub|s|blockquote|font|ref|i|gallery|del|sicsic|sup|div\s.*?|noinclude|table|tr|tr\s.*?|li|hr|td|math)\s*/?\s*(?:>|(?:&gt;))",
+        re.DOTALL,
+    )
+    wikiSMaRE = re.compile(r"&[a-z]+;")
+    wikiSChRE = re.compile(
+        r"(?!:(?:<|(?:&lt;))(?:(?:tt)|(?:TT))(?:>|(?:&gt;)))&amp;#[0-9]+;(?!:(?:<|(?:&lt;))/(?:(?:tt)|(?:TT))(?:>|(?:&gt;)))",
+        re.DOTALL,
+    )
+    wikiRefRE = re.compile(
+        r"(?i)\[\[(?!category:)[\s_]*:?[\s_]*([^[]*?(?:!\[\[)*?)\]\]", re.DOTALL
+    )
+    # repaRefRE = re.compile(r"(?i)(^:category:\s*)(.)(.*)", re.DOTALL)
+    # remove trailing spaces (used to repair title)
+    repaTraRE = re.compile(r"^[\s_:]+")
+    # repair spaces with "_" (used to repair categories, links and titles)
+    repaBlaRE = re.compile(r"[\s_]+")
+    wikiCatRE = re.compile(r"(?i)\[\[(category:[^[]*?(?:!\[\[)*?)\]\]", re.DOTALL)
+    repaCatRE = re.compile(r"(?i)(^:?category:[\s_]*)(.)(.*)")
+    wikiImgRE = re.compile(r"\[\[:?(Image|File):.*?\]\]", re.DOTALL)
+    # [[(http | https | ftp) :// ...] ...] or [(http | https | ftp) :// ...]
+    wikiHttRE = re.compile(
+        r"(?:(?:\[\[(?:(?:http[s]?)|(?:ftp))://.*?\].*?\])|(?:\[(?:(?:http[s]?)|(?:ftp))://.*?\]))",
+        re.DOTALL,
+    )
+    wikiBolRE = re.compile(r"'''.*?'''", re.DOTALL)
+    wikiItaRE = re.compile(r"''.*?''", re.DOTALL)
+    wikiIteRE = re.compile(r"\n[*#(?:;)(?:#)]+[\ ]*")
+    wikiEolRE = re.compile(r"(?:\n){2,}")
+    wikiWhiRE = re.compile(
+        r"(?:\s){2,}", flags=re.M
+    )  # detects clusters of 2 or more white spaces
+    wikiBraRE = re.compile(r"\(\)")
+    wikiHeaRE = re.compile(r"[=]{2,4}.*?[=]{2,4}")
+
     def __init__(self):
         self.repeat = 1  # flag needed for nested elements
         self.wiki_data = WikiData()
-        # REGULAR EXPRESSIONS PATTERNS FOR PARSING
-        self.wikiRedRE = re.compile(r"(?i)#redirect\s*\[\[(.*?)\]\].*", re.DOTALL)
-        self.wikiLanRE = re.compile(r"(.*\[\[Category:.*?\]\]).*", re.DOTALL)
-        # self.wikiQuoRE = re.compile(r"\{\{cquote\|.*?\}\}", re.DOTALL)
-        self.wikiCurRE = re.compile(r"\{\{.*?\}\}", re.DOTALL)
-        # self.wikiClaRE = re.compile(r"\{\{lang\|([^{]*?(?:!\{\{)*?)\}\}", re.DOTALL)
-        self.wikiTabRE = re.compile(r"\{\|.*?\|\}", re.DOTALL)
-        self.wikiBrtRE = re.compile(
-            r"(?:<|(?:&lt;))/?(?:(?:br)|(?:BR)).*?/?\s*(?:>|(?:&gt;))", re.DOTALL
-        )
-        self.wikiBlqRE = re.compile(
-            r"(?:<|(?:&lt;))blockquote(?:>|(?:&gt;))(.*?)(?:<|(?:&lt;))/blockquote(?:>|(?:&gt;))",
-            re.DOTALL,
-        )
-        self.wikiComRE = re.compile(r"(?:<|(?:&lt;))!--.*?--(?:>|(?:&gt;))", re.DOTALL)
-        self.wikiTttRE = re.compile(
-            r"(?:<|(?:&lt;))(?:[tT]{2})(?:>|(?:&gt;))(.*?)(?:<|(?:&lt;))/(?:[tT]{2})(?:>|(?:&gt;))",
-            re.DOTALL,
-        )
-        # r"(?:<|(?:&lt;))[^/]*?(?!&gt;)/(?:>|(?:&gt;))"
-        # <abc asdaaa="aa" />
-        self.wikiCtaRE = re.compile(r"(?:<|(?:&lt;))(.*?)/(?:>|(?:&gt;))", re.DOTALL)
-        self.wikiOtaRE = re.compile(
-            r"(?i)((?:<|(?:&lt;))\s*(?P<tagname>\w+)(?:[^/]*?)(?:>|(?:&gt;)))(.*?)(?:<|(?:&lt;))\s*/\s*(?P=tagname)\s*(?:>|(?:&gt;))",
-            re.DOTALL,
-        )
-        self.wikiStaRE = re.compile(
-            r"(?i)(?:<|(?:&lt;))\s*/?\s*(?:div|center|p|small|b|sub|s|blockquote|font|ref|i|gallery|del|sicsic|sup|div\s.*?|noinclude|table|tr|tr\s.*?|li|hr|td|math)\s*/?\s*(?:>|(?:&gt;))",
-            re.DOTALL,
-        )
-        self.wikiSMaRE = re.compile(r"&[a-z]+;")
-        self.wikiSChRE = re.compile(
-            r"(?!:(?:<|(?:&lt;))(?:(?:tt)|(?:TT))(?:>|(?:&gt;)))&amp;#[0-9]+;(?!:(?:<|(?:&lt;))/(?:(?:tt)|(?:TT))(?:>|(?:&gt;)))",
-            re.DOTALL,
-        )
-        self.wikiRefRE = re.compile(
-            r"(?i)\[\[(?!category:)[\s_]*:?[\s_]*([^[]*?(?:!\[\[)*?)\]\]", re.DOTALL
-        )
-        # self.repaRefRE = re.compile(r"(?i)(^:category:\s*)(.)(.*)", re.DOTALL)
-        # remove trailing spaces (used to repair title)
-        self.repaTraRE = re.compile(r"^[\s_:]+")
-        # repair spaces with "_" (used to repair categories, links and titles)
-        self.repaBlaRE = re.compile(r"[\s_]+")
-        self.wikiCatRE = re.compile(
-            r"(?i)\[\[(category:[^[]*?(?:!\[\[)*?)\]\]", re.DOTALL
-        )
-        self.repaCatRE = re.compile(r"(?i)(^:?category:[\s_]*)(.)(.*)")
-        self.wikiImgRE = re.compile(r"\[\[:?(Image|File):.*?\]\]", re.DOTALL)
-        # [[(http | https | ftp) :// ...] ...] or [(http | https | ftp) :// ...]
-        self.wikiHttRE = re.compile(
-            r"(?:(?:\[\[(?:(?:http[s]?)|(?:ftp))://.*?\].*?\])|(?:\[(?:(?:http[s]?)|(?:ftp))://.*?\]))",
-            re.DOTALL,
-        )
-        self.wikiBolRE = re.compile(r"'''.*?'''", re.DOTALL)
-        self.wikiItaRE = re.compile(r"''.*?''", re.DOTALL)
-        self.wikiIteRE = re.compile(r"\n[*#(?:;)(?:#)]+[\ ]*")
-        self.wikiEolRE = re.compile(r"(?:\n){2,}")
-        self.wikiWhiRE = re.compile(
-            r"(?:\s){2,}", flags=re.M
-        )  # detects clusters of 2 or more white spaces
-        self.wikiBraRE = re.compile(r"\(\)")
-        self.wikiHeaRE = re.compile(r"[=]{2,4}.*?[=]{2,4}")
+        self.init_name_cache(NAME_CACHE_SIZE)
+        self.stage_profiler = None  # StageProfiler when profiling stages
+        self.deadline = None  # time.perf_counter() deadline of the current article
+        self.telemetry = None
+        self.in_flight = deque()  # chunks submitted to the pool (see map_articles)
+        self.in_flight_bytes = 0
+        self.last_progress = 0.0  # time the pool last finished a task (watchdog)
+        self.progress = threading.Event()  # set whenever the pool finishes a task
+        self.shm = None  # SharedMemoryTransport with --transport shm
+        self.executor = "serial"
+        self.auto_tuner = None  # AutoTuner during the warm-up of -j auto
+        self.worker = None  # Worker in this thread (serial executor, -j auto warm-up)
+        self.worker_counter = None  # next CPU of a pool worker with --cpu-affinity
+        self.retired_pools = []  # pools finishing their chunks before they are joined
+        self.arg_records = False  # parsed data instead of outputs (see wiki2txt.api)
+        self.arg_jsonl = False  # JSON lines output of snippets (-T --jsonl)
 
     def parse_language_references(self, match_obj):
         """Cuts language references from text."""
@@ -228,7 +262,7 @@ class Processor(Conductor):
         ff = re.compile(regex, re.DOTALL)
         ret = ""
         # print("DEBUG: before parse_opened_tag() ff.findall()")
-        for i in ff.findall(match_obj.group(3)):
+        for i in ff.findall(match_obj.group(3), timeout=self.get_timeout()):
             # print(match_obj.group(3))
             ret += match_obj.group(1)
         if ret != "":
@@ -258,7 +292,54 @@ class Processor(Conductor):
         """Repairs bad categories (i.e. \"category:abc\", \"Category:abc\")."""
         return "Category:" + match_obj.group(2).capitalize() + match_obj.group(3)
 
-    def repair_article_name(self, article_name):
+    def init_name_cache(self, size):
+        """Memoizes repair_article_name in a bounded LRU cache (size 0 disables caching).
+        Link targets are very repetitive, cached names skip the regex substitutions and
+        repeated links share a single string object (interned by the cache).
+        """
+        self.name_cache_size = size
+        self.name_cache_info = (0, 0)  # hits, misses already reported
+        self.__dict__.pop("repair_article_name", None)  # uncached (the class method)
+        if size > 0:
+            # a weak reference, the processor -> cache -> processor cycle would delay
+            # __del__ (and closing outputs) until the garbage collector runs
+            repair = weakref.WeakMethod(self.repair_article_name_uncached)
+            self.repair_article_name = lru_cache(maxsize=size)(
+                lambda article_name: repair()(article_name)
+            )
+
+    def get_name_cache_stats(self):
+        """Returns name cache hits and misses since the last call."""
+        if self.name_cache_size <= 0:
+            return None
+        info = self.repair_article_name.cache_info()
+        hits, misses = self.name_cache_info
+        self.name_cache_info = (info.hits, info.misses)
+        return {
+            "name_cache_hits": info.hits - hits,
+            "name_cache_misses": info.misses - misses,
+        }
+
+    def get_timeout(self):
+        """Returns time left of the current article's budget (regex timeout), None if unlimited.
+        Raises TimeoutError once the budget is spent, so every stage checks it.
+        """
+        if self.deadline is None:
+            return None
+        timeout = self.deadline - time.perf_counter()
+        if timeout <= 0:
+            raise TimeoutError("Article time budget exceeded")
+        return timeout
+
+    def get_stats(self):
+        """Returns counters accumulated since the last call (reported with each result)."""
+        stats = self.get_name_cache_stats()
+        if self.stage_profiler is not None:
+            stats = stats or {}
+            stats["stages"] = self.stage_profiler.take_stages()
+        return stats
+
+    def repair_article_name_uncached(self, article_name):
         """Repairs bad formated category/link/title."""
         if len(article_name) > 0:
             article_name = self.repaCatRE.sub(self.repair_category, article_name)
@@ -267,9 +348,11 @@ class Processor(Conductor):
             article_name = article_name[0].upper() + article_name[1:]
         return article_name
 
+    repair_article_name = repair_article_name_uncached  # unless cached per processor
+
     def parse_category(self, match_obj):
         """Collects categories"""
-        if self.arg_references or self.arg_categories_file:
+        if self.arg_references or self.arg_categories_file or self.arg_parquet_file:
             index = match_obj.group(1).find("|")
             if index == -1:
                 category = self.repair_article_name(match_obj.group(1))
@@ -306,14 +389,14 @@ class Processor(Conductor):
         link_separator = annotation.find("|")
 
         if link_separator == -1:  # self reference (e.g. [[aaa]])
-            if self.arg_links_file:
+            if self.arg_links_file or self.arg_parquet_file:
                 link = self.repair_article_name(annotation)
                 self.wiki_data.links.append(link)
             if not self.arg_references:
                 return annotation
             ret += 'target="' + annotation + '">' + annotation
         else:
-            if self.arg_links_file or self.arg_references:
+            if self.arg_links_file or self.arg_references or self.arg_parquet_file:
                 link = self.repair_article_name(annotation[:link_separator])
                 self.wiki_data.links.append(link)
             if not self.arg_references:
@@ -363,119 +446,177 @@ class Processor(Conductor):
 
     def get_wiki_data(self, text):
         """Get plain (unformatted) text, references, links, categories from wikidump formatted text."""
+        profiler = self.stage_profiler  # None unless --profile-stages or --slow-log
+        if profiler is not None:
+            profiler.start(text)
+
         # redirected pages (articles), i.e. #REDIRECT
         # redirection is handeled befor this method ... in xml parsing
         if self.arg_references:
             if text[:9].upper() == "#REDIRECT":
                 self.wiki_data.plain_text = (
-                    '<redirect target="' + self.wikiRedRE.sub(r"\g<1>", text) + '"/>'
+                    '<redirect target="'
+                    + self.wikiRedRE.sub(r"\g<1>", text, timeout=self.get_timeout())
+                    + '"/>'
                 )
+                if profiler is not None:
+                    profiler.mark("redirect", self.wiki_data.plain_text)
                 return
 
         if self.arg_redirects_file:
             if text[:9].upper() == "#REDIRECT":
                 self.wiki_data.redirect = self.repair_article_name(
-                    self.wikiRedRE.sub(r"\g<1>", text)
+                    self.wikiRedRE.sub(r"\g<1>", text, timeout=self.get_timeout())
                 )
+                if profiler is not None:
+                    profiler.mark("redirect", self.wiki_data.redirect)
                 return
 
         ### DELETING
         ## GOOD TO PARSE AS FIRST (commented tags can make a mess)
         # comments, i.e. &lt;!-- ... --&gt;
-        text = self.wikiComRE.sub("", text)  # <-- TODO: Heavy processing, optimize
+        text = self.wikiComRE.sub(
+            "", text, timeout=self.get_timeout()
+        )  # <-- TODO: Heavy processing, optimize
+        if profiler is not None:
+            profiler.mark("comments", text)
 
         ### DELETING
         # br tags, i.e. &lt;br&gt;
         # &lt; or '<' are the same but it depends on how you get the input
         # both will be used for safety reasons
-        text = self.wikiBrtRE.sub("", text)  # <-- TODO: Heavy processing, optimize
+        text = self.wikiBrtRE.sub(
+            "", text, timeout=self.get_timeout()
+        )  # <-- TODO: Heavy processing, optimize
+        if profiler is not None:
+            profiler.mark("br", text)
 
         ### DELETING / REPLACING
         # other curly brackets (even nested ones, like Infobox), i.e. {{ ... }}
+        calls = 0
         while self.repeat:
             self.repeat = 0  # if no nested elements then don't repeat
+            calls += 1
             text = self.wikiCurRE.sub(
-                self.parse_curly, text
+                self.parse_curly, text, timeout=self.get_timeout()
             )  # <-- TODO: Heavy processing, optimize
         self.repeat = 1
+        if profiler is not None:
+            profiler.mark("curly", text, calls)
 
         ### DELETING
         # some sort of wiki table, i.e. {| ... |}
+        calls = 0
         while self.repeat:
             self.repeat = 0  # if no nested elements then don't repeat
-            text = self.wikiTabRE.sub(self.parse_table, text)
+            calls += 1
+            text = self.wikiTabRE.sub(
+                self.parse_table, text, timeout=self.get_timeout()
+            )
         self.repeat = 1
+        if profiler is not None:
+            profiler.mark("tables", text, calls)
 
         ### REPLACING
         # wiki images, i.e. [[Image:...]]
         # wiki files, i.e. [[File:...]]
         # wiki references are sometimes nested in image comments,
         # e.g. [[abc|...[[defg|[[...]]...]]]]
+        calls = 0
         while self.repeat:
             self.repeat = 0  # if no nested elements then don't repeat
-            text = self.wikiImgRE.sub(self.parse_image_text, text)
+            calls += 1
+            text = self.wikiImgRE.sub(
+                self.parse_image_text, text, timeout=self.get_timeout()
+            )
         self.repeat = 1
+        if profiler is not None:
+            profiler.mark("images", text, calls)
 
         ### REPLACING
         ## MUST GO BEFORE ALL TAGS PARSING
         # blocks of guotes, i.e. <blockquote>...</blockquote>
-        text = self.wikiBlqRE.sub(self.parse_block_quote, text)
+        text = self.wikiBlqRE.sub(
+            self.parse_block_quote, text, timeout=self.get_timeout()
+        )
+        if profiler is not None:
+            profiler.mark("blockquotes", text)
 
         ## MUST GO BEFORE TT TAGS PARSING
         # html ascii decimal characters, i.e. &#230
         text = self.wikiSChRE.sub(
-            self.parse_special_char, text
+            self.parse_special_char, text, timeout=self.get_timeout()
         )  # <-- TODO: Heavy processing, optimize
+        if profiler is not None:
+            profiler.mark("special_chars", text)
         ## MUST GO BEFORE ALL TAGS PARSING
         # tt tags, i.e. <tt>&amp;amp;#230</tt>
-        text = self.wikiTttRE.sub(self.parse_tag_TT, text)
+        text = self.wikiTttRE.sub(self.parse_tag_TT, text, timeout=self.get_timeout())
+        if profiler is not None:
+            profiler.mark("tt_tags", text)
 
         ### DELETING
         # opened tags, i.e. <abc>...</(abc)>
         # print("DEBUG: before parse_opened_tag()")
+        calls = 0
         while self.repeat:
             self.repeat = 0  # if no nested elements then don't repeat
             # print(text)
             # with open('last-text2.txt', 'wb') as output: # DEBUG
             #  output.write(text.encode(DEFAULT_ENCODING)) # DEBUG
             # print("DEBUG: before calling re")
+            calls += 1
             text = self.wikiOtaRE.sub(
-                self.parse_opened_tag, text, timeout=REGEX_TIMEOUT
+                self.parse_opened_tag, text, timeout=self.get_timeout()
             )  # <-- TODO: Heavy processing, optimize
             # print("DEBUG: after calling re")
         self.repeat = 1
+        if profiler is not None:
+            profiler.mark("opened_tags", text, calls)
 
         ### DELETING
         ## MUST GO AFTER OPENNED TAGS PARSING
         # closed tags, i.e. <abc ... />
         # print("DEBUG: before parse_closed_tag()")
         text = self.wikiCtaRE.sub(
-            self.parse_closed_tag, text
+            self.parse_closed_tag, text, timeout=self.get_timeout()
         )  # <-- TODO: Heavy processing, optimize
+        if profiler is not None:
+            profiler.mark("closed_tags", text)
 
         ### DELETING
         ## MUST GO AFTER OPENNED AND CLOSED TAGS PARSING
         # tag soup (bad tags)
         # print("DEBUG: before parse_soup()")
-        text = self.wikiStaRE.sub(self.parse_soup, text)
+        text = self.wikiStaRE.sub(self.parse_soup, text, timeout=self.get_timeout())
+        if profiler is not None:
+            profiler.mark("tag_soup", text)
 
         ### DELETING
         # print("DEBUG: before parse_category()")
         if (
-            self.arg_text or self.arg_categories_file
+            self.arg_text or self.arg_categories_file or self.arg_parquet_file
         ):  # if parsing text, categories need to be cut away
             # wiki categories, i.e. [[Category:Anarchism| ]]
-            text = self.wikiCatRE.sub(self.parse_category, text)
+            text = self.wikiCatRE.sub(
+                self.parse_category, text, timeout=self.get_timeout()
+            )
+            if profiler is not None:
+                profiler.mark("categories", text)
 
         ### REPLACING
         # wiki http reference, i.e. [http://abc/ ...]
-        text = self.wikiHttRE.sub(self.parse_http, text)
+        text = self.wikiHttRE.sub(self.parse_http, text, timeout=self.get_timeout())
+        if profiler is not None:
+            profiler.mark("http", text)
 
         ### REPLACING
         # wiki references, i.e. [[aa|bb]]
         text = self.wikiRefRE.sub(
-            self.parse_reference, text
+            self.parse_reference, text, timeout=self.get_timeout()
         )  # <-- TODO: Heavy processing, optimize
+        if profiler is not None:
+            profiler.mark("references", text)
 
         # no need to continue if only categories and/or links are being parsed
         if not self.arg_text:
@@ -483,19 +624,31 @@ class Processor(Conductor):
 
         ### REPLACING
         # &gt &lt &amp etc.
-        text = self.wikiSMaRE.sub(self.parse_special_mark, text)
+        text = self.wikiSMaRE.sub(
+            self.parse_special_mark, text, timeout=self.get_timeout()
+        )
+        if profiler is not None:
+            profiler.mark("special_marks", text)
 
         ### REPLACING
         # bold, i.e. '''...'''
-        text = self.wikiBolRE.sub(self.parse_bold, text)
+        text = self.wikiBolRE.sub(self.parse_bold, text, timeout=self.get_timeout())
+        if profiler is not None:
+            profiler.mark("bold", text)
 
         ### REPLACING
         # itallic, i.e. ''...''
-        text = self.wikiItaRE.sub(self.parse_itallic, text)
+        text = self.wikiItaRE.sub(self.parse_itallic, text, timeout=self.get_timeout())
+        if profiler is not None:
+            profiler.mark("italic", text)
 
         ### REPLACING
         # wiki item listing, i.e. "* ..." or "# ..." or ":; ..." or ":# ..."
-        text = self.wikiIteRE.sub(self.parse_item_list, text)
+        text = self.wikiIteRE.sub(
+            self.parse_item_list, text, timeout=self.get_timeout()
+        )
+        if profiler is not None:
+            profiler.mark("item_lists", text)
 
         ### REPLACING
         # EOL formating
@@ -503,18 +656,26 @@ class Processor(Conductor):
 
         ### REPLACING
         # whitespace formating (removes clusters of more than 2 whitespaces)
-        text = self.wikiWhiRE.sub(" ", text)  # <-- TODO: Heavy processing, optimize
+        text = self.wikiWhiRE.sub(
+            " ", text, timeout=self.get_timeout()
+        )  # <-- TODO: Heavy processing, optimize
+        if profiler is not None:
+            profiler.mark("whitespace", text)
 
         ### REPLACING
         # remove empty brackets
-        text = self.wikiBraRE.sub("", text)
+        text = self.wikiBraRE.sub("", text, timeout=self.get_timeout())
+        if profiler is not None:
+            profiler.mark("brackets", text)
 
         ### REPLACING
         # headings, i.e. ===...===
         # print("DEBUG: before parse_heading()")
         text = self.wikiHeaRE.sub(
-            self.parse_heading, text
+            self.parse_heading, text, timeout=self.get_timeout()
         )  # <-- TODO: Heavy processing, optimize
+        if profiler is not None:
+            profiler.mark("headings", text)
 
         self.wiki_data.plain_text = text
 
@@ -552,28 +713,771 @@ class Processor(Conductor):
         """TODO: Temporary method that will be replaced by unit tests in near future."""
 
         # print("INPUT (use CTRL-D in Unix or CTRL-Z in Windows to start parsing):\n")
-        input_data = bytes(
-            self.arg_input.read(), "utf8"
-        )  # send EOF to signify end of input
-        # input_data = unicodedata.normalize("NFKD", input_data.decode(DEFAULT_ENCODING)) # Normal Form KD
+        input_data = self.arg_input.read()  # send EOF to signify end of input
+        if isinstance(input_data, bytes):  # -i FILE is opened in binary mode
+            input_data = input_data.decode(DEFAULT_ENCODING)
+        input_data = unicodedata.normalize("NFKD", input_data)  # Normal Form KD
 
-        self.get_wiki_data(input_data)  # convert data to plaintext
-        sys.stdout.write(self.wiki_data.plain_text)  # write to STDOUT
+        try:
+            self.convert_text(input_data)  # convert data to plaintext
+        except TimeoutError:
+            sys.stderr.write(
+                f"\nERROR: Took longer than {self.arg_article_timeout} seconds to parse.\n"
+            )
+            sys.exit(1)
+        sys.stdout.write(self.wiki_data.plain_text or "")  # write to STDOUT
 
-    def ParseWiki(self):
-        """Parse text, links, categories from a wikidump."""
+    def convert_text(self, text):
+        """Converts wiki markup of a single text into self.wiki_data within the article
+        time budget (like pages of a wikidump), raises TimeoutError once it's spent.
+        """
+        if self.arg_article_timeout:
+            self.deadline = time.perf_counter() + self.arg_article_timeout
+        self.wiki_data = WikiData()
+        try:
+            self.get_wiki_data(text)
+        except TimeoutError:
+            self.repeat = 1  # runaway regex might have interrupted a repeat loop
+            raise
+        finally:
+            self.deadline = None
+        return self.wiki_data
+
+    def parse_jsonl(self):
+        """Converts snippets of wiki markup, JSON lines like {"id": ..., "text": ...}
+        (-T --jsonl), by the same pipeline as wikidumps. Writes a JSON line per snippet,
+        in input order (unless --unordered).
+        """
+        self.stats = {}
+        self.replay_ids = None
+        self.stage_profiler = (  # --slow-log names the slowest stage of articles
+            StageProfiler()
+            if self.arg_profile_stages or self.arg_slow_articles
+            else None
+        )
+        self.slow_articles = (
+            SlowArticleTracker(self.arg_slow_top) if self.arg_slow_articles else None
+        )
+        self.redirect_map = None
+        # records carry links, categories and redirects (not written to files)
+        self.arg_links_file = self.arg_categories_file = self.arg_redirects_file = True
+        self.arg_lnk_file = self.arg_cat_file = self.arg_red_file = None
+        self.arg_jsonl = True
+
+        input_file = self.arg_input
+        if input_file == sys.stdin:
+            input_file = input_file.buffer
+        reader = CountingReader(input_file)
+        self.telemetry = None
+        if self.arg_verbose or self.arg_telemetry_file:
+            self.telemetry = Telemetry(
+                reader,
+                (
+                    0
+                    if self.arg_input == sys.stdin
+                    else self.get_file_size(self.arg_input)
+                ),
+                self.jobs,
+                self.arg_telemetry_interval,
+                get_progress_stream(self.arg_output) if self.arg_verbose else None,
+                self.arg_telemetry_file,
+                self.arg_telemetry_format,
+            )
+            self.telemetry.start()
 
-        # getting file size
+        batches = self.iter_batches(self.iter_records(iter(reader.readline, b"")))
+        try:
+            for batch in batches:
+                self.write_batch(batch)
+        except KeyboardInterrupt:
+            sys.stderr.write("\nINFO: Parsing interrupted, cleaning up.\n")
+        finally:
+            batches.close()  # stops the executor
+            self.cleanup()
+        self.report_slow_articles()
+        self.print_stats()
+
+    def process_page(self, title, id, wiki):
+        """Process a single page of the wikidump and return everything it produced."""
+        started = time.perf_counter()
+        if self.arg_article_timeout:
+            self.deadline = started + self.arg_article_timeout
+        result = ArticleResult(id, title)
+        try:
+            self.convert_page(result, title, id, wiki)
+        except TimeoutError:
+            self.repeat = 1  # runaway regex might have interrupted a repeat loop
+            result.error = (
+                f"Took longer than {self.arg_article_timeout} seconds to parse."
+            )
+        except Exception as error:  # skips this article only, not its whole chunk
+            self.repeat = 1
+            result.error = f"Unexpected error: {error!r}"
+        finally:
+            self.deadline = None
+        if self.arg_jsonl and result.error:
+            result.output = get_jsonl_record(id, error=result.error)
+        result.seconds = time.perf_counter() - started
+        if self.arg_slow_articles:
+            result.size = len(wiki.encode(DEFAULT_ENCODING))
+        result.stats = self.get_stats()
+        return result
+
+    def convert_page(self, result, title, id, wiki):
+        """Converts a page and fills the result with all requested outputs."""
+        repaired_title = self.repair_article_name(title)
+        self.wiki_data = WikiData()
+        self.get_wiki_data(wiki)  # Populates self.wiki_data
+        if self.arg_jsonl:  # a JSON line per snippet instead of all other outputs
+            result.output = get_jsonl_record(
+                id,
+                text=self.wiki_data.plain_text,
+                links=self.wiki_data.links,
+                categories=self.wiki_data.categories,
+                redirect=self.wiki_data.redirect,
+            )
+            return
+
+        # binary edges and redirect resolution are written by edge sinks of the main process
+        edge_sinks = self.arg_edge_format != "text" or self.arg_resolve_redirects
+        # records of the library API (wiki2txt.api) carry parsed data instead of outputs
+        outputs = not self.arg_records
+        if self.arg_links_file and self.wiki_data.links and not edge_sinks and outputs:
+            result.link_text = "".join(
+                repaired_title + "\t" + i + "\n" for i in self.wiki_data.links
+            )
         if (
-            self.arg_input != sys.stdin
-            and self.arg_output != sys.stdout
-            and self.arg_verbose
+            self.arg_categories_file
+            and self.wiki_data.categories
+            and not edge_sinks
+            and outputs
         ):
-            input_file_size = self.get_file_size(self.arg_input)
-            previous_progress = ("", 0)
+            result.category_text = "".join(
+                repaired_title + "\t" + i + "\n" for i in self.wiki_data.categories
+            )
+        if self.arg_redirects_file and self.wiki_data.redirect and outputs:
+            result.redirect_text = (
+                repaired_title + "\t" + self.wiki_data.redirect + "\n"
+            )
+
+        if self.wiki_data.plain_text and self.arg_text and outputs:
+            if self.stage_profiler is not None:
+                self.stage_profiler.start(self.wiki_data.plain_text)
+            page_element = lxml.etree.Element("article")
+            id_element = lxml.etree.SubElement(page_element, "id")
+            id_element.text = id
+            title_element = lxml.etree.SubElement(page_element, "title")
+            title_element.text = title
+            text_element = lxml.etree.SubElement(page_element, "text")
+            text_element.text = self.wiki_data.plain_text
+            if self.arg_references and self.wiki_data.categories:
+                categories_element = lxml.etree.SubElement(page_element, "categories")
+                categories_text = "".join(
+                    f'<category target="{i}"/>' for i in self.wiki_data.categories
+                )
+                categories_element.text = categories_text
+            result.output = (
+                lxml.etree.tostring(page_element, encoding=DEFAULT_ENCODING) + b"\n"
+            )
+            if self.stage_profiler is not None:
+                self.stage_profiler.mark("xml_output", result.output)
+
+        # columnar output, edge sinks and records need the parsed data itself
+        if self.arg_parquet_file or edge_sinks or self.arg_records:
+            result.repaired_title = repaired_title
+            result.wiki_data = self.wiki_data
+
+    def write_output(self, output):
+        """Writes serialized articles to the text output."""
+        if self.arg_output == sys.stdout:
+            sys.stdout.buffer.write(output)
+        elif self.arg_output is not None:
+            self.arg_output.write(output)
+
+    def write_batch(self, batch):
+        """Write a batch of articles processed by a pool worker, a single write per output."""
+        for result in batch.articles:
+            self.write_result(result)
+        if batch.link_text and self.arg_lnk_file:
+            self.arg_lnk_file.write(batch.link_text)
+        if batch.category_text and self.arg_cat_file:
+            self.arg_cat_file.write(batch.category_text)
+        if batch.redirect_text and self.arg_red_file:
+            self.arg_red_file.write(batch.redirect_text)
+        if batch.output:
+            self.write_output(batch.output)
+
+    def write_result(self, result):
+        """Write a processed article to all requested outputs."""
+        if self.telemetry is not None:
+            self.telemetry.articles += 1
+            self.telemetry.busy_seconds += result.seconds or 0.0
+        if result.stats:
+            self.add_stats(result.stats)
+        if self.slow_articles is not None:
+            stages = result.stats.get("stages") if result.stats else None
+            self.slow_articles.add(
+                result.id,
+                result.title,
+                result.size,
+                result.seconds,
+                max(stages, key=lambda name: stages[name][0]) if stages else None,
+                result.error,
+            )
+        if result.error:
+            sys.stderr.write(
+                f'\nWARNING: Skipping article "{result.title}". {result.error}\n'
+            )
+            return
+        if result.link_text and self.arg_lnk_file:
+            self.arg_lnk_file.write(result.link_text.encode(DEFAULT_ENCODING))
+        if result.category_text and self.arg_cat_file:
+            self.arg_cat_file.write(result.category_text.encode(DEFAULT_ENCODING))
+        if result.redirect_text and self.arg_red_file:
+            self.arg_red_file.write(result.redirect_text.encode(DEFAULT_ENCODING))
+        if result.output:
+            self.write_output(result.output)
+        if result.wiki_data is not None:
+            links = result.wiki_data.links
+            categories = result.wiki_data.categories
+            if self.redirect_map is not None:  # point edges at canonical titles
+                links = [self.redirect_map.get(i) for i in links]
+                categories = [self.redirect_map.get(i) for i in categories]
+            if self.link_sink is not None:
+                self.link_sink.add(result.repaired_title, links)
+            if self.category_sink is not None:
+                self.category_sink.add(result.repaired_title, categories)
+            if self.parquet_sink is not None and not result.wiki_data.redirect:
+                self.parquet_sink.add(
+                    result.id,
+                    result.title,
+                    result.wiki_data.plain_text,
+                    links,
+                    categories,
+                )
+
+    def get_redirect_map(self):
+        """Builds a map of redirects, either from a redirects file or by an extra pass over the input."""
+        redirect_map = RedirectMap()
+        if self.arg_redirect_map_file:
+            redirect_map.load(self.arg_redirect_map_file)
+        else:
+            self.collect_redirects(self.arg_input, redirect_map)
+            self.arg_input.seek(0)  # rewind for the main pass
+        redirect_map.resolve()
+        if self.arg_verbose:
+            sys.stderr.write(
+                f"\nINFO: Resolving links and categories through {len(redirect_map)} redirects.\n"
+            )
+        return redirect_map
+
+    def collect_redirects(self, xml_file, redirect_map):
+        """First pass over a wikidump, collects redirects only (no text processing)."""
+        for event, element in lxml.etree.iterparse(xml_file, events=("end",)):
+            if element.tag.rpartition("}")[2] != "page":
+                continue
+            title = element.findtext("{*}title")
+            text = element.findtext("{*}revision/{*}text")
+            if title and text and text[:9].upper() == "#REDIRECT":
+                redirect_map.add(
+                    self.repair_article_name(unicodedata.normalize("NFKD", title)),
+                    self.repair_article_name(
+                        self.wikiRedRE.sub(
+                            r"\g<1>", unicodedata.normalize("NFKD", text)
+                        )
+                    ),
+                )
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+    def create_pool(self):
+        """Creates the pool of workers of the executor (processes, threads or serial).
+        The serial executor runs tasks by the Worker of this pipeline (self.worker, in
+        the calling thread), so pipelines in the same thread don't share a processor.
+        """
+        if self.executor == "serial":
+            if self.worker is None:  # or the one of the -j auto warm-up, already warm
+                self.worker = Worker(self.get_worker_options())
+            return create_executor(self.executor, self.jobs)
+        self.worker = None
+        return create_executor(
+            self.executor,
+            self.jobs,
+            init_worker if self.executor == "process" else init_worker_processor,
+            (self.get_worker_options(), self.get_worker_placement()),
+        )
+
+    def get_worker_placement(self):
+        """CPUs pool workers pin themselves to (one each, in turns), None to run anywhere.
+        The serial executor runs in the main process, which is placed already.
+        """
+        if self.arg_cpu_affinity is None or self.executor == "serial":
+            return None
+        return self.arg_cpu_affinity[1], self.worker_counter
+
+    def start_executor(self):
+        """Starts the executor (and shared memory transport), with -j auto sized by the
+        warm-up measurements, which also give the initial chunk size.
+        """
+        auto_tuner = self.auto_tuner
+        self.auto_tuner = None
+        if auto_tuner is not None:
+            self.jobs = auto_tuner.get_jobs()
+        self.executor = self.arg_executor or ("process" if self.jobs > 1 else "serial")
+        if self.arg_transport == "shm" and self.executor == "process":
+            self.shm = SharedMemoryTransport()
+        self.pool = self.create_pool()
+        self.chunk_sizer = ChunkSizer(
+            self.jobs,
+            self.arg_chunk_size,
+            self.arg_huge_article_size,
+            int(self.arg_max_inflight_mb * 1000000),
+        )
+        if auto_tuner is not None:
+            self.chunk_sizer.observe(auto_tuner.bytes, auto_tuner.process_seconds)
+            if self.arg_verbose:
+                sys.stderr.write(
+                    f"\nINFO: -j auto picked {self.jobs} jobs ({auto_tuner.format()}), chunks of {self.chunk_sizer.chunk_bytes // 1000} KB.\n"
+                )
+        if self.telemetry is not None:
+            self.telemetry.jobs = self.jobs
+
+    def warm_up(self, title, id, wiki):
+        """Processes an article of the -j auto warm-up in the main process (yielded right away)."""
+        started = time.perf_counter()
+        cpu_started = time.process_time()
+        result = self.worker.process_article((title, id, wiki))
+        self.auto_tuner.add(
+            len(wiki), time.perf_counter() - started, time.process_time() - cpu_started
+        )
+        if self.auto_tuner.is_done():
+            self.start_executor()
+        return result
+
+    def get_worker_options(self):
+        """Run options a pool worker needs (sent once, when the worker starts)."""
+        return (
+            self.arg_text,
+            bool(self.arg_links_file),
+            bool(self.arg_categories_file),
+            bool(self.arg_redirects_file),
+            self.arg_references,
+            bool(self.arg_parquet_file),
+            self.arg_edge_format,
+            self.arg_resolve_redirects,
+            self.arg_name_cache_size,
+            self.arg_profile_stages,
+            self.arg_slow_articles,
+            self.arg_article_timeout,
+            self.arg_records,
+            self.arg_jsonl,
+        )
+
+    def get_watchdog_timeout(self, articles=1):
+        """Seconds without any finished task after which the pool is considered stuck,
+        tasks of the given number of articles (each may spend its whole time budget).
+        Only worker processes can be replaced (stuck threads can't be killed).
+        """
+        if self.arg_article_timeout and self.executor == "process":
+            return self.arg_article_timeout * articles + WATCHDOG_GRACE
+        return None
+
+    def map_articles(self, chunks, drain=False):
+        """Submits chunks of articles (a pool task each) and yields their batch results
+        in input order (or as soon as they are finished with --unordered).
+
+        Huge articles (a chunk of their own, see ChunkSizer) are submitted first, longest
+        first, so they don't hold back the output more than necessary. Finished chunks
+        wait in the in-flight queue (reorder buffer) until all chunks before them are done.
+        Results are yielded until at most one window of payload is left in flight, so the
+        pool keeps working on this window while the next one is read. drain yields all.
+        """
+        if not self.in_flight:
+            self.last_progress = time.perf_counter()  # the pool was idle
+        entries = [
+            [chunk, None, sum(len(args[2]) for args in chunk), None, None, self.pool]
+            for chunk in chunks
+        ]  # chunk, pending result, payload, results, shared memory regions, pool
+        task_function = (
+            process_articles if self.worker is None else self.worker.process_articles
+        )
+        for entry in sorted(
+            entries,
+            key=lambda entry: (
+                -entry[2] if self.chunk_sizer.is_huge(entry[0], entry[2]) else 0
+            ),
+        ):
+            task = (entry[0],)
+            if self.shm is not None:
+                task = self.shm.pack(entry[0], DEFAULT_ENCODING) or task
+                entry[4] = task[1] if len(task) > 1 else None
+            entry[1] = self.pool.apply_async(
+                task_function,
+                task,
+                callback=self.mark_progress,
+                error_callback=self.mark_progress,
+            )
+        self.in_flight.extend(entries)
+        self.in_flight_bytes += sum(entry[2] for entry in entries)
+
+        limit = 0 if drain else self.chunk_sizer.get_window_bytes()
+        while self.in_flight and self.in_flight_bytes > limit:
+            if self.arg_unordered:  # any finished chunk
+                self.progress.clear()
+                entry = next(
+                    (
+                        entry
+                        for entry in self.in_flight
+                        if entry[3] is not None or entry[1].ready()
+                    ),
+                    None,
+                )
+                if entry is None:
+                    if not self.wait_for():
+                        self.recover_stuck_pool()
+                    continue
+            else:  # the oldest chunk
+                entry = self.in_flight[0]
+                if entry[3] is None and not self.wait_for(entry[1]):
+                    self.recover_stuck_pool()
+                    continue
+            if entry[3] is None:
+                self.collect(entry)
+                self.chunk_sizer.observe(
+                    entry[2], sum(result.seconds for result in entry[3].articles)
+                )
+                if entry[5] is self.pool:
+                    self.recycle_workers(entry[3])
+            self.in_flight.remove(entry)
+            self.in_flight_bytes -= entry[2]
+            self.join_retired_pools()
+            yield entry[3]
+            if entry[4] is not None:  # the batch is written, regions can be reused
+                self.shm.release(entry[4], entry[3])
+
+    def collect(self, entry):
+        """Takes results of a finished chunk."""
+        try:
+            entry[3] = entry[1].get()
+        except Exception as error:  # the whole task failed
+            entry[3] = get_batch_result(
+                [
+                    self.get_error_result(args, 0.0, f"Unexpected error: {error}")
+                    for args in entry[0]
+                ]
+            )
+            return
+        if entry[4] is not None:
+            self.shm.unpack(entry[3])
+
+    def recycle_workers(self, batch):
+        """Replaces pool workers (processes) once a worker processed too many articles or
+        its memory grew too much. A pool can't replace a single worker on demand, so the
+        pool is retired (closed, it finishes the chunks already submitted to it) and a new
+        one takes the next chunks. Nothing in flight is dropped.
+        """
+        if self.executor != "process":
+            return  # threads share the heap of the main process
+        reason = get_recycling_reason(
+            batch, self.arg_worker_max_articles, self.arg_worker_max_rss
+        )
+        if reason is None:
+            return
+        if self.arg_verbose:
+            sys.stderr.write(f"\nINFO: Replacing pool workers, {reason}.\n")
+        self.stats["worker_recycles"] = self.stats.get("worker_recycles", 0) + 1
+        self.pool.close()
+        self.retired_pools.append(self.pool)
+        self.pool = self.create_pool()
+
+    def join_retired_pools(self):
+        """Joins retired pools without chunks in flight (their workers exit)."""
+        for pool in self.retired_pools[:]:
+            if all(entry[5] is not pool for entry in self.in_flight):
+                pool.join()
+                self.retired_pools.remove(pool)
+
+    def mark_progress(self, results):
+        """Called (by the pool's result thread) whenever a task is finished."""
+        self.last_progress = time.perf_counter()
+        self.progress.set()
+
+    def wait_for(self, pending=None):
+        """Waits for a pending result (any finished task if None),
+        returns False if the pool got stuck in the meantime.
+        """
+        waitable = self.progress if pending is None else pending
+        done = self.progress.is_set if pending is None else pending.ready
+        articles = max(  # of the longest unfinished chunk, any of them may be running
+            (len(entry[0]) for entry in self.in_flight if entry[3] is None), default=1
+        )
+        timeout = self.get_watchdog_timeout(articles)
+        while not done():
+            if timeout is None:
+                waitable.wait()
+                continue
+            wait = self.last_progress + timeout - time.perf_counter()
+            if wait <= 0:
+                return done()
+            waitable.wait(wait)
+        return True
+
+    def recover_stuck_pool(self):
+        """Watchdog: no task finished within the time budget of its articles (plus
+        WATCHDOG_GRACE), so a worker is likely stuck in code the budget can't interrupt.
+        The pool is replaced and unfinished articles are processed again one by one,
+        skipping the stuck one. Chunks with results (collected or recovered before) are kept.
+        """
+        for entry in self.in_flight:
+            if entry[3] is None and entry[1].ready():
+                self.collect(entry)  # keep results that made it
+        unfinished = [entry for entry in self.in_flight if entry[3] is None]
+        for pool in self.retired_pools + [self.pool]:
+            pool.terminate()  # kill the stuck worker (and everything in flight)
+            pool.join()
+        self.retired_pools = []
+        self.pool = self.create_pool()
+        results = self.map_single_articles(
+            [args for entry in unfinished for args in entry[0]]
+        )
+        for entry in unfinished:
+            entry[3] = get_batch_result([next(results) for _ in entry[0]])
+        self.last_progress = time.perf_counter()
+
+    def map_single_articles(self, article_args):
+        """Yields results of articles processed by the pool one by one (in order).
+
+        The oldest article in flight is always running, so the article whose result
+        doesn't arrive in time is the stuck one. It's skipped, the pool is replaced and
+        the articles after it are submitted again.
+        """
+        timeout = self.get_watchdog_timeout()
+        index = 0
+        while index < len(article_args):
+            results = self.pool.imap(
+                process_article if self.worker is None else self.worker.process_article,
+                article_args[index:],
+            )
+            try:
+                while index < len(article_args):
+                    result = results.next(timeout)
+                    index += 1
+                    yield result
+            except multiprocessing.TimeoutError:
+                args = article_args[index]
+                index += 1
+                self.pool.terminate()
+                self.pool.join()
+                self.pool = self.create_pool()
+                yield self.get_error_result(
+                    args,
+                    timeout,
+                    f"Worker stuck for more than {timeout} seconds, replaced by a new one.",
+                )
+
+    def get_error_result(self, args, seconds, error):
+        """Returns the result of an article that couldn't be processed by the pool."""
+        title, id, wiki = args[:3]
+        result = ArticleResult(id, title)
+        result.seconds = seconds
+        result.error = error
+        if self.arg_jsonl:
+            result.output = get_jsonl_record(id, error=error)
+        if self.arg_slow_articles:
+            result.size = len(wiki.encode(DEFAULT_ENCODING))
+        return result
+
+    def iter_pages(self, context, namespace):
+        """Yields (title, id, wiki text) of pages of a wikidump (an lxml iterparse context)."""
+        nsdict = {"ns": namespace}
+        ns = "{%s}" % namespace
+        for event, element in context:
+            if element.tag != (ns + "page") or event != "end":
+                continue
+            try:
+                titles = element.xpath("ns:title/text()", namespaces=nsdict)
+                ids = element.xpath("ns:id/text()", namespaces=nsdict)
+                texts = element.xpath("ns:revision/ns:text/text()", namespaces=nsdict)
+                page = None
+                if len(titles) == 1 and len(ids) == 1:
+                    if self.replay_ids is None or ids[0] in self.replay_ids:
+                        wiki = unicodedata.normalize("NFKD", "".join(texts))
+                        page = (titles[0], ids[0], wiki)
+            except Exception:
+                import traceback
+
+                sys.stderr.write(
+                    f"\nWARNING: Skipping article due to unexpected error: {traceback.format_exc()}\n"
+                )
+                continue
+            finally:
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+            if page is not None:
+                yield page
+
+    def iter_records(self, lines):
+        """Yields (title, id, wiki text) of snippets, JSON lines like {"id": ..., "text": ...}
+        (a missing id is the line number).
+        """
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                wiki = record["text"]
+                if not isinstance(wiki, str):
+                    raise TypeError
+            except (ValueError, KeyError, TypeError):  # including JSON errors
+                sys.stderr.write(
+                    f'\nWARNING: Skipping line {number}, not a JSON record with "text".\n'
+                )
+                continue
+            yield (
+                str(record.get("title") or ""),
+                record.get("id", number),
+                unicodedata.normalize("NFKD", wiki),
+            )
 
+    def iter_batches(self, pages):
+        """Yields batches of processed articles of pages, (title, id, wiki text) like those
+        of iter_pages(), in input order (or as soon as they are finished with --unordered).
+        The executor runs meanwhile, it's stopped when the generator is closed.
+        """
+        self.pool = None
+        self.worker = None
+        original_affinity = None
+        if self.arg_cpu_affinity is not None:  # workers pin themselves
+            original_affinity = get_affinity()
+            set_affinity(self.arg_cpu_affinity[0])
+            self.worker_counter = multiprocessing.Value("i", 0)
+
+        interrupted = False
         try:
-            context, ns = self.get_etree_and_namespace(self.arg_input)
+            self.auto_tuner = None
+            if self.arg_auto_jobs:  # the executor starts once the warm-up is over
+                self.auto_tuner = AutoTuner(
+                    cpus=(
+                        len(self.arg_cpu_affinity[1])
+                        if self.arg_cpu_affinity is not None
+                        else None
+                    ),
+                    max_jobs=MAX_JOBS,
+                )
+                self.worker = Worker(self.get_worker_options())
+            else:
+                self.start_executor()
+            self.in_flight = deque()  # reorder buffer of submitted chunks
+            self.in_flight_bytes = 0
+            article_args = []
+            article_sizes = []  # payload of articles (characters of wiki text)
+            try:
+                for title, id, wiki in pages:
+                    try:
+                        if self.telemetry is not None:
+                            self.telemetry.pages_read += 1
+                        if self.auto_tuner is not None:
+                            yield get_batch_result([self.warm_up(title, id, wiki)])
+                            continue
+                        article_sizes.append(len(wiki))
+                        article_args.append((title, id, wiki))
+
+                        # Dispatch articles by payload size to limit memory usage
+                        if sum(article_sizes) >= self.chunk_sizer.get_window_bytes():
+                            yield from self.map_articles(
+                                self.chunk_sizer.split(article_args, article_sizes)
+                            )
+                            article_args = []
+                            article_sizes = []
+                    except IOError:
+                        raise
+                    except Exception:
+                        import traceback
+
+                        sys.stderr.write(
+                            f"\nWARNING: Skipping article due to unexpected error: {traceback.format_exc()}\n"
+                        )
+                        continue
+            except KeyboardInterrupt:
+                sys.stderr.write("\nWARNING: Prematurely aborted parsing.\n")
+                interrupted = True
+            except IOError:
+                sys.stderr.write("\nERROR: I/O error.\n")
+            except SystemExit:
+                # Silently handle SystemExit from signal handler
+                interrupted = True
+
+            # Process remaining articles
+            if not interrupted and self.pool is not None:
+                yield from self.map_articles(
+                    self.chunk_sizer.split(article_args, article_sizes), drain=True
+                )
+
+        finally:
+            for pool in self.retired_pools:  # none left unless parsing failed
+                pool.terminate()
+                pool.join()
+            self.retired_pools = []
+            if self.pool is not None:
+                self.pool.close()
+                self.pool.join()  # Ensure pool is fully closed
+            if self.shm is not None:
+                self.shm.close()
+                self.shm = None
+            if original_affinity is not None:
+                set_affinity(original_affinity)
+
+    def ParseWiki(self):
+        """Parse text, links, categories from a wikidump."""
+
+        self.stats = {}
+        if self.arg_name_cache_size != self.name_cache_size:
+            self.init_name_cache(self.arg_name_cache_size)
+        self.replay_ids = None
+        if self.arg_replay_file:  # re-run quarantined articles only, with profiling
+            self.replay_ids = load_article_ids(self.arg_replay_file)
+            self.arg_profile_stages = True
+            self.arg_slow_articles = True
+            self.arg_slow_top = max(self.arg_slow_top, len(self.replay_ids))
+        self.stage_profiler = (  # --slow-log names the slowest stage of articles
+            StageProfiler()
+            if self.arg_profile_stages or self.arg_slow_articles
+            else None
+        )
+        self.slow_articles = (
+            SlowArticleTracker(self.arg_slow_top) if self.arg_slow_articles else None
+        )
+
+        self.redirect_map = None
+        if self.arg_resolve_redirects:
+            self.redirect_map = self.get_redirect_map()
+
+        # sampling throughput on a timer (counts bytes consumed, works for STDIN too)
+        input_file = self.arg_input
+        if input_file == sys.stdin:
+            input_file = input_file.buffer
+        reader = CountingReader(input_file)
+        self.telemetry = None
+        if self.arg_verbose or self.arg_telemetry_file:
+            self.telemetry = Telemetry(
+                reader,
+                (
+                    0
+                    if self.arg_input == sys.stdin
+                    else self.get_file_size(self.arg_input)
+                ),
+                self.jobs,
+                self.arg_telemetry_interval,
+                get_progress_stream(self.arg_output) if self.arg_verbose else None,
+                self.arg_telemetry_file,
+                self.arg_telemetry_format,
+            )
+            self.telemetry.start()
+
+        try:
+            context, namespace = self.get_etree_and_namespace(reader)
             event, root = next(context)
         except Exception:
             raise
@@ -589,15 +1493,6 @@ class Processor(Conductor):
             try:
                 for i in range(count):
                     event, element = next(context)
-                    if (
-                        self.arg_input != sys.stdin
-                        and self.arg_output != sys.stdout
-                        and self.arg_verbose
-                    ):
-                        current_file_size = self.arg_input.tell()
-                        previous_progress = self.print_progress(
-                            input_file_size, current_file_size, previous_progress
-                        )
                     if event == "end":
                         element.clear()
                     while element.getprevious() is not None:
@@ -607,317 +1502,121 @@ class Processor(Conductor):
                     sys.stdout.write("\nINFO: Whole wikidump skipped.\n")
                 sys.exit(0)
 
-        nsdict = {"ns": ns}
-        ns = "{%s}" % ns
-
         # Prepare file handles for output
         if self.arg_links_file:
             self.arg_lnk_file = (
                 self.arg_links_file
                 if isinstance(self.arg_links_file, BytesIO)
-                else open(self.arg_links_file, "ab" if self.arg_skip else "wb")
+                else self.open_output(self.arg_links_file, self.arg_skip)
             )
         if self.arg_categories_file:
             self.arg_cat_file = (
                 self.arg_categories_file
                 if isinstance(self.arg_categories_file, BytesIO)
-                else open(self.arg_categories_file, "ab" if self.arg_skip else "wb")
+                else self.open_output(self.arg_categories_file, self.arg_skip)
             )
         if self.arg_redirects_file:
             self.arg_red_file = (
                 self.arg_redirects_file
                 if isinstance(self.arg_redirects_file, BytesIO)
-                else open(self.arg_redirects_file, "ab" if self.arg_skip else "wb")
+                else self.open_output(self.arg_redirects_file, self.arg_skip)
+            )
+        self.title_dictionary = None
+        self.link_sink = None
+        self.category_sink = None
+        if self.arg_edge_format != "text" and (
+            self.arg_links_file or self.arg_categories_file
+        ):
+            self.title_dictionary = TitleDictionary(
+                self.arg_edge_titles_file, append=bool(self.arg_skip)
+            )
+            if self.arg_links_file:
+                self.link_sink = EdgeSink(
+                    self.arg_lnk_file, self.title_dictionary, self.arg_edge_format
+                )
+            if self.arg_categories_file:
+                self.category_sink = EdgeSink(
+                    self.arg_cat_file, self.title_dictionary, self.arg_edge_format
+                )
+        elif self.arg_resolve_redirects:
+            if self.arg_links_file:
+                self.link_sink = TextEdgeSink(self.arg_lnk_file, DEFAULT_ENCODING)
+            if self.arg_categories_file:
+                self.category_sink = TextEdgeSink(self.arg_cat_file, DEFAULT_ENCODING)
+        self.parquet_sink = None
+        if self.arg_parquet_file:
+            self.parquet_sink = ParquetSink(
+                self.arg_parquet_file,
+                self.arg_parquet_batch_size,
+                self.arg_parquet_compression,
             )
 
-        if self.jobs > 1:  # Multiprocessing?
-            # Use multiprocessing with streaming
-            original_sigint_handler = signal.getsignal(signal.SIGINT)
-            pool = None
-            interrupted = False
-
-            def signal_handler(sig, frame):
-                nonlocal interrupted, pool
-                if pool is not None:
-                    pool.terminate()  # Forcefully stop all workers
-                    pool.close()
-                    pool.join()  # Ensure all processes are cleaned up
-                interrupted = True
-                sys.stderr.write("\nINFO: Interrupted by user, exiting cleanly.\n")
-                sys.exit(1)
-
-            # Only set handler in main process
-            if not hasattr(self, "_signal_set"):  # Avoid re-setting in workers
-                signal.signal(signal.SIGINT, signal_handler)
-                self._signal_set = True
-
-            # Block SIGINT in worker processes
-            def init_pool():
-                signal.signal(signal.SIGINT, signal.SIG_IGN)
+        # a single pipeline, articles are processed by the executor in chunks
+        original_sigint_handler = None
+        self.pool = None
 
-            try:
-                with Pool(processes=self.jobs, initializer=init_pool) as pool:
-                    article_args = []
-                    for event, element in context:
-                        if interrupted:
-                            break  # Stop processing if interrupted
-                        try:
-                            count += 1
-                            if (
-                                self.arg_input != sys.stdin
-                                and self.arg_output != sys.stdout
-                                and self.arg_verbose
-                            ):
-                                current_file_size = self.arg_input.tell()
-                                previous_progress = self.print_progress(
-                                    input_file_size,
-                                    current_file_size,
-                                    previous_progress,
-                                )
-
-                            if element.tag == (ns + "page") and event == "end":
-                                titles = element.xpath(
-                                    "ns:title/text()", namespaces=nsdict
-                                )
-                                ids = element.xpath("ns:id/text()", namespaces=nsdict)
-                                texts = element.xpath(
-                                    "ns:revision/ns:text/text()", namespaces=nsdict
-                                )
-
-                                if len(titles) != 1 or len(ids) != 1:
-                                    continue
-
-                                title = titles[0]
-                                id = ids[0]
-                                wiki = unicodedata.normalize("NFKD", "".join(texts))
-                                article_args.append(
-                                    (
-                                        title,
-                                        id,
-                                        wiki,
-                                        self.arg_text,
-                                        self.arg_links_file,
-                                        self.arg_categories_file,
-                                        self.arg_redirects_file,
-                                        self.arg_references,
-                                    )
-                                )
-
-                                element.clear()
-                                while element.getprevious() is not None:
-                                    del element.getparent()[0]
-
-                            # Process articles in chunks to limit memory usage
-                            if (
-                                len(article_args) >= self.jobs * ARTICLES_PER_JOB
-                            ):  # Process in small batches
-                                results = pool.imap(process_article, article_args)
-                                for (
-                                    output,
-                                    link_text,
-                                    category_text,
-                                    redirect_text,
-                                ) in results:
-                                    if link_text and self.arg_lnk_file:
-                                        self.arg_lnk_file.write(
-                                            link_text.encode(DEFAULT_ENCODING)
-                                        )
-                                        # self.arg_lnk_file.flush()
-                                    if category_text and self.arg_cat_file:
-                                        self.arg_cat_file.write(
-                                            category_text.encode(DEFAULT_ENCODING)
-                                        )
-                                        # self.arg_cat_file.flush()
-                                    if redirect_text and self.arg_red_file:
-                                        self.arg_red_file.write(
-                                            redirect_text.encode(DEFAULT_ENCODING)
-                                        )
-                                        # self.arg_red_file.flush()
-                                    if output:
-                                        if self.arg_output == sys.stdout:
-                                            print(output.decode())
-                                        elif self.arg_output is not None:
-                                            self.arg_output.write(output)
-                                            # self.arg_output.flush()  # Ensure immediate write
-                                article_args = []
-
-                        except TimeoutError:
-                            sys.stderr.write(
-                                f"\nWARNING: Skipping article. Took longer than {REGEX_TIMEOUT} seconds to parse.\n"
-                            )
-                            continue
-                        except KeyboardInterrupt:
-                            sys.stderr.write(
-                                "\nWARNING: Prematurely aborted parsing.\n"
-                            )
-                            interrupted = True
-                            break
-                        except IOError:
-                            sys.stderr.write("\nERROR: I/O error.\n")
-                            break
-                        except SystemExit:
-                            # Silently handle SystemExit from signal handler
-                            interrupted = True
-                            break
-                        except Exception:
-                            import traceback
-
-                            sys.stderr.write(
-                                f"\nWARNING: Skipping article due to unexpected error: {traceback.format_exc()}\n"
-                            )
-                            continue
+        def signal_handler(sig, frame):
+            if self.pool is not None:
+                self.pool.terminate()  # Forcefully stop all workers
+                self.pool.close()
+                self.pool.join()  # Ensure all processes are cleaned up
+            sys.stderr.write("\nINFO: Interrupted by user, exiting cleanly.\n")
+            sys.exit(1)
 
-                    # Process remaining articles
-                    if article_args and not interrupted:
-                        results = pool.imap(process_article, article_args)
-                        for output, link_text, category_text, redirect_text in results:
-                            if link_text and self.arg_lnk_file:
-                                self.arg_lnk_file.write(
-                                    link_text.encode(DEFAULT_ENCODING)
-                                )
-                                # self.arg_lnk_file.flush()
-                            if category_text and self.arg_cat_file:
-                                self.arg_cat_file.write(
-                                    category_text.encode(DEFAULT_ENCODING)
-                                )
-                                # self.arg_cat_file.flush()
-                            if redirect_text and self.arg_red_file:
-                                self.arg_red_file.write(
-                                    redirect_text.encode(DEFAULT_ENCODING)
-                                )
-                                # self.arg_red_file.flush()
-                            if output:
-                                if self.arg_output == sys.stdout:
-                                    print(output.decode())
-                                elif self.arg_output is not None:
-                                    self.arg_output.write(output)
-                                    # self.arg_output.flush()  # Ensure immediate write
+        # Only set handler in main process (and its main thread)
+        if (
+            not hasattr(self, "_signal_set")  # Avoid re-setting in workers
+            and threading.current_thread() is threading.main_thread()
+        ):
+            original_sigint_handler = signal.getsignal(signal.SIGINT)
+            signal.signal(signal.SIGINT, signal_handler)
+            self._signal_set = True
 
-            except KeyboardInterrupt:
-                if pool is not None:
-                    pool.terminate()
-                    pool.close()
-                    pool.join()
-                sys.stderr.write("\nINFO: Parsing interrupted, cleaning up.\n")
-                self.cleanup()
-                sys.exit(1)
-            except Exception as e:
-                if pool is not None:
-                    pool.terminate()
-                    pool.close()
-                    pool.join()
-                sys.stderr.write(f"\nERROR: Unexpected error during parsing: {e}\n")
-                self.cleanup()
-                raise
-            finally:
+        batches = self.iter_batches(self.iter_pages(context, namespace))
+        try:
+            for batch in batches:
+                self.write_batch(batch)
+        except KeyboardInterrupt:
+            if self.pool is not None:
+                self.pool.terminate()
+                self.pool.close()
+                self.pool.join()
+            sys.stderr.write("\nINFO: Parsing interrupted, cleaning up.\n")
+            batches.close()
+            self.cleanup()
+            sys.exit(1)
+        except IOError:
+            sys.stderr.write("\nERROR: I/O error.\n")
+        except Exception as e:
+            if self.pool is not None:
+                self.pool.terminate()
+                self.pool.close()
+                self.pool.join()
+            sys.stderr.write(f"\nERROR: Unexpected error during parsing: {e}\n")
+            batches.close()
+            self.cleanup()
+            raise
+        finally:
+            if original_sigint_handler is not None:
                 signal.signal(signal.SIGINT, original_sigint_handler)  # Restore handler
-                if pool is not None:
-                    pool.close()
-                    pool.join()  # Ensure pool is fully closed
-                self.cleanup()
-
-        else:
-            # Single-threaded processing (unchanged)
-            for event, element in context:
-                try:
-                    count += 1
-                    if (
-                        self.arg_input != sys.stdin
-                        and self.arg_output != sys.stdout
-                        and self.arg_verbose
-                    ):
-                        current_file_size = self.arg_input.tell()
-                        previous_progress = self.print_progress(
-                            input_file_size, current_file_size, previous_progress
-                        )
-
-                    if element.tag == (ns + "page") and event == "end":
-                        titles = element.xpath("ns:title/text()", namespaces=nsdict)
-                        ids = element.xpath("ns:id/text()", namespaces=nsdict)
-                        texts = element.xpath(
-                            "ns:revision/ns:text/text()", namespaces=nsdict
-                        )
-
-                        if len(titles) != 1 or len(ids) != 1:
-                            continue
+            batches.close()  # stops the executor
+            self.cleanup()
 
-                        title = titles[0]
-                        id = ids[0]
-                        wiki = unicodedata.normalize("NFKD", "".join(texts))
-
-                        repaired_title = self.repair_article_name(title)
-                        self.wiki_data.__init__()
-                        self.get_wiki_data(wiki)
+        self.report_slow_articles()
+        self.print_stats()
 
-                        if self.arg_links_file:
-                            link_text = "".join(
-                                repaired_title + "\t" + i + "\n"
-                                for i in self.wiki_data.links
-                            )
-                            self.arg_lnk_file.write(link_text.encode(DEFAULT_ENCODING))
-                        if self.arg_categories_file:
-                            category_text = "".join(
-                                repaired_title + "\t" + i + "\n"
-                                for i in self.wiki_data.categories
-                            )
-                            self.arg_cat_file.write(
-                                category_text.encode(DEFAULT_ENCODING)
-                            )
-                        if self.arg_redirects_file and self.wiki_data.redirect:
-                            redirect_text = (
-                                repaired_title + "\t" + self.wiki_data.redirect + "\n"
-                            )
-                            self.arg_red_file.write(
-                                redirect_text.encode(DEFAULT_ENCODING)
-                            )
-
-                        if self.wiki_data.plain_text and self.arg_text:
-                            page_element = lxml.etree.Element("article")
-                            id_element = lxml.etree.SubElement(page_element, "id")
-                            id_element.text = id
-                            title_element = lxml.etree.SubElement(page_element, "title")
-                            title_element.text = title
-                            text_element = lxml.etree.SubElement(page_element, "text")
-                            text_element.text = self.wiki_data.plain_text
-                            if self.arg_references and self.wiki_data.categories:
-                                categories_element = lxml.etree.SubElement(
-                                    page_element, "categories"
-                                )
-                                categories_text = "".join(
-                                    f'<category target="{i}"/>'
-                                    for i in self.wiki_data.categories
-                                )
-                                categories_element.text = categories_text
-                            output = (
-                                lxml.etree.tostring(
-                                    page_element, encoding=DEFAULT_ENCODING
-                                )
-                                + b"\n"
-                            )
-                            if self.arg_output == sys.stdout:
-                                print(output.decode())
-                            else:
-                                self.arg_output.write(output)
-
-                        element.clear()
-                        while element.getprevious() is not None:
-                            del element.getparent()[0]
-                except TimeoutError:
-                    sys.stderr.write(
-                        f'\nWARNING: Skipping article "{repaired_title}". Took longer than {REGEX_TIMEOUT} seconds.\n'
-                    )
-                    continue
-                except KeyboardInterrupt:
-                    sys.stderr.write("\nWARNING: Prematurely aborted parsing.\n")
-                    break
-                except IOError:
-                    sys.stderr.write("\nERROR: I/O error.\n")
-                    break
-                except Exception:
-                    sys.stderr.write(
-                        f'\nWARNING: Skipping article "{repaired_title}". Unexpected error.\n'
-                    )
-                    continue
+    def report_slow_articles(self):
+        """Writes the quarantine file (--slow-log) and prints the slowest articles."""
+        if self.slow_articles is None:
+            return
+        if self.arg_slow_log_file:
+            self.slow_articles.write(self.arg_slow_log_file)
+        if self.replay_ids is not None or self.arg_verbose:
+            sys.stderr.write(
+                "\nINFO: Slowest and largest articles:\n"
+                + self.slow_articles.format()
+                + "\n"
+            )
 
     def safe_close(self, attr_name, default_file=None, skip_types=(BytesIO,)):
         """
@@ -941,13 +1640,50 @@ class Processor(Conductor):
             except (AttributeError, IOError):
                 pass  # Silently ignore if close fails
 
+    def close_sinks(self):
+        """Finalize outputs that need more than a plain close (e.g. a Parquet footer)."""
+        if getattr(self, "telemetry", None) is not None:
+            self.telemetry.stop()
+            self.telemetry = None
+        if getattr(self, "parquet_sink", None) is not None:
+            self.parquet_sink.close()
+            self.parquet_sink = None
+        if getattr(self, "title_dictionary", None) is not None:
+            self.title_dictionary.close()
+            if self.arg_csr:
+                for sink, file_name in (
+                    (self.link_sink, self.arg_links_file),
+                    (self.category_sink, self.arg_categories_file),
+                ):
+                    if sink is not None and isinstance(file_name, str):
+                        sink.file.close()  # flush edges before reading them back
+                        self.build_edge_csr(file_name, len(self.title_dictionary))
+            self.title_dictionary = None
+            self.link_sink = None
+            self.category_sink = None
+
+    def build_edge_csr(self, file_name, node_count):
+        """Builds CSR adjacency of a binary edge file (finalization step)."""
+        if get_compression(file_name, self.arg_compress):
+            sys.stderr.write(
+                f"\nWARNING: Not building CSR of {file_name}, compressed edges can't be memory-mapped.\n"
+            )
+            return
+        if self.arg_verbose:
+            sys.stderr.write(f"\nINFO: Building CSR adjacency of {file_name}.\n")
+        build_csr(file_name, self.arg_edge_format, node_count)
+
     def cleanup(self):
         # Cleanup
+        self.close_sinks()
         self.safe_close("arg_input", default_file=sys.stdin, skip_types=(BytesIO,))
         self.safe_close("arg_output", default_file=sys.stdout, skip_types=(BytesIO,))
         self.safe_close("arg_links_file", skip_types=(BytesIO,))
         self.safe_close("arg_categories_file", skip_types=(BytesIO,))
         self.safe_close("arg_redirects_file", skip_types=(BytesIO,))
+        self.safe_close("arg_lnk_file", skip_types=(BytesIO,))
+        self.safe_close("arg_cat_file", skip_types=(BytesIO,))
+        self.safe_close("arg_red_file", skip_types=(BytesIO,))
 
     def __del__(self):
         """
@@ -957,61 +1693,142 @@ class Processor(Conductor):
         self.cleanup()
 
 
+class Worker:
+    """Processor of a pool worker created from the run options, reused by all articles
+    of the worker (it keeps its caches), and the number of articles it processed.
+    """
+
+    def __init__(self, options):
+        (
+            arg_text,
+            arg_links_file,
+            arg_categories_file,
+            arg_redirects_file,
+            arg_references,
+            arg_parquet_file,
+            arg_edge_format,
+            arg_resolve_redirects,
+            arg_name_cache_size,
+            arg_profile_stages,
+            arg_slow_articles,
+            arg_article_timeout,
+            arg_records,
+            arg_jsonl,
+        ) = options
+        self.processor = processor = Processor()
+        self.articles = 0
+        processor.arg_text = arg_text
+        processor.arg_links_file = arg_links_file
+        processor.arg_categories_file = arg_categories_file
+        processor.arg_redirects_file = arg_redirects_file
+        processor.arg_references = arg_references
+        processor.arg_parquet_file = arg_parquet_file
+        processor.arg_edge_format = arg_edge_format
+        processor.arg_resolve_redirects = arg_resolve_redirects
+        processor.init_name_cache(arg_name_cache_size)
+        processor.arg_slow_articles = arg_slow_articles
+        processor.arg_article_timeout = arg_article_timeout
+        processor.arg_records = arg_records
+        processor.arg_jsonl = arg_jsonl
+        if arg_profile_stages or arg_slow_articles:
+            processor.stage_profiler = StageProfiler()
+
+    def process_article(self, args):
+        """Process a single article and return its output."""
+        title, id, wiki = args
+        return self.processor.process_page(title, id, wiki)
+
+    def process_articles(self, chunk, transport=None):
+        """Process a chunk of articles (a single pool task) and return their outputs as a batch.
+        With shared memory transport, wiki texts are read from and the batch output is written to
+        shared memory (unless it doesn't fit into the reserved region).
+        """
+        if transport is None:
+            batch = get_batch_result([self.process_article(args) for args in chunk])
+        else:
+            input_name, output_name, _, output_offset, output_size = transport
+            input_buffer = get_shared_buffer(input_name)
+            results = []
+            for title, id, (offset, length) in chunk:
+                wiki = str(input_buffer[offset : offset + length], DEFAULT_ENCODING)
+                results.append(self.process_article((title, id, wiki)))
+            batch = get_batch_result(results)
+            if batch.output and len(batch.output) <= output_size:
+                output_buffer = get_shared_buffer(output_name)
+                output_buffer[output_offset : output_offset + len(batch.output)] = (
+                    batch.output
+                )
+                batch.output_span = (output_offset, len(batch.output))
+                batch.output = None
+        self.articles += len(chunk)
+        batch.worker_articles = self.articles
+        batch.worker_rss = get_rss()  # the main process decides on recycling
+        return batch
+
+
+pool_worker = threading.local()  # Worker of a pool worker (process or thread)
+
+
+def init_worker(options, placement=None):
+    """Initializes a pool worker process with the run options (sent once per worker)."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Block SIGINT in worker processes
+    init_worker_processor(options, placement)
+
+
+def init_worker_processor(options, placement=None):
+    """Creates the Worker of a pool worker (process or thread) from the run options,
+    pins the worker to a CPU with --cpu-affinity.
+    """
+    if placement is not None:
+        pin_worker(*placement)
+    pool_worker.worker = Worker(options)
+
+
 def process_article(args):
     """
-    Process a single article and return its output.
+    Process a single article by the Worker of this pool worker and return its output.
     Deliberately declared outside of the processor as a standalone function (not a method) to avoid pickling the Processor instance.
     """
-    (
-        title,
-        id,
-        wiki,
-        arg_text,
-        arg_links_file,
-        arg_categories_file,
-        arg_redirects_file,
-        arg_references,
-    ) = args
-    processor = Processor()  # Create a new instance for each process
-    processor.arg_text = arg_text
-    processor.arg_links_file = arg_links_file
-    processor.arg_categories_file = arg_categories_file
-    processor.arg_redirects_file = arg_redirects_file
-    processor.arg_references = arg_references
-
-    repaired_title = processor.repair_article_name(title)
-    processor.get_wiki_data(wiki)  # Populates processor.wiki_data
-
-    link_text = None
-    category_text = None
-    redirect_text = None
-    output = None
-
-    if processor.arg_links_file and processor.wiki_data.links:
-        link_text = "".join(
-            repaired_title + "\t" + i + "\n" for i in processor.wiki_data.links
-        )
-    if processor.arg_categories_file and processor.wiki_data.categories:
-        category_text = "".join(
-            repaired_title + "\t" + i + "\n" for i in processor.wiki_data.categories
-        )
-    if processor.arg_redirects_file and processor.wiki_data.redirect:
-        redirect_text = repaired_title + "\t" + processor.wiki_data.redirect + "\n"
-
-    if processor.wiki_data.plain_text and processor.arg_text:
-        page_element = lxml.etree.Element("article")
-        id_element = lxml.etree.SubElement(page_element, "id")
-        id_element.text = id
-        title_element = lxml.etree.SubElement(page_element, "title")
-        title_element.text = title
-        text_element = lxml.etree.SubElement(page_element, "text")
-        text_element.text = processor.wiki_data.plain_text
-        if processor.arg_references and processor.wiki_data.categories:
-            categories_element = lxml.etree.SubElement(page_element, "categories")
-            categories_text = "".join(
-                f'<category target="{i}"/>' for i in processor.wiki_data.categories
-            )
-            categories_element.text = categories_text
-        output = lxml.etree.tostring(page_element, encoding=DEFAULT_ENCODING) + b"\n"
+    return pool_worker.worker.process_article(args)
+
 
-    return output, link_text, category_text, redirect_text
+def process_articles(chunk, transport=None):
+    """Process a chunk of articles by the Worker of this pool worker (see
+    Worker.process_articles).
+    """
+    return pool_worker.worker.process_articles(chunk, transport)
+
+
+def get_jsonl_record(id, **fields):
+    """Serializes the result of a snippet (-T --jsonl) as a JSON line."""
+    return (json.dumps(dict(id=id, **fields), ensure_ascii=False) + "\n").encode(
+        DEFAULT_ENCODING
+    )
+
+
+def get_batch_result(results):
+    """Concatenates outputs of articles per output stream (a single write each)."""
+    batch = BatchResult()
+    outputs = []
+    link_texts = []
+    category_texts = []
+    redirect_texts = []
+    for result in results:
+        if result.output:
+            outputs.append(result.output)
+        if result.link_text:
+            link_texts.append(result.link_text)
+        if result.category_text:
+            category_texts.append(result.category_text)
+        if result.redirect_text:
+            redirect_texts.append(result.redirect_text)
+        result.output = None
+        result.link_text = None
+        result.category_text = None
+        result.redirect_text = None
+    batch.articles = results
+    batch.output = b"".join(outputs)
+    batch.link_text = "".join(link_texts).encode(DEFAULT_ENCODING)
+    batch.category_text = "".join(category_texts).encode(DEFAULT_ENCODING)
+    batch.redirect_text = "".join(redirect_texts).encode(DEFAULT_ENCODING)
+    return batch
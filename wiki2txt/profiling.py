@@ -0,0 +1,74 @@
+# standard libraries
+import time
+
+
+class StageProfiler:
+    """Records wall time, input / output sizes and call count of processing stages.
+    Stages are measured between consecutive marks, so an article costs one clock read per stage.
+    """
+
+    def __init__(self):
+        self.stages = {}  # stage name -> [seconds, input chars, output chars, calls]
+        self.last_time = 0.0
+        self.last_size = 0
+
+    def start(self, text):
+        """Starts measuring the first stage of an article."""
+        self.last_time = time.perf_counter()
+        self.last_size = len(text)
+
+    def mark(self, name, text, calls=1):
+        """Ends a stage that turned the previous text into this text and starts the next one."""
+        now = time.perf_counter()
+        size = len(text)
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = [0.0, 0, 0, 0]
+        stage[0] += now - self.last_time
+        stage[1] += self.last_size
+        stage[2] += size
+        stage[3] += calls
+        self.last_time = now
+        self.last_size = size
+
+    def take_stages(self):
+        """Returns stages recorded since the last call."""
+        stages = self.stages
+        self.stages = {}
+        return stages
+
+
+def merge_stages(total, stages):
+    """Adds stages recorded by one profiler (e.g. in a pool worker) to the total."""
+    for name, stage in stages.items():
+        total_stage = total.get(name)
+        if total_stage is None:
+            total[name] = list(stage)
+        else:
+            for i, value in enumerate(stage):
+                total_stage[i] += value
+
+
+def format_stages(stages):
+    """Returns a report of stages ranked by the time spent in them."""
+    total_time = sum(stage[0] for stage in stages.values()) or 1.0
+    lines = [
+        "%-16s %10s %7s %10s %10s %10s %9s"
+        % ("stage", "seconds", "time %", "calls", "in Mchar", "out Mchar", "Mchar/s")
+    ]
+    for name, (seconds, in_size, out_size, calls) in sorted(
+        stages.items(), key=lambda item: item[1][0], reverse=True
+    ):
+        lines.append(
+            "%-16s %10.3f %7.2f %10d %10.2f %10.2f %9.2f"
+            % (
+                name,
+                seconds,
+                seconds / total_time * 100,
+                calls,
+                in_size / 1000000,
+                out_size / 1000000,
+                in_size / 1000000 / seconds if seconds else 0.0,
+            )
+        )
+    return "\n".join(lines)
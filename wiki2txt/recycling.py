@@ -0,0 +1,37 @@
+# -*- coding: UTF-8 -*-
+"""Recycling of pool workers whose memory grew (regex internals, transient strings of
+giant articles, heap fragmentation), by articles processed or by resident set size.
+"""
+
+# standard libraries
+import os
+import sys
+
+try:
+    import resource  # not available on Windows
+except ImportError:
+    resource = None
+
+
+def get_rss():
+    """Resident set size of this process in bytes (the peak where /proc is missing)."""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is None:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":  # bytes on macOS, KB elsewhere
+        return rss
+    return rss * 1024
+
+
+def get_recycling_reason(batch, max_articles=0, max_rss_mb=0):
+    """Tells why the worker which processed a batch should be replaced, None if it's fine."""
+    if max_articles and batch.worker_articles >= max_articles:
+        return f"a worker processed {batch.worker_articles} articles"
+    if max_rss_mb and batch.worker_rss >= max_rss_mb * 1000000:
+        return f"a worker reached {batch.worker_rss // 1000000} MB RSS"
+    return None
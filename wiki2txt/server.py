@@ -0,0 +1,315 @@
+# -*- coding: UTF-8 -*-
+"""Conversion server (--serve), converts snippets of wiki markup sent over localhost HTTP
+or a Unix socket in a pool of warm workers (no interpreter start-up, imports and pattern
+compilation per call).
+
+    POST /convert  wiki markup (text/plain) or JSON, {"id": ..., "text": ...} or a list
+                   of them (a batch), answered with {"id", "text", "links", "categories",
+                   "redirect"} (a list for a batch)
+    GET /stats     requests, articles and request latency percentiles
+"""
+
+# standard libraries
+import collections
+import concurrent.futures
+import http.client
+import http.server
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+# local imports
+from wiki2txt.api import convert
+from wiki2txt.conductor import ARTICLE_TIMEOUT
+
+SERVER_HOST = "127.0.0.1"  # TCP addresses without a host listen on localhost only
+LATENCY_WINDOW = 100000  # latest requests the latency percentiles are computed of
+LATENCY_PERCENTILES = (50, 90, 99, 99.9)
+WARMUP_TEXT = "'''Warm''' up of a [[worker|link]] {{template}} <ref>reference</ref> [[Category:Warm-up]]"
+
+
+def parse_address(address):
+    """Parses a server address, "unix:PATH" (a Unix socket), "HOST:PORT" or "PORT".
+    Returns (socket family, address).
+    """
+    if address.startswith("unix:"):
+        if not address[5:]:
+            raise ValueError("no socket path")
+        return socket.AF_UNIX, address[5:]
+    host, _, port = address.rpartition(":")
+    if not port.isdigit() or int(port) > 65535:
+        raise ValueError(f"invalid port {port}")
+    return socket.AF_INET, (host or SERVER_HOST, int(port))
+
+
+def convert_record(record, references=False, article_timeout=ARTICLE_TIMEOUT):
+    """Converts a snippet record ({"id": ..., "text": ...}), returns the result record
+    ({"id": ..., "error": ...} when it takes longer than the article time budget).
+    """
+    try:
+        wiki_data = convert(
+            record["text"], references=references, article_timeout=article_timeout
+        )
+    except TimeoutError:
+        return {
+            "id": record.get("id"),
+            "error": f"Took longer than {article_timeout} seconds to parse.",
+        }
+    return {
+        "id": record.get("id"),
+        "text": wiki_data.plain_text,
+        "links": wiki_data.links,
+        "categories": wiki_data.categories,
+        "redirect": wiki_data.redirect,
+    }
+
+
+def warm_up_worker():
+    """Initializer of pool workers, creates the converter of the worker and fills caches."""
+    if threading.current_thread() is threading.main_thread():  # a worker process
+        signal.signal(signal.SIGINT, signal.SIG_IGN)  # the server stops the pool
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    convert(WARMUP_TEXT)
+
+
+def get_percentile(values, percentile):
+    """Nearest-rank percentile of sorted values."""
+    index = max(0, min(len(values) - 1, int(len(values) * percentile / 100 + 0.5) - 1))
+    return values[index]
+
+
+class LatencyStats:
+    """Counters of the server and latency of the latest LATENCY_WINDOW requests."""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.latencies = collections.deque(maxlen=window)
+        self.requests = 0
+        self.articles = 0
+        self.errors = 0
+
+    def add(self, seconds, articles=0, error=False):
+        with self.lock:
+            self.latencies.append(seconds)
+            self.requests += 1
+            self.articles += articles
+            self.errors += error
+
+    def get(self):
+        """Returns the counters, throughput and latency percentiles (ms)."""
+        with self.lock:
+            latencies = sorted(self.latencies)
+            uptime = time.perf_counter() - self.started
+            stats = {
+                "requests": self.requests,
+                "articles": self.articles,
+                "errors": self.errors,
+                "uptime_s": round(uptime, 3),
+                "requests_per_s": round(self.requests / max(uptime, 1e-6), 1),
+            }
+        for percentile in LATENCY_PERCENTILES:
+            stats[f"p{percentile:g}_ms"] = (
+                round(get_percentile(latencies, percentile) * 1000, 3)
+                if latencies
+                else None
+            )
+        return stats
+
+    def format(self):
+        """Describes the counters and latency percentiles."""
+        stats = self.get()
+        latency = ", ".join(
+            f"p{percentile:g} {stats[f'p{percentile:g}_ms']} ms"
+            for percentile in LATENCY_PERCENTILES
+        )
+        return (
+            f"{stats['requests']} requests ({stats['requests_per_s']}/s), "
+            f"{stats['articles']} articles, {stats['errors']} errors, latency {latency}"
+        )
+
+
+class ConversionHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, clients reuse their connections
+
+    def do_GET(self):
+        if self.path != "/stats":
+            return self.send_json(404, {"error": "not found"})
+        self.send_json(200, self.server.stats.get())
+
+    def do_POST(self):
+        started = time.perf_counter()
+        try:
+            status, answer, articles = self.convert()
+        except Exception as error:  # the client gets an answer, the server goes on
+            status, answer, articles = 500, {"error": f"conversion failed, {error}"}, 0
+        self.server.stats.add(  # before answering, so stats include this request
+            time.perf_counter() - started, articles, error=status != 200
+        )
+        self.send_json(status, answer)
+
+    def convert(self):
+        """Converts the records of a request, returns (status, answer, articles)."""
+        if self.path != "/convert":
+            return 404, {"error": "not found"}, 0
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            if self.headers.get_content_type() == "application/json":
+                records = json.loads(body)
+            else:
+                records = {"text": body.decode("utf-8")}
+            batch = isinstance(records, list)
+            if not batch:
+                records = [records]
+            if not all(
+                isinstance(record, dict) and isinstance(record.get("text"), str)
+                for record in records
+            ):
+                raise ValueError('records need "text"')
+        except ValueError as error:  # including JSON and UTF-8 errors
+            return 400, {"error": f"invalid request, {error}"}, 0
+        results = self.server.convert(records)
+        return 200, results if batch else results[0], len(results)
+
+    def send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        pass  # latency is reported by /stats, not per request
+
+
+class ConversionServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """Threaded HTTP server converting snippets in a pool of warm workers, workers of
+    "process" (default) or "thread" executor, jobs of them.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(
+        self,
+        address,
+        jobs=1,
+        executor="process",
+        references=False,
+        article_timeout=ARTICLE_TIMEOUT,
+    ):
+        self.address_family, address = parse_address(address)
+        self.jobs = jobs
+        self.references = references
+        self.article_timeout = article_timeout
+        if executor == "thread":
+            self.pool = concurrent.futures.ThreadPoolExecutor(
+                jobs, None, warm_up_worker
+            )
+        else:
+            self.pool = concurrent.futures.ProcessPoolExecutor(
+                jobs, initializer=warm_up_worker
+            )
+        self.stats = LatencyStats()
+        super().__init__(address, ConversionHandler)
+
+    def warm_up(self):
+        """Starts every worker before the first request (workers start on demand)."""
+        records = [{"text": WARMUP_TEXT}] * self.jobs
+        list(self.pool.map(convert_record, records))
+        self.stats = LatencyStats()
+
+    def convert(self, records):
+        """Converts records in the pool, a batch is split in a chunk per worker."""
+        if len(records) == 1:
+            return [
+                self.pool.submit(
+                    convert_record, records[0], self.references, self.article_timeout
+                ).result()
+            ]
+        return list(
+            self.pool.map(
+                convert_record,
+                records,
+                [self.references] * len(records),
+                [self.article_timeout] * len(records),
+                chunksize=max(1, len(records) // self.jobs),  # processes only
+            )
+        )
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown()
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP client connection over a Unix socket (of --serve unix:PATH)."""
+
+    def __init__(self, path, timeout=None):
+        super().__init__("localhost", timeout=timeout)
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+def connect(address, timeout=None):
+    """Opens a client connection to a server address (see parse_address)."""
+    family, address = parse_address(address)
+    if family == socket.AF_UNIX:
+        return UnixHTTPConnection(address, timeout)
+    return http.client.HTTPConnection(*address, timeout=timeout)
+
+
+def stop_serving(sig, frame):
+    raise KeyboardInterrupt  # SIGTERM stops the server like Ctrl+C
+
+
+def serve(
+    address,
+    jobs=1,
+    executor="process",
+    references=False,
+    article_timeout=ARTICLE_TIMEOUT,
+    verbose=True,
+):
+    """Runs a conversion server until interrupted, then prints its stats."""
+    try:
+        server = ConversionServer(address, jobs, executor, references, article_timeout)
+    except ValueError as error:
+        sys.stderr.write(f"\nERROR: Invalid server address ({address}), {error}.\n")
+        sys.exit(1)
+    except OSError as error:
+        sys.stderr.write(f"\nERROR: Can't listen on {address} ({error}).\n")
+        sys.exit(1)
+    signal.signal(signal.SIGTERM, stop_serving)
+    try:
+        server.warm_up()
+        if verbose:
+            sys.stderr.write(
+                f"\nINFO: Serving on {address} with {jobs} warm {executor} workers.\n"
+            )
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if server.address_family == socket.AF_UNIX:
+            try:
+                os.unlink(server.server_address)
+            except OSError:
+                pass
+    if verbose:
+        sys.stderr.write(f"\nINFO: Served {server.stats.format()}.\n")
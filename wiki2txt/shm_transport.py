@@ -0,0 +1,135 @@
+# standard libraries
+from collections import deque
+from multiprocessing import shared_memory
+
+SHM_RING_BYTES = 64000000  # size of each ring (article payloads, converted outputs)
+
+OUTPUT_SLACK = 1024  # bytes reserved per article on top of its payload (XML, escaping)
+
+
+class RingAllocator:
+    """Hands out regions of a ring buffer. Regions are usually released in allocation
+    order, a region released early (e.g. unordered output) is reclaimed once all older
+    regions are released too.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.regions = deque()  # [offset, size, released] in allocation order
+        self.head = 0  # end of the newest region
+
+    def allocate(self, size):
+        """Returns the offset of a new region, None if there isn't enough room."""
+        size = max(size, 1)
+        if not self.regions:
+            self.head = 0
+            offset = 0 if size <= self.size else None
+        else:
+            tail = self.regions[0][0]  # start of the oldest region
+            if self.head > tail:  # free room at the end and at the start of the ring
+                if self.head + size <= self.size:
+                    offset = self.head
+                elif size <= tail:
+                    offset = 0
+                else:
+                    offset = None
+            else:  # wrapped, free room between the newest and the oldest region
+                offset = self.head if self.head + size <= tail else None
+        if offset is not None:
+            self.regions.append([offset, size, False])
+            self.head = offset + size
+        return offset
+
+    def release(self, offset):
+        """Releases a region (by its offset)."""
+        for region in self.regions:
+            if region[0] == offset and not region[2]:
+                region[2] = True
+                break
+        while self.regions and self.regions[0][2]:
+            self.regions.popleft()
+
+
+class SharedMemoryTransport:
+    """Passes article payloads to pool workers and their outputs back through shared memory.
+
+    The main process writes UTF-8 payloads of a chunk once into the input ring and
+    reserves a region of the output ring, workers get offsets and lengths only and
+    write the batch of converted articles straight into the reserved region. Chunks
+    that don't fit (the rings are full) are sent pickled as usual.
+    """
+
+    def __init__(self, size=SHM_RING_BYTES):
+        self.input = shared_memory.SharedMemory(create=True, size=size)
+        self.output = shared_memory.SharedMemory(create=True, size=size)
+        self.input_ring = RingAllocator(size)
+        self.output_ring = RingAllocator(size)
+
+    def pack(self, chunk, encoding):
+        """Writes payloads of a chunk into the input ring, returns (chunk, transport)
+        where the wiki text of articles is replaced by (offset, length), or None if full.
+        """
+        payloads = [args[2].encode(encoding) for args in chunk]
+        input_size = sum(len(payload) for payload in payloads)
+        input_offset = self.input_ring.allocate(input_size)
+        if input_offset is None:
+            return None
+        output_size = input_size + OUTPUT_SLACK * len(chunk)
+        output_offset = self.output_ring.allocate(output_size)
+        if output_offset is None:
+            self.input_ring.release(input_offset)
+            return None
+        packed = []
+        offset = input_offset
+        for args, payload in zip(chunk, payloads):
+            self.input.buf[offset : offset + len(payload)] = payload
+            packed.append((args[0], args[1], (offset, len(payload))))
+            offset += len(payload)
+        transport = (
+            self.input.name,
+            self.output.name,
+            input_offset,
+            output_offset,
+            output_size,
+        )
+        return packed, transport
+
+    def unpack(self, batch):
+        """Points the batch output written to shared memory by a worker to its region
+        (no copy). It stays valid until the chunk is released.
+        """
+        if batch.output_span is not None:
+            offset, length = batch.output_span
+            batch.output = self.output.buf[offset : offset + length]
+
+    def get_text(self, span, encoding):
+        """Returns the wiki text of an article written into the input ring."""
+        offset, length = span
+        return str(self.input.buf[offset : offset + length], encoding)
+
+    def release(self, transport, batch):
+        """Frees regions of a chunk once its batch is written."""
+        if batch.output_span is not None and batch.output is not None:
+            batch.output.release()  # the view must not outlive the region
+            batch.output = None
+        self.input_ring.release(transport[2])
+        self.output_ring.release(transport[3])
+
+    def close(self):
+        for memory in (self.input, self.output):
+            try:
+                memory.close()
+            except BufferError:  # an output still referenced, unmapped at exit
+                pass
+            memory.unlink()
+
+
+shared_buffers = {}  # shared memory attached by a pool worker, by name
+
+
+def get_shared_buffer(name):
+    """Returns the buffer of shared memory created by the main process (attached once per worker)."""
+    memory = shared_buffers.get(name)
+    if memory is None:
+        memory = shared_buffers[name] = shared_memory.SharedMemory(name=name)
+    return memory.buf
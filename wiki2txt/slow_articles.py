@@ -0,0 +1,88 @@
+# standard libraries
+import heapq
+import json
+
+SLOW_ARTICLES_TOP = 20  # articles kept by processing time (and the same number by size)
+
+
+class SlowArticleTracker:
+    """Keeps the top-N articles by processing time and the top-N articles by size."""
+
+    def __init__(self, top=SLOW_ARTICLES_TOP):
+        self.top = max(1, top)
+        self.by_time = []  # min-heaps of (key, sequence, article)
+        self.by_size = []
+        self.sequence = 0
+
+    def _push(self, heap, key, article):
+        entry = (key, self.sequence, article)
+        if len(heap) < self.top:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    def add(self, id, title, size, seconds, slowest_stage=None, error=None):
+        """Records a processed article (size in bytes of its wiki text)."""
+        self.sequence += 1
+        if (
+            len(self.by_time) == self.top
+            and seconds <= self.by_time[0][0]
+            and len(self.by_size) == self.top
+            and size <= self.by_size[0][0]
+        ):
+            return  # neither slow nor big enough
+        article = {
+            "id": id,
+            "title": title,
+            "bytes": size,
+            "seconds": round(seconds, 6),
+            "slowest_stage": slowest_stage,
+        }
+        if error:
+            article["error"] = error
+        self._push(self.by_time, seconds, article)
+        self._push(self.by_size, size, article)
+
+    def get_articles(self):
+        """Returns tracked articles, slowest first."""
+        articles = {}
+        for heap in (self.by_time, self.by_size):
+            for key, sequence, article in heap:
+                articles[sequence] = article
+        return sorted(articles.values(), key=lambda a: a["seconds"], reverse=True)
+
+    def write(self, file_name):
+        """Writes tracked articles to a quarantine file (JSON lines), see load_article_ids()."""
+        with open(file_name, "w", encoding="utf-8") as quarantine:
+            for article in self.get_articles():
+                quarantine.write(json.dumps(article, ensure_ascii=False) + "\n")
+
+    def format(self):
+        """Returns a table of tracked articles, slowest first."""
+        lines = [
+            "%10s %12s %10s  %-16s %s"
+            % ("id", "bytes", "seconds", "slowest stage", "title")
+        ]
+        for article in self.get_articles():
+            lines.append(
+                "%10s %12d %10.3f  %-16s %s%s"
+                % (
+                    article["id"],
+                    article["bytes"],
+                    article["seconds"],
+                    article["slowest_stage"] or "-",
+                    article["title"],
+                    " (%s)" % article["error"] if "error" in article else "",
+                )
+            )
+        return "\n".join(lines)
+
+
+def load_article_ids(file_name):
+    """Returns ids of articles in a quarantine file (JSON lines with an "id" key)."""
+    ids = set()
+    with open(file_name, encoding="utf-8") as quarantine:
+        for line in quarantine:
+            if line.strip():
+                ids.add(str(json.loads(line)["id"]))
+    return ids
@@ -0,0 +1,183 @@
+# standard libraries
+import json
+import os
+import sys
+import threading
+import time
+
+TELEMETRY_INTERVAL = 1.0  # seconds between samples
+
+TELEMETRY_FORMATS = ("json", "prometheus")
+
+PROMETHEUS_METRICS = (  # (sample key, metric name, type, help)
+    ("bytes", "wiki2txt_input_bytes_total", "counter", "Bytes of input consumed."),
+    ("articles", "wiki2txt_articles_total", "counter", "Articles processed."),
+    ("mb_per_s", "wiki2txt_input_megabytes_per_second", "gauge", "Input throughput."),
+    ("articles_per_s", "wiki2txt_articles_per_second", "gauge", "Article throughput."),
+    ("eta_s", "wiki2txt_eta_seconds", "gauge", "Estimated time left."),
+    ("queue_depth", "wiki2txt_queue_depth", "gauge", "Articles read, not yet written."),
+    ("utilization", "wiki2txt_worker_utilization", "gauge", "Busy share of workers."),
+)
+
+
+class CountingReader:
+    """Wraps a binary input stream and counts bytes consumed (works for pipes as well)."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def readline(self, size=-1):
+        line = self.stream.readline(size)
+        self.bytes_read += len(line)
+        return line
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+class Telemetry:
+    """Samples throughput counters on a timer thread.
+
+    The pipeline only bumps plain counters (articles read / written, busy seconds), the
+    timer thread turns them into MB/s, articles/s, ETA, queue depth and worker utilization
+    and prints a progress meter and / or writes JSON lines or a Prometheus textfile.
+    """
+
+    def __init__(
+        self,
+        reader,
+        total_bytes=0,
+        jobs=1,
+        interval=TELEMETRY_INTERVAL,
+        progress_stream=None,
+        report_file=None,
+        report_format="json",
+    ):
+        self.reader = reader
+        self.total_bytes = total_bytes
+        self.jobs = jobs
+        self.interval = interval
+        self.progress_stream = progress_stream
+        self.report_file = report_file
+        self.report_format = report_format
+        self.pages_read = 0  # articles handed to processing
+        self.articles = 0  # articles written
+        self.busy_seconds = 0.0  # processing time of written articles
+        self.started = time.perf_counter()
+        self.last = (self.started, 0, 0, 0.0)  # time, bytes, articles, busy seconds
+        self.progress_length = 0
+        self.stopped = threading.Event()
+        self.thread = None
+        if self.report_file and self.report_format == "json":
+            open(self.report_file, "w").close()  # JSON lines of this run only
+
+    def start(self):
+        self.thread = threading.Thread(
+            target=self._run, name="wiki2txt-telemetry", daemon=True
+        )
+        self.thread.start()
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            self.report(self.sample())
+
+    def stop(self):
+        """Stops sampling, reports the final sample."""
+        if self.thread is None:
+            return
+        self.stopped.set()
+        self.thread.join()
+        self.thread = None
+        sample = self.sample(final=True)
+        self.report(sample)
+        if self.progress_stream is not None:
+            self.progress_stream.write("\n")
+            self.progress_stream.flush()
+
+    def sample(self, final=False):
+        """Returns current counters and rates (since the previous sample)."""
+        now = time.perf_counter()
+        size = self.reader.bytes_read
+        articles = self.articles
+        busy = self.busy_seconds
+        last_time, last_size, last_articles, last_busy = self.last
+        if final:  # rates of the whole run
+            last_time, last_size, last_articles, last_busy = self.started, 0, 0, 0.0
+        self.last = (now, size, articles, busy)
+        elapsed = max(now - last_time, 1e-9)
+        mb_per_s = (size - last_size) / 1000000 / elapsed
+        eta = None
+        if self.total_bytes and mb_per_s > 0:
+            eta = max(self.total_bytes - size, 0) / 1000000 / mb_per_s
+        return {
+            "time": time.time(),
+            "elapsed_s": round(now - self.started, 3),
+            "bytes": size,
+            "total_bytes": self.total_bytes or None,
+            "articles": articles,
+            "mb_per_s": round(mb_per_s, 3),
+            "articles_per_s": round((articles - last_articles) / elapsed, 3),
+            "eta_s": round(eta, 1) if eta is not None else None,
+            "queue_depth": self.pages_read - articles,
+            "utilization": round(min((busy - last_busy) / elapsed / self.jobs, 1.0), 3),
+        }
+
+    def report(self, sample):
+        if self.progress_stream is not None:
+            self.print_progress(sample)
+        if self.report_file:
+            if self.report_format == "prometheus":
+                self.write_prometheus(sample)
+            else:
+                with open(self.report_file, "a") as report:
+                    report.write(json.dumps(sample) + "\n")
+
+    def print_progress(self, sample):
+        """Redraws the progress meter line."""
+        output = "%.2f MB" % (sample["bytes"] / 1000000)
+        if self.total_bytes:
+            output += " of %.2f MB (%.2f %%)" % (
+                self.total_bytes / 1000000,
+                min(sample["bytes"] / self.total_bytes * 100, 100.0),
+            )
+        output += " | %.2f MB/s | %.1f articles/s | queue %d | workers %.0f %%" % (
+            sample["mb_per_s"],
+            sample["articles_per_s"],
+            sample["queue_depth"],
+            sample["utilization"] * 100,
+        )
+        if sample["eta_s"] is not None:
+            output += " | ETA %d:%02d:%02d" % (
+                sample["eta_s"] // 3600,
+                sample["eta_s"] % 3600 // 60,
+                sample["eta_s"] % 60,
+            )
+        padding = " " * max(self.progress_length - len(output), 0)
+        self.progress_stream.write("\r" + output + padding)
+        self.progress_stream.flush()
+        self.progress_length = len(output)
+
+    def write_prometheus(self, sample):
+        """Writes a Prometheus textfile (node_exporter textfile collector), atomically."""
+        lines = []
+        for key, name, metric_type, help in PROMETHEUS_METRICS:
+            if sample[key] is None:
+                continue
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.append(f"{name} {sample[key]}")
+        temporary_file = self.report_file + ".tmp"
+        with open(temporary_file, "w") as report:
+            report.write("\n".join(lines) + "\n")
+        os.replace(temporary_file, self.report_file)
+
+
+def get_progress_stream(output):
+    """Progress goes to STDOUT unless STDOUT carries the parsed articles."""
+    return sys.stderr if output is sys.stdout else sys.stdout
@@ -6,3 +6,52 @@ class WikiData:
         self.redirect = None
         self.links = []
         self.categories = []
+
+
+class ArticleResult:
+    """Data structure designed to hold everything produced from a single article."""
+
+    def __init__(self, id=None, title=None):
+        self.id = id
+        self.title = title
+        self.repaired_title = None
+        self.output = None  # serialized <article> element (bytes)
+        self.link_text = None
+        self.category_text = None
+        self.redirect_text = None
+        self.wiki_data = None  # kept only for sinks that need the parsed data itself
+        self.seconds = 0.0  # processing time
+        self.size = None  # bytes of wiki text (measured only when tracking slow articles)
+        self.error = None  # reason the article was skipped
+        self.stats = None  # counters accumulated since the previous result (merged by the writer)
+
+
+class BatchResult:
+    """Data structure designed to hold everything produced from a batch (pool task) of articles.
+    Outputs are concatenated per output stream (bytes), so they are written at once.
+    """
+
+    def __init__(self):
+        self.articles = []  # ArticleResult of every article (without outputs)
+        self.output = None
+        self.output_span = None  # (offset, length) of output in shared memory
+        self.worker_articles = 0  # articles processed by the worker so far
+        self.worker_rss = 0  # resident set size of the worker (bytes)
+        self.link_text = None
+        self.category_text = None
+        self.redirect_text = None
+
+
+class Article(WikiData):
+    """Data structure designed to hold a parsed article of a wikidump (see wiki2txt.api)."""
+
+    def __init__(self, id=None, title=None, wiki_data=None, error=None):
+        super().__init__()
+        self.id = id
+        self.title = title
+        self.error = error  # why the article couldn't be parsed (no data then)
+        if wiki_data is not None:
+            self.plain_text = wiki_data.plain_text
+            self.redirect = wiki_data.redirect
+            self.links = wiki_data.links
+            self.categories = wiki_data.categories